@@ -0,0 +1,6 @@
+"""
+natt_fix — thư viện dùng chung cho script-10-python-fix.py
+Băng | Python only, stdlib only
+"""
+
+STATE_DIR = '.natt-fix'     # cache / state của fixer, tương đối với root goldmaster (ngoài src/)
@@ -0,0 +1,158 @@
+"""
+Auto-fix — --autofix: sinh fix Fields từ lỗi tsc "thiếu property", lặp tới khi hết lỗi mới sửa được
+- TS2339 (Property 'x' does not exist on type 'Y') / TS2353 (… 'x' does not exist in type 'Y') → thêm 'x?: T' vào Y
+- TS2741 (Property 'x' is missing in type 'A' but required in type 'B') → x trong B thành optional
+- Y tìm theo InterfaceIndex: file lỗi tự khai báo → file nó import Y → file duy nhất export Y (symbol index)
+- T đoán từ literal ngay tại chỗ lỗi (x: 0 / x = '…' / true / […]), còn lại unknown; "Did you mean" = gõ sai, không thêm
+- mỗi vòng: 1 batch Fields cho mọi interface (manifest.run), flush, tsc incremental
+  dừng khi không còn fix mới (điểm dừng) hoặc số lỗi không giảm → vòng đó được trả lại nội dung cũ
+"""
+import re
+from collections import namedtuple
+
+from natt_fix import manifest
+from natt_fix.buffers import BufferStore, atomic_write
+from natt_fix.manifest import Fix, Fields
+from natt_fix.symbols import SymbolIndex
+
+MAX_ROUNDS = 5
+CODES = ('TS2339', 'TS2353', 'TS2741')
+
+_ID = r'[A-Za-z_$][\w$]*'
+_TYPE = r"'(" + _ID + r")(?:<[^']*>)?'"       # a named type, generic arguments dropped
+_MISSING = {
+    'TS2339': re.compile(r"^Property '([^']+)' does not exist on type " + _TYPE + r"\.?$"),
+    'TS2353': re.compile(r"Object literal may only specify known properties, (?:and|but) '([^']+)' does not exist in type " + _TYPE + r"\.?$"),
+    'TS2741': re.compile(r"^Property '([^']+)' is missing in type '[^']*' but required in type " + _TYPE + r"\.?$"),
+}
+# value right after `x:` (object literal) or `.x =` (assignment)
+_VALUE = re.compile(r"""\s*(?::|=(?![=>]))\s*(?:(?P<num>-?\d[\d_.eE]*n?\b)|(?P<str>['"`])|(?P<bool>true\b|false\b)
+                        |(?P<arr>\[)|(?P<date>new\s+Date\b))""", re.X)
+
+# one wanted change: interface `iface` in `path` gets field `field` added (decl) or made optional (decl None)
+Want = namedtuple('Want', 'path iface field decl diag')
+
+
+def _prop(name):
+    return name if re.fullmatch(_ID, name) else repr(name)
+
+
+def guess_type(c, line, col, name):
+    """TS type of the literal assigned to name at (line, col) of c (1-based, as tsc reports), else 'unknown'"""
+    pos = 0
+    for _ in range(line - 1):
+        pos = c.find('\n', pos) + 1
+        if pos == 0: return 'unknown'
+    i = pos + col - 1
+    m = re.compile(r"""['"]?""" + re.escape(name) + r"""['"]?""").match(c, i)
+    v = _VALUE.match(c, m.end()) if m else None
+    if not v: return 'unknown'
+    return {'num': 'number', 'str': 'string', 'bool': 'boolean', 'arr': 'unknown[]', 'date': 'Date'}[v.lastgroup]
+
+
+class Owners:
+    """Type name at a diagnostic → (path, interface) that declares it"""
+
+    def __init__(self, store, index):
+        self.store, self.index = store, index
+        self._memo = {}
+
+    def _declares(self, path, name):
+        try: return self.store.exists(path) and self.store.index(path).get(name) is not None
+        except (OSError, UnicodeDecodeError): return False
+
+    def find(self, importer, name):
+        """→ (path, None) or (None, reason)"""
+        key = (importer, name)
+        if key not in self._memo: self._memo[key] = self._find(importer, name)
+        return self._memo[key]
+
+    def _find(self, importer, name):
+        if self._declares(importer, name): return importer, None
+        for spec, names, _ in self.index.files.get(importer, {}).get('imports', ()):
+            if names and name in names:
+                target = self.index.resolve(importer, spec)
+                if target and self._declares(target, name): return target, None
+        cands = [p for p, info in self.index.files.items() if name in info['exports'] and self._declares(p, name)]
+        if len(cands) == 1: return cands[0], None
+        if cands: return None, f"{len(cands)} files declare interface {name}"
+        if any(name in info['exports'] for info in self.index.files.values()): return None, f"{name} is not an interface"
+        return None, f"no interface {name} in the tree"
+
+
+def wanted(diags, store, owners, scope='src/'):
+    """→ ([Want], [(Diagnostic, reason)]) for the missing-property diagnostics among diags"""
+    out, unresolved, seen = [], [], set()
+    for d in diags:
+        rx = _MISSING.get(d.code)
+        if rx is None or not d.file.startswith(scope): continue
+        m = rx.search(d.message.split('\n')[0])
+        if m is None:
+            why = "looks like a typo" if 'Did you mean' in d.message else "type is not a plain named type"
+            unresolved.append((d, why)); continue
+        field, iface = m.groups()
+        path, why = owners.find(d.file, iface)
+        if path is None: unresolved.append((d, why)); continue
+        if (path, iface, field) in seen: continue
+        seen.add((path, iface, field))
+        if d.code == 'TS2741': decl = None
+        else:
+            try: t = guess_type(store.read(d.file), d.line, d.col, field)
+            except OSError: t = 'unknown'
+            decl = f"{_prop(field)}?: {t}"
+        out.append(Want(path, iface, field, decl, d))
+    return out, unresolved
+
+
+def plan(wants, round_no=1):
+    """One Fields Fix per (file, interface) → [Fix]"""
+    groups = {}
+    for w in wants: groups.setdefault((w.path, w.iface), []).append(w)
+    fixes = []
+    for (path, iface), ws in groups.items():
+        add = tuple(w.decl for w in ws if w.decl)
+        optional = tuple(w.field for w in ws if w.decl is None)
+        what = [f"+ {a}" for a in add] + [f"{o} → optional" for o in optional]
+        fixes.append(Fix(f"AF{round_no}.{len(fixes) + 1}", path, f"{iface}: {', '.join(what)}",
+                         (Fields(optional=optional, add=add),), ('interface', iface)))
+    return fixes
+
+
+def loop(diags, tsc, report, scope='src/', max_rounds=MAX_ROUNDS, jobs=1):
+    """--autofix from diags (last tsc run): rounds of plan → apply → flush → tsc(flushed paths) until nothing new is
+    fixable or the error count stops falling (that round is rolled back) → final [Diagnostic]"""
+    print(f"\n══ AUTOFIX ══  {len(diags)} TSC error(s), at most {max_rounds} round(s)")
+    index = SymbolIndex.load()
+    tried = set()
+    for n in range(1, max_rounds + 1):
+        store = BufferStore()
+        index.refresh()
+        wants, unresolved = wanted(diags, store, Owners(store, index), scope)
+        wants = [w for w in wants if (w.path, w.iface, w.field) not in tried]
+        if not wants:
+            print(f"\n  round {n}: nothing left to fix — fixed point at {len(diags)} error(s)")
+            break
+        tried.update((w.path, w.iface, w.field) for w in wants)
+        fixes = plan(wants, n)
+        print(f"\n  round {n}: {len(wants)} field(s) on {len(fixes)} interface(s)")
+        before = {f.path: store.read(f.path) for f in fixes}
+        for r in manifest.run(store, fixes, jobs=jobs): report[r.status](r.msg)
+        flushed = store.flush()
+        if not flushed:
+            print(f"  nothing changed — fixed point at {len(diags)} error(s)")
+            break
+        after = tsc(flushed)
+        print(f"  TSC errors: {len(diags)} → {len(after)}")
+        if len(after) >= len(diags):
+            for p in flushed: atomic_write(p, before[p])
+            print(f"  not falling — round {n} rolled back ({len(flushed)} file(s))")
+            tsc(flushed)    # bring the incremental build info back in line with the restored files
+            break
+        diags = after
+    else:
+        print(f"\n  stopped after {max_rounds} round(s) at {len(diags)} error(s)")
+    if unresolved:
+        print(f"\n  not auto-fixable: {len(unresolved)}")
+        for d, why in unresolved: print(f"    {d.file}({d.line},{d.col}) {d.code}: {why}")
+    index.save()
+    return diags
@@ -0,0 +1,143 @@
+"""
+Benchmark fixer trên cây giả (natt_fix.synth) — python3 -m natt_fix.bench
+- scale types.ts: 1k / 10k / 50k interface (--scales)
+- đo patch / make_optional / bulk_fields / splice x500 / extract_interface / find_interface_end / scan / markers / status / fuzzy + từng section A–D + cả A–D
+- mỗi lần chạy append 1 dòng vào .natt-fix/bench.jsonl (rev git, python, scale, min/median)
+- so với lần chạy trước cùng scale: in tỉ lệ, ⚠️ khi chậm hơn --threshold
+"""
+import argparse, json, os, platform, shutil, statistics, subprocess, sys, tempfile, time
+
+from natt_fix import STATE_DIR, fuzzy, manifest, synth
+from natt_fix.buffers import BufferStore
+from natt_fix.fixes import SECTIONS, FIXES, TYPES
+from natt_fix.ifaceindex import InterfaceIndex, extract_interface, find_interface_end
+from natt_fix.markers import Markers
+
+HISTORY = os.path.join(STATE_DIR, 'bench.jsonl')
+SCALES = (1000, 10000, 50000)
+
+
+def timeit(fn, setup=None, repeat=5):
+    """(min, median) seconds of fn(setup()) over `repeat` runs; setup is not timed"""
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        fn(arg) if setup else fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), statistics.median(times)
+
+
+def _loaded(path=TYPES):
+    """Fresh store with path already read (file I/O kept out of the measurement)"""
+    def setup():
+        s = BufferStore(); s.read(path); return s
+    return setup
+
+
+def cases(root):
+    """name -> (fn, setup); all paths relative to root (cwd is switched by run_scale)"""
+    with open(os.path.join(root, TYPES), encoding='utf-8') as f: c = f.read()
+    last = InterfaceIndex(c).spans[-1]
+    out = {
+        'scan': (lambda: InterfaceIndex(c), None),
+        'patch': (lambda s: manifest.patch(s, TYPES, '  event_version: string;', '  event_version?: string;', 'bench'),
+                  _loaded()),
+        'make_optional': (lambda s: manifest.make_optional(s, TYPES, 'TaxReport', r'  standardRate: number;', 'bench'),
+                          _loaded()),
+        'bulk_fields': (lambda s: manifest.bulk_fields(s, TYPES, {
+            'TaxReport': {'optional': ['standardRate']}, last.name: {'add': ['benchField?: number']}}, 'bench'),
+                        _loaded()),
+        'splice x500': (lambda s: (s.splice(TYPES, [(p, p, ' ') for p in range(0, len(c), len(c) // 500 + 1)]),
+                                   s.read(TYPES)), _loaded()),
+        'extract_interface': (lambda: extract_interface(c, last.name), None),
+        'find_interface_end': (lambda: find_interface_end(c, last.start), None),
+        'markers': (lambda: Markers([p for f in FIXES if f.path == TYPES for p in manifest.patterns(f)], c), None),
+        'status': (lambda s: manifest.status(s, FIXES), BufferStore),
+        'fuzzy index': (lambda: fuzzy.Index(c), None),
+        'fuzzy nearest': (lambda ix: ix.nearest('  standardRate: number;\n  taxAmount?: number;'), lambda: fuzzy.Index(c)),
+    }
+    for key, _, fixes in SECTIONS:
+        out[f'section {key}'] = ((lambda fx: lambda s: manifest.run(s, fx))(fixes), BufferStore)
+    out['A-D'] = (lambda s: manifest.run(s, FIXES), BufferStore)
+    return out
+
+
+def run_scale(interfaces, repeat=5):
+    """Generate a tree with `interfaces` filler interfaces, time every case → {name: [min, median]}"""
+    root = tempfile.mkdtemp(prefix='natt-bench-')
+    cwd = os.getcwd()
+    try:
+        synth.generate(root, interfaces)
+        os.chdir(root)
+        return {name: list(timeit(fn, setup, repeat)) for name, (fn, setup) in cases(root).items()}
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _rev():
+    try:
+        r = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True)
+        return r.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_history(path=HISTORY):
+    try:
+        with open(path, encoding='utf-8') as f: return [json.loads(l) for l in f if l.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def previous(history, scale):
+    for rec in reversed(history):
+        if rec.get('scale') == scale: return rec
+    return None
+
+
+def report(rec, prev=None, threshold=1.25):
+    """Print one scale's table; → names slower than threshold × previous median"""
+    print(f"\n  ── {rec['scale']:,} interfaces  (rev {rec['rev'] or '-'}) ──")
+    slow = []
+    for name, (mn, med) in rec['results'].items():
+        line = f"    {name:<20} min {mn * 1000:>9.3f} ms   median {med * 1000:>9.3f} ms"
+        old = prev and prev['results'].get(name)
+        if old and old[1] > 0:
+            ratio = med / old[1]
+            line += f"   ×{ratio:.2f} vs {prev['rev'] or '-'}"
+            if ratio > threshold: line += "  ⚠️"; slow.append(name)
+        print(line)
+    return slow
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark script-10 fixer on a synthetic NATT-OS tree")
+    ap.add_argument('--scales', default=','.join(map(str, SCALES)),
+                    help=f"comma-separated interface counts (default {','.join(map(str, SCALES))})")
+    ap.add_argument('--repeat', type=int, default=5, help="runs per case; min and median are kept")
+    ap.add_argument('--history', default=HISTORY, help=f"results file, one JSON line per scale (default {HISTORY})")
+    ap.add_argument('--threshold', type=float, default=1.25, help="flag cases slower than this × previous median")
+    ap.add_argument('--no-save', action='store_true', help="do not append results to the history file")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    history = load_history(args.history)
+    rev, slow = _rev(), []
+    for scale in (int(s) for s in args.scales.split(',') if s.strip()):
+        rec = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'rev': rev, 'python': platform.python_version(),
+               'scale': scale, 'repeat': args.repeat, 'results': run_scale(scale, args.repeat)}
+        slow += [f"{scale}:{n}" for n in report(rec, previous(history, scale), args.threshold)]
+        if not args.no_save:
+            os.makedirs(os.path.dirname(args.history) or '.', exist_ok=True)
+            with open(args.history, 'a', encoding='utf-8') as f: f.write(json.dumps(rec) + '\n')
+    if slow:
+        print(f"\n  ⚠️  slower than ×{args.threshold}: {', '.join(slow)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""
+Buffer store — mỗi file đọc 1 lần, ghi 1 lần mỗi lần chạy
+- read() load file lazily vào RAM, các lần sau trả bản trong RAM
+- write() chỉ đổi buffer + đánh dấu dirty
+- replace() / splice(): edit theo offset, gom vào EditList (không copy cả file mỗi edit);
+  text ghép lại đúng 1 lần join khi cần cả file (read / flush) → k edit trên 1 file: O(n + k)
+- flush() ghi mọi file dirty 1 lần, atomic (temp file + rename)
+- index() giữ InterfaceIndex theo path, tự dời offset sau mỗi write()
+- observe(): thêm đối tượng nhận on_edit() như InterfaceIndex (natt_fix.markers.Markers)
+- bytes_read / bytes_written / scans: bộ đếm cho trace (natt_fix.trace)
+- track=True: giữ nội dung gốc + EditMap từng file cho --plan (natt_fix.plan)
+"""
+import os, tempfile
+from bisect import bisect_right
+
+from natt_fix.ifaceindex import InterfaceIndex, diff_region
+from natt_fix.plan import EditMap
+
+WINDOW = 1024   # chars of context around an edit handed to InterfaceIndex.on_edit
+
+
+class EditConflict(ValueError):
+    """Two edits of one splice() claim overlapping text"""
+
+
+class EditList:
+    """Pending replacements over a base text, sorted and non-overlapping.
+    Item i: current offset cur[i], base[ba:bb] → text; a later edit touching an item is merged into it."""
+
+    def __init__(self, base):
+        self.base = base
+        self.cur, self.items = [], []   # cur[i] | [ba, bb, text]
+        self.size = len(base)           # length of the current text
+
+    def __len__(self): return len(self.items)
+
+    def _end(self, i): return self.cur[i] + len(self.items[i][2])
+
+    def _base_of(self, p, i):
+        """Base offset of current offset p, with every item before index i ending at or before p"""
+        return p if i == 0 else self.items[i - 1][1] + p - self._end(i - 1)
+
+    def slice(self, a, b):
+        """Current text [a, b) without building the whole file"""
+        out, p, n = [], a, len(self.cur)
+        i = max(0, bisect_right(self.cur, a) - 1)
+        while p < b:
+            while i < n and self._end(i) <= p: i += 1
+            if i < n and self.cur[i] <= p:
+                e = min(b, self._end(i))
+                out.append(self.items[i][2][p - self.cur[i]:e - self.cur[i]])
+            else:
+                e = min(b, self.cur[i]) if i < n else b
+                s = self._base_of(p, i)
+                out.append(self.base[s:s + e - p])
+            p = e
+        return ''.join(out)
+
+    def replace(self, a, b, text):
+        """Current [a, b) → text"""
+        i = bisect_right(self.cur, a) - 1
+        if i < 0 or self._end(i) < a: i += 1         # first item touching [a, b)
+        j = i
+        while j < len(self.cur) and self.cur[j] <= b: j += 1
+        if j > i:       # merge with the touched items into one
+            lo, hi = min(a, self.cur[i]), max(b, self._end(j - 1))
+            ba = self.items[i][0] if self.cur[i] <= a else self._base_of(a, i)
+            bb = self.items[j - 1][1] + max(0, b - self._end(j - 1))
+            old = self.slice(lo, hi)
+            text = old[:a - lo] + text + old[b - lo:]
+            a, b = lo, hi
+        else:
+            ba = self._base_of(a, i)
+            bb = ba + b - a
+        delta = len(text) - (b - a)
+        self.cur[i:j] = [a]
+        self.items[i:j] = [[ba, bb, text]]
+        for k in range(i + 1, len(self.cur)): self.cur[k] += delta
+        self.size += delta
+
+    def text(self):
+        """Whole current text: one join over base pieces and item texts"""
+        parts, pos = [], 0
+        for ba, bb, t in self.items:
+            parts.append(self.base[pos:ba]); parts.append(t); pos = bb
+        parts.append(self.base[pos:])
+        return ''.join(parts)
+
+
+class BufferStore:
+    def __init__(self, track=False):
+        self._buf = {}      # path -> content (base text when edits are pending)
+        self._pending = {}  # path -> EditList not yet joined into _buf
+        self._dirty = []    # paths to flush, in first-modified order
+        self._index = {}    # path -> InterfaceIndex over current content
+        self._observers = {}    # path -> [object with on_edit(a, old, new, c, off, size)]
+        self.bytes_read = 0     # from disk
+        self.bytes_written = 0  # into buffers (chars) and, at flush, to disk (bytes)
+        self.scans = 0          # full InterfaceIndex builds
+        self.track = track
+        self.orig = {}      # track: path -> content before the first write (None = new file)
+        self.edits = {}     # track: path -> EditMap
+
+    def read(self, path):
+        if path in self._pending:
+            self._buf[path] = self._pending.pop(path).text()
+        elif path not in self._buf:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._buf[path] = f.read()
+                self.bytes_read += os.fstat(f.fileno()).st_size
+        return self._buf[path]
+
+    def slice(self, path, a, b):
+        """Current text [a, b) of path (no join of pending edits)"""
+        el = self._pending.get(path)
+        return el.slice(a, b) if el is not None else self.read(path)[a:b]
+
+    def size(self, path):
+        el = self._pending.get(path)
+        return el.size if el is not None else len(self.read(path))
+
+    def write(self, path, c):
+        old = self.read(path) if path in self._pending else self._buf.get(path)
+        if old == c and os.path.exists(path): return
+        if self.track and path not in self.orig:
+            if old is None and os.path.exists(path): old = self.read(path)
+            self.orig[path] = old
+            if old == c: return
+        idx = self._index.get(path)
+        obs = self._observers.get(path, ())
+        region = diff_region(old, c) if old is not None and (idx is not None or obs or self.track) else None
+        if idx is not None:
+            if old is None: del self._index[path]
+            else: idx.on_edit(*region, c)
+        for o in obs: o.on_edit(*(region or (0, '', c)), c)
+        if self.track and old is not None:
+            self.edits.setdefault(path, EditMap()).add(region[0], len(region[1]), len(region[2]))
+        self._buf[path] = c
+        self.bytes_written += len(c)
+        if path not in self._dirty: self._dirty.append(path)
+
+    def replace(self, path, a, b, text):
+        """Current [a, b) of path → text, recorded as an edit (the file is not copied)"""
+        old = self.slice(path, a, b)
+        if old == text: return
+        el = self._pending.get(path)
+        if el is None:
+            el = self._pending[path] = EditList(self.read(path))
+            if self.track and path not in self.orig: self.orig[path] = el.base
+        el.replace(a, b, text)
+        idx = self._index.get(path)
+        obs = self._observers.get(path, ())
+        if idx is not None or obs:
+            lo, e = max(0, a - WINDOW), a + len(text)
+            w = el.slice(lo, min(el.size, e + WINDOW))
+            if idx is not None: idx.on_edit(a, old, text, w, lo, el.size)
+            for o in obs: o.on_edit(a, old, text, w, lo, el.size)
+        if self.track: self.edits.setdefault(path, EditMap()).add(a, b - a, len(text))
+        self.bytes_written += len(text)
+        if path not in self._dirty: self._dirty.append(path)
+
+    def splice(self, path, edits):
+        """Apply (a, b, text) edits, all in current offsets, as one batch; EditConflict if two overlap"""
+        edits = sorted(edits, key=lambda e: (e[0], e[1]))
+        for (a0, b0, t0), (a1, b1, t1) in zip(edits, edits[1:]):
+            if a1 < b0 or (a1 == a0 and b0 == a0 == b1):
+                raise EditConflict(f"{path}: edits overlap at offsets {a0}-{b0} ({t0!r}) and {a1}-{b1} ({t1!r})")
+        for a, b, t in reversed(edits): self.replace(path, a, b, t)
+
+    def loaded(self, path): return path in self._buf
+
+    def exists(self, path):
+        return path in self._buf or os.path.exists(path)
+
+    def index(self, path):
+        """InterfaceIndex for the current buffer; rebuilt only when an edit touched structure"""
+        idx = self._index.get(path)
+        if idx is None or idx.stale:
+            idx = self._index[path] = InterfaceIndex(self.read(path))
+            self.scans += 1
+        return idx
+
+    def observe(self, path, obj):
+        """obj.on_edit(a, old, new, c, off, size) after every edit of path, until unobserve()"""
+        self._observers.setdefault(path, []).append(obj)
+
+    def unobserve(self, path, obj):
+        obs = self._observers.get(path, [])
+        if obj in obs: obs.remove(obj)
+        if not obs: self._observers.pop(path, None)
+
+    def is_dirty(self, path): return path in self._dirty
+
+    @property
+    def dirty(self): return list(self._dirty)
+
+    def flush(self):
+        """Write every dirty buffer atomically; return the flushed paths"""
+        done = []
+        for path in self._dirty:
+            self.bytes_written += atomic_write(path, self.read(path))
+            done.append(path)
+        self._dirty = []
+        return done
+
+
+def splice(c, edits):
+    """c with non-overlapping (a, b, text) edits applied, built with a single join"""
+    parts, pos = [], 0
+    for a, b, t in sorted(edits, key=lambda e: (e[0], e[1])):
+        if a < pos: raise EditConflict(f"edits overlap at offset {a}")
+        parts.append(c[pos:a]); parts.append(t); pos = b
+    parts.append(c[pos:])
+    return ''.join(parts)
+
+
+def atomic_write(path, c):
+    """Write c to path via temp file in the same dir + os.replace → bytes written"""
+    d = os.path.dirname(path) or '.'
+    os.makedirs(d, exist_ok=True)
+    try: mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        um = os.umask(0); os.umask(um); mode = 0o666 & ~um
+    fd, tmp = tempfile.mkstemp(dir=d, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(c); f.flush()
+            n = os.fstat(f.fileno()).st_size
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+        return n
+    except BaseException:
+        if os.path.exists(tmp): os.unlink(tmp)
+        raise
@@ -0,0 +1,187 @@
+"""
+Cell scanner — dựng lại src/cells/natt-master-registry.json từ FILESYSTEM (thay khối Node của goldmaster v2.1)
+- quét src/cells/{kernel,infrastructure,business,shared-kernel}, mỗi cell 1 task trên process pool
+- mỗi cell: ts_files, layers (5 folder), manifest, has_logic, status — cùng luật với countTs/getLayers/inferStatus
+- kiểm tra: thiếu folder nào trong 5 folder, cell.manifest.json thiếu / JSON hỏng / identity lệch tên cell
+- chỉ ghi registry khi có field đổi; last_synced chỉ đổi ở cell đổi (+ meta / summary)
+- python3 -m natt_fix.cells [--dry-run] [--force] [-j N]
+"""
+import argparse, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+
+from natt_fix.buffers import atomic_write
+
+CELLS_ROOT = 'src/cells'
+REGISTRY = os.path.join(CELLS_ROOT, 'natt-master-registry.json')
+LAYERS = ('domain', 'application', 'interface', 'infrastructure', 'ports')
+WAVES = {'kernel': 'wave_1_kernel', 'infrastructure': 'wave_2_infrastructure',
+         'business': 'wave_3_business', 'shared-kernel': 'shared_kernel'}
+FIELDS = ('ts_files', 'layers', 'manifest', 'has_logic', 'status')
+
+
+def count_ts(d):
+    """.ts/.tsx under d, without *.spec.ts / *.test.ts, node_modules, __tests__*"""
+    n, stack = 0, [d]
+    while stack:
+        try: it = os.scandir(stack.pop())
+        except OSError: continue
+        with it:
+            for e in it:
+                if e.is_dir():
+                    if e.name != 'node_modules' and not e.name.startswith('__tests__'): stack.append(e.path)
+                elif e.name.endswith(('.ts', '.tsx')) and not e.name.endswith(('.spec.ts', '.test.ts')):
+                    n += 1
+    return n
+
+
+def scan_cell(path):
+    """One cell directory → {ts_files, layers, manifest, has_logic, missing_layers, problems}"""
+    present = [l for l in LAYERS if os.path.isdir(os.path.join(path, l))]
+    problems = []
+    mp = os.path.join(path, 'cell.manifest.json')
+    manifest = os.path.isfile(mp)
+    if manifest:
+        try:
+            with open(mp, encoding='utf-8') as f: m = json.load(f)
+        except (OSError, ValueError) as e:
+            problems.append(f"cell.manifest.json unreadable: {e}")
+        else:
+            ident = m.get('cell') or (m.get('constitutionalAdn') or {}).get('identity')
+            if isinstance(ident, dict): ident = ident.get('name')
+            if ident and ident != os.path.basename(path.rstrip('/')):
+                problems.append(f"cell.manifest.json identity '{ident}' ≠ folder name")
+    else:
+        problems.append("no cell.manifest.json")
+    return {'ts_files': count_ts(path), 'layers': len(present), 'manifest': manifest,
+            'has_logic': count_ts(os.path.join(path, 'domain', 'entities')) > 0
+                         or count_ts(os.path.join(path, 'domain', 'services')) > 0,
+            'missing_layers': [l for l in LAYERS if l not in present], 'problems': problems}
+
+
+def infer_status(scan, existing, force=False):
+    """QUARANTINED (unless force) and NEVER_EXISTED are kept; otherwise from layers + has_logic"""
+    if existing == 'QUARANTINED' and not force: return existing
+    if existing == 'NEVER_EXISTED': return existing
+    if scan['layers'] >= 5 and scan['has_logic']: return 'ACTIVE'
+    if scan['layers'] >= 3: return 'IN_PROGRESS'
+    if scan['layers'] > 0: return 'SCAFFOLDED'
+    return 'EMPTY'
+
+
+def find_cells(root=CELLS_ROOT):
+    """[(layer dir, cell id, path)] for every cell folder on disk"""
+    out = []
+    for layer in WAVES:
+        try: it = os.scandir(os.path.join(root, layer))
+        except OSError: continue
+        with it:
+            out += sorted((layer, e.name, e.path) for e in it if e.is_dir() and not e.name.startswith('.'))
+    return out
+
+
+def scan(root=CELLS_ROOT, jobs=None):
+    """{(layer, cell id): scan_cell()} — one pool task per cell (jobs 1 = in process)"""
+    cells = find_cells(root)
+    paths = [p for _, _, p in cells]
+    if jobs is not None and jobs <= 0: jobs = None
+    if jobs == 1 or len(paths) <= 1:
+        results = list(map(scan_cell, paths))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as ex: results = list(ex.map(scan_cell, paths))
+    return {(layer, cid): r for (layer, cid, _), r in zip(cells, results)}
+
+
+def _now():
+    t = time.time()
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(t)) + f'.{int(t * 1000) % 1000:03d}Z'
+
+
+def sync(reg, scans, force=False, root=CELLS_ROOT):
+    """Update reg in place from scans → [(cell id, {field: (old, new)})] for cells that changed;
+    quarantined cells are reported but left alone unless force"""
+    changes, now = [], _now()
+    for (layer, cid), s in scans.items():
+        wave = reg.setdefault(WAVES[layer], {'status': 'IN_PROGRESS', 'cells': {}})
+        meta = wave.setdefault('cells', {}).get(cid)
+        if meta is None:
+            meta = wave['cells'][cid] = {'path': f"{root}/{layer}/{cid}/"}
+        new = dict(s, status=infer_status(s, meta.get('status', 'UNKNOWN'), force))
+        diff = {f: (meta.get(f), new[f]) for f in FIELDS if meta.get(f) != new[f]}
+        if not diff: continue
+        if meta.get('status') == 'QUARANTINED' and not force:
+            changes.append((cid, dict(diff, skipped=('QUARANTINED', 'use --force')))); continue
+        for f in FIELDS: meta[f] = new[f]
+        meta['last_synced'] = now
+        changes.append((cid, diff))
+    if any('skipped' not in d for _, d in changes):
+        _summary(reg, now)
+    return changes
+
+
+def _summary(reg, now):
+    """Totals over every registered cell that has been scanned"""
+    cells = [m for w in WAVES.values() for m in reg.get(w, {}).get('cells', {}).values() if 'ts_files' in m]
+    s = reg.setdefault('summary', {})
+    s.update(total_cells=len(cells), total_ts_files=sum(m['ts_files'] for m in cells),
+             total_manifests=sum(bool(m.get('manifest')) for m in cells))
+    for key, b in s.get('breakdown', {}).items():
+        group = _group(reg, key)
+        if group: b.update(cells=len(group), ts_files=sum(m['ts_files'] for m in group))
+    s['last_synced'] = now
+    s['sync_method'] = 'natt-fix-cells'
+    reg.setdefault('meta', {})['last_synced'] = now
+
+
+def _group(reg, key):
+    """Scanned cells of a summary.breakdown key: 'kernel', 'infrastructure', 'business_wave3' (cells
+    whose "wave" is WAVE_3), 'business_wave35' (WAVE_3.5)"""
+    layer, _, wave = key.partition('_wave')
+    cells = [m for m in reg.get(WAVES.get(layer.replace('_', '-'), ''), {}).get('cells', {}).values() if 'ts_files' in m]
+    if wave: cells = [m for m in cells if m.get('wave') == 'WAVE_' + '.'.join(wave)]
+    return cells
+
+
+def load(path=REGISTRY):
+    with open(path, encoding='utf-8') as f: return json.load(f)
+
+
+def save(reg, path=REGISTRY):
+    atomic_write(path, json.dumps(reg, indent=2, ensure_ascii=False))
+
+
+def run(path=REGISTRY, root=CELLS_ROOT, jobs=None, force=False, dry_run=False):
+    """Scan, print layout / manifest problems and changes, write the registry if anything changed
+    → (changes, scans)"""
+    scans = scan(root, jobs)
+    reg = load(path)
+    changes = sync(reg, scans, force, root)
+    for (layer, cid), s in scans.items():
+        for l in s['missing_layers']: print(f"  ⚠️  {layer}/{cid}: missing {l}/")
+        for p in s['problems']: print(f"  ⚠️  {layer}/{cid}: {p}")
+    written = any('skipped' not in d for _, d in changes)
+    for cid, diff in changes:
+        skipped = diff.pop('skipped', None)
+        what = ', '.join(f"{f} {o}→{n}" for f, (o, n) in diff.items())
+        print(f"  {'⚠️  SKIP' if skipped else 'UPDATE'}: {cid} | {what}" + (f" ({skipped[0]}, {skipped[1]})" if skipped else ''))
+    if not changes: print(f"  registry up to date: {len(scans)} cell(s)")
+    elif dry_run or not written: print(f"  {path} not written")
+    else:
+        save(reg, path)
+        print(f"  registry written: {path}")
+    return changes, scans
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rebuild natt-master-registry.json from a filesystem scan of src/cells")
+    ap.add_argument('-j', '--jobs', type=int, default=0, help="process pool size (0 = all CPUs, 1 = serial)")
+    ap.add_argument('--force', action='store_true', help="also update QUARANTINED cells")
+    ap.add_argument('--dry-run', action='store_true', help="report changes, do not write the registry")
+    ap.add_argument('--registry', default=REGISTRY)
+    args = ap.parse_args(argv)
+    if not os.path.exists(args.registry):
+        print(f"❌ {args.registry} not found — run from the goldmaster root"); sys.exit(1)
+    run(args.registry, jobs=args.jobs, force=args.force, dry_run=args.dry_run)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+tsc diagnostics — parse từng dòng khi tsc đang chạy, không buffer cả stdout
+- parse(): stream dòng → Diagnostic(file, line, col, code, message)
+- group_by(): theo code / file để triage
+- Report JSON + diff với baseline: chỉ in lỗi MỚI và lỗi ĐÃ HẾT
+- report ghi kèm tree (stat của src/ + tsconfig.json lúc check): rollback chỉ tin report đúng cây hiện tại
+"""
+import json, os, re, time
+from collections import Counter, namedtuple
+
+from natt_fix import STATE_DIR
+from natt_fix.buffers import atomic_write
+
+REPORT = os.path.join(STATE_DIR, 'tsc-report.json')
+BASELINE = os.path.join(STATE_DIR, 'tsc-baseline.json')
+
+Diagnostic = namedtuple('Diagnostic', 'file line col code message')
+
+# src/types.ts(12,3): error TS2339: Property 'x' does not exist on type 'Y'.
+_LINE = re.compile(r'^(?P<file>.+?)\((?P<line>\d+),(?P<col>\d+)\): error (?P<code>TS\d+): (?P<msg>.*)$')
+# error TS5058: The specified path does not exist: 'tsconfig.json'.
+_GLOBAL = re.compile(r'^error (?P<code>TS\d+): (?P<msg>.*)$')
+
+
+def parse(lines):
+    """Yield Diagnostic per error; indented continuation lines join the previous message"""
+    cur = None
+    for raw in lines:
+        line = raw.rstrip('\r\n')
+        m = _LINE.match(line)
+        g = None if m else _GLOBAL.match(line)
+        if m or g:
+            if cur: yield cur
+            cur = (Diagnostic(m['file'], int(m['line']), int(m['col']), m['code'], m['msg']) if m
+                   else Diagnostic('', 0, 0, g['code'], g['msg']))
+        elif cur and line.startswith((' ', '\t')) and line.strip():
+            cur = cur._replace(message=cur.message + '\n' + line.strip())
+        elif cur:
+            yield cur; cur = None
+    if cur: yield cur
+
+
+def group_by(diags, field):
+    """field -> [Diagnostic], largest group first"""
+    groups = {}
+    for d in diags: groups.setdefault(getattr(d, field), []).append(d)
+    return dict(sorted(groups.items(), key=lambda kv: -len(kv[1])))
+
+
+def _key(d):
+    # line/col shift whenever a fix edits a file — match on what the error *is*
+    return (d.file, d.code, d.message)
+
+
+def to_report(diags, command=None, tree=None):
+    """tree: snapshot.tree_state() of the files the diagnostics were computed on"""
+    return {
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'command': command,
+        'tree': tree,
+        'total': len(diags),
+        'by_code': {k: len(v) for k, v in group_by(diags, 'code').items()},
+        'by_file': {k: len(v) for k, v in group_by(diags, 'file').items()},
+        'diagnostics': [d._asdict() for d in diags],
+    }
+
+
+def write_report(report, path=REPORT):
+    atomic_write(path, json.dumps(report, ensure_ascii=False, indent=1))
+
+
+def load_report(path):
+    """[Diagnostic] from a report file, or None if it does not exist"""
+    try:
+        with open(path, encoding='utf-8') as f: data = json.load(f)
+    except FileNotFoundError:
+        return None
+    return [Diagnostic(**d) for d in data.get('diagnostics', [])]
+
+
+def load_command(path):
+    """'command' of a report file (None if missing / not recorded)"""
+    try:
+        with open(path, encoding='utf-8') as f: return json.load(f).get('command')
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def load_tree(path):
+    """'tree' of a report file: the tree state it was computed on (None if missing / not recorded)"""
+    try:
+        with open(path, encoding='utf-8') as f: return json.load(f).get('tree')
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def scope(command):
+    """Files a report covers: None = the whole program (tsc), the checked files for a tsserver report"""
+    if not command or 'tsserver' not in command: return None
+    return set(command[command.index('tsserver') + 1:])
+
+
+def diff(baseline, current):
+    """(new, resolved): multiset difference on (file, code, message)"""
+    b, c = Counter(map(_key, baseline)), Counter(map(_key, current))
+    new_left, gone_left = c - b, b - c
+    new, resolved = [], []
+    for d in current:
+        k = _key(d)
+        if new_left[k] > 0: new_left[k] -= 1; new.append(d)
+    for d in baseline:
+        k = _key(d)
+        if gone_left[k] > 0: gone_left[k] -= 1; resolved.append(d)
+    return new, resolved
+
+
+def fmt(d):
+    head = f"{d.file}({d.line},{d.col})" if d.file else "(global)"
+    return f"{head}: {d.code}: {d.message.splitlines()[0] if d.message else ''}"
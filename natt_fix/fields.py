@@ -0,0 +1,111 @@
+"""
+Field ops — optional / add / retype field trong interface, theo token TS thật, 1 lượt cho cả file
+- members(): tách body interface thành member (bỏ qua string / comment / template, đếm { ( [ <)
+- edits(): offset edit cho 1 interface, chỉ trong đúng interface đó (không re.sub cả file)
+- union: chỉ nối thêm member còn thiếu vào union type của field (giữ nguyên thứ tự / member đã có)
+- nhiều interface / 1 file: manifest.apply_fields (bulk_fields) gom edit của mọi interface, 1 lần splice
+"""
+import re
+from collections import namedtuple
+
+# name: identifier / quoted key / None for index and call signatures; optional: '?' after the name
+Member = namedtuple('Member', 'name start name_end optional type_start type_end end')
+
+_SKIP = re.compile(r'\s+|//[^\n]*|/\*.*?(?:\*/|\Z)', re.S)
+_STR = re.compile(r"""'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?|`(?:[^`\\]|\\.)*`?""", re.S)
+_NAME = re.compile(r'(?:(?:readonly|declare)\s+)*([A-Za-z_$][\w$]*|\'[^\'\n]*\'|"[^"\n]*")\s*(\?)?\s*')
+_OPEN, _CLOSE = '{([<', '})]>'
+_CONT = ':|&,=(<'      # a member ending in one of these continues on the next line
+_ALT = re.compile(r"""(?:'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|[^|'"])+""")
+
+
+def _skip(c, i, end):
+    while i < end:
+        m = _SKIP.match(c, i)
+        if not m or m.end() == i: return i
+        i = m.end()
+    return end
+
+
+def _member_end(c, i, end):
+    """(end of member text, end past its ';' / ',' / line break) from i, at bracket depth 0"""
+    depth = 0
+    last = i        # end of the last significant char
+    while i < end:
+        ch = c[i]
+        if ch in '\'"`':
+            i = _STR.match(c, i).end(); last = i; continue
+        if c.startswith('//', i) or c.startswith('/*', i):
+            i = _SKIP.match(c, i).end(); continue
+        if ch == '=' and c.startswith('=>', i):
+            i += 2; last = i; continue
+        if ch in _OPEN: depth += 1
+        elif ch in _CLOSE: depth = max(0, depth - 1)
+        elif depth == 0 and ch in ';,': return last, i + 1
+        elif depth == 0 and ch == '\n':
+            j = _skip(c, i, end)
+            if c[last - 1] not in _CONT and (j >= end or c[j] not in '|&'): return last, i + 1
+        if not ch.isspace(): last = i + 1
+        i += 1
+    return last, end
+
+
+def members(c, body_start, close):
+    """Members of the interface body c[body_start] == '{' … c[close] == '}'"""
+    out, i = [], body_start + 1
+    while True:
+        i = _skip(c, i, close)
+        if i >= close: return out
+        text_end, nxt = _member_end(c, i, close)
+        m = _NAME.match(c, i, text_end)
+        name = name_end = ts = None
+        optional = False
+        if m and c[i] != '[':
+            name, name_end, optional = m.group(1).strip('\'"'), m.end(1), bool(m.group(2))
+            if m.end() < text_end and c[m.end()] == ':': ts = _skip(c, m.end() + 1, text_end)
+        out.append(Member(name, i, name_end, optional, ts, text_end if ts is not None else None, nxt))
+        i = nxt
+
+
+def _decl_name(decl):
+    return _NAME.match(decl).group(1).strip('\'"')
+
+
+def alternatives(t):
+    """Top-level members of a union type text: "'A' | 'B'" → ["'A'", "'B'"] (a '|' inside quotes is not split)"""
+    return [a.strip() for a in _ALT.findall(t) if a.strip()]
+
+
+def edits(c, span, optional=(), add=(), retype=(), union=()):
+    """→ ([(a, b, text)], changed, missing) for one interface span in c.
+    optional: field names; add: declarations ('x?: number'); retype: ((field, type), …);
+    union: ((field, (member, …)), …) → members not yet in the field's union appended"""
+    ms = members(c, span.body_start, span.close)
+    by_name = {}
+    for m in ms:
+        if m.name is not None: by_name.setdefault(m.name, m)
+    out, missing = [], []
+    for f in optional:
+        m = by_name.get(f)
+        if m is None: missing.append(f)
+        elif not m.optional and m.type_start is not None: out.append((m.name_end, m.name_end, '?'))
+    for f, t in retype:
+        m = by_name.get(f)
+        if m is None or m.type_start is None: missing.append(f)
+        elif c[m.type_start:m.type_end] != t: out.append((m.type_start, m.type_end, t))
+    for f, alts in union:
+        m = by_name.get(f)
+        if m is None or m.type_start is None: missing.append(f); continue
+        have = alternatives(c[m.type_start:m.type_end])
+        more = [a for a in alts if a not in have]
+        if more: out.append((m.type_end, m.type_end, ''.join(f" | {a}" for a in more)))
+    new = [d for d in add if _decl_name(d) not in by_name]
+    if new:
+        # like Append: a blank line, then the new fields just above the closing brace
+        at = c.rfind('\n', span.body_start, span.close) + 1 or span.close
+        if c[at:span.close].strip(): at = span.close
+        indent = re.match(r'[ \t]*', c[c.rfind('\n', 0, ms[-1].start) + 1:]).group() if ms else '  '
+        text = '\n' + ''.join(f"{indent}{d.rstrip(';')};\n" for d in new)
+        out.append((at, at, text))
+    return out, bool(out), missing
+
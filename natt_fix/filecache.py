@@ -0,0 +1,81 @@
+"""
+File cache — re-run trên file đã patch xong chỉ tốn 1 stat() / file
+- mỗi file đích: mtime_ns + size + sha256 nội dung + fingerprint của các fix nhắm vào nó
+- stat khớp → skip mọi fix của file, không đọc, không regex
+- stat lệch nhưng hash khớp (touch, checkout lại) → vẫn skip, cập nhật stat
+- sửa 1 fix trong manifest → chỉ file của fix đó chạy lại
+- file có anchor hụt (kết quả kèm "closest: …") không được ghi cache; --fuzzy-apply bỏ qua cache
+- file có fix bị chặn (blocked by 1 FAIL ở file khác) không được ghi cache: phải chạy lại khi FAIL đã sửa
+"""
+import dataclasses, hashlib, json, marshal, os
+
+from natt_fix import STATE_DIR, fuzzy
+from natt_fix.buffers import atomic_write
+from natt_fix.manifest import is_blocked
+
+CACHE = os.path.join(STATE_DIR, 'filecache.json')
+VERSION = 1     # bump when apply_fix semantics change
+
+
+def _fp(x):
+    """Stable text form of a fix / op (callables by name + bytecode, not by address)"""
+    if dataclasses.is_dataclass(x):
+        return type(x).__name__ + '(' + ','.join(_fp(getattr(x, f.name)) for f in dataclasses.fields(x)) + ')'
+    if isinstance(x, (tuple, list)): return '(' + ','.join(map(_fp, x)) + ')'
+    if hasattr(x, '__code__'):
+        return f"{x.__module__}.{x.__qualname__}:{hashlib.sha256(marshal.dumps(x.__code__)).hexdigest()[:16]}"
+    return repr(x)
+
+
+def fingerprint(fixes):
+    return hashlib.sha256('\n'.join(map(_fp, fixes)).encode()).hexdigest()
+
+
+def digest(c):
+    return hashlib.sha256(c.encode('utf-8')).hexdigest()
+
+
+class FileCache:
+    def __init__(self, entries=None, path=CACHE):
+        self.path = path
+        self.entries = entries or {}    # file -> {mtime_ns, size, sha256, fixset}
+        self.hits = set()
+
+    @classmethod
+    def load(cls, path=CACHE):
+        try:
+            with open(path, encoding='utf-8') as f: data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return cls(path=path)
+        return cls(data.get('files') if data.get('version') == VERSION else None, path)
+
+    def fresh(self, store, path, fixes):
+        """True if path is byte-for-byte what the last successful run left for this fix set"""
+        e = self.entries.get(path)
+        if e is None or e['fixset'] != fingerprint(fixes): return False
+        try: st = os.stat(path)
+        except FileNotFoundError: return False
+        if (st.st_mtime_ns, st.st_size) != (e['mtime_ns'], e['size']):
+            if store.is_dirty(path) or digest(store.read(path)) != e['sha256']: return False
+            e['mtime_ns'], e['size'] = st.st_mtime_ns, st.st_size
+        self.hits.add(path)
+        return True
+
+    def update(self, store, fixes, results):
+        """After flush: record every file whose fixes all ran without FAIL, drop the rest.
+        A file with a drifted anchor (result names fuzzy candidates) is not recorded: its report keeps showing;
+        nor one with a fix blocked by a FAIL elsewhere: it has to run again once the blocker is fixed"""
+        by_file = {}
+        for f, r in zip(fixes, results): by_file.setdefault(f.path, []).append((f, r))
+        for path, pairs in by_file.items():
+            if path in self.hits: continue
+            if (any(r.status == 'fail' or is_blocked(r) or fuzzy.CLOSEST in r.msg for _, r in pairs)
+                    or not os.path.exists(path)):
+                self.entries.pop(path, None); continue
+            st = os.stat(path)
+            self.entries[path] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size,
+                                  'sha256': digest(store.read(path)),
+                                  'fixset': fingerprint([f for f, _ in pairs])}
+
+    def save(self):
+        atomic_write(self.path, json.dumps({'version': VERSION, 'files': self.entries}, indent=1))
@@ -0,0 +1,436 @@
+"""
+Fix set của script 10 — A (types.ts) · B (service rewrites) · C (import paths) · D (logic/type)
+Mỗi fix khai báo: file, scope, ops, marker idempotent. Engine ở natt_fix.manifest.
+after=: thứ tự phụ thuộc giữa các fix (D13 sau A2/A3, D8 sau A13, D7 sau B5); fix tiên quyết strict=True:
+  thiếu file / interface / anchor → FAIL → fix phụ thuộc bị chặn (blocked by), không SKIP lặng lẽ
+select(): --section / --only / --skip → fix cần chạy (A4 = A4a…A4f) + bước C6 / E
+"""
+import re
+
+from natt_fix.manifest import (Fix, Replace, Sub, Append, Prepend,
+                               Rewrite, Create, Custom, Fields, id_matches, check_deps)
+
+TYPES = 'src/types.ts'
+WARE = 'src/cells/infrastructure/warehouse-cell/domain/entities/WarehouseEntity.ts'
+
+
+def iface(name): return ('interface', name)
+def klass(name): return ('class', name)
+def cast_destination(m): return "destination: " + m.group(0)[len("destination: "):].rstrip(',') + " as any,"
+def cast_entry(m): return m.group(0).replace('}', '} as any')
+
+
+# ================================================================
+# A. TYPES.TS
+# ================================================================
+A = [
+    # A1. QuantumState broken syntax: waveFunction type missing closing }
+    # Current: waveFunction: { amplitude: number; frequency: number; phase: number
+    # Fixed:   waveFunction: { amplitude: number; frequency: number; phase: number }
+    Fix('A1', TYPES, "QuantumState.waveFunction syntax fixed", (
+        Replace('waveFunction: { amplitude: number; frequency: number; phase: number \n  lastCollapse?: number;\n};\n  lastCollapse: number;',
+                'waveFunction: { amplitude: number; frequency: number; phase: number };\n  lastCollapse?: number;\n  lastCollapse_legacy?: number;', -1),
+        Sub(r'(waveFunction: \{ amplitude: number; frequency: number; phase: number) \n(\s*lastCollapse\?)', r'\1 };\n\2'),
+    ), marker=('waveFunction: { amplitude', 'phase: number }')),
+
+    # A2. QuantumState: make id optional (quantum-engine initializes without it)
+    Fix('A2', TYPES, "QuantumState.id → optional", (Fields(optional=('id',)),), iface('QuantumState'), strict=True),
+    # A3. ConsciousnessField: make activeDomains optional
+    Fix('A3', TYPES, "ConsciousnessField.activeDomains → optional",
+        (Fields(optional=('activeDomains',)),), iface('ConsciousnessField'), strict=True),
+    # A4. TeamPerformance: make required fields optional
+    *[Fix(f'A4{k}', TYPES, f"TeamPerformance.{field} → optional", (Fields(optional=(field,)),), iface('TeamPerformance'))
+      for k, field in zip('abcdef', ["teamId", "period", "kpiScore", "revenue", "targets", "actuals"])],
+
+    # A5. AccountingMappingRule: add mappingType?, sourceField?, destinationField?
+    Fix('A5', TYPES, "AccountingMappingRule: mappingType/sourceField/destinationField added", (
+        Replace('  autoPost?: boolean;', '  autoPost?: boolean;\n  mappingType?: string;\n  sourceField?: string;\n  destinationField?: string;'),
+    ), iface('AccountingMappingRule'), marker='mappingType'),
+    # A6. AccountingEntry: add matchScore?, entries?, journalId?
+    Fix('A6', TYPES, "AccountingEntry: matchScore/entries/journalId added", (
+        Replace('  reference?: unknown;', '  reference?: unknown;\n  matchScore?: number;\n  entries?: unknown[];\n  journalId?: string;'),
+    ), iface('AccountingEntry'), marker='matchScore'),
+    # A7. HUDMetric: add icon?, department?
+    Fix('A7', TYPES, "HUDMetric: icon + department added", (
+        Replace('  label: string;', '  label: string;\n  icon?: string;\n  department?: unknown;'),
+    ), iface('HUDMetric'), marker='icon'),
+
+    # A8. DictionaryVersion: comment?, createdBy?, metadata?, publishedAt/By/changeLog → optional
+    Fix('A8a', TYPES, "DictionaryVersion comment/createdBy/metadata added", (
+        Replace('  versionNumber: number;', '  versionNumber: number;\n  comment?: string;\n  createdBy?: string;\n  metadata?: Record<string, unknown>;'),
+    ), iface('DictionaryVersion'), marker='comment?', when='versionNumber'),
+    Fix('A8b', TYPES, "DictionaryVersion publishedAt/By/changeLog → optional", (
+        Fields(optional=('publishedAt', 'publishedBy', 'changeLog')),
+    ), iface('DictionaryVersion')),
+
+    # A9. GovernanceKPI: target_value?
+    Fix('A9', TYPES, "GovernanceKPI.target_value? added", (
+        Replace('  period_date?: number;', '  period_date?: number;\n  target_value?: number;'),
+    ), iface('GovernanceKPI'), marker='target_value'),
+
+    # A10–A13: add fields before the interface's closing }
+    Fix('A10', TYPES, "OrderPricing: shippingFee/insuranceFee/grossProfit added", (
+        Fields(add=('shippingFee?: number', 'insuranceFee?: number', 'grossProfit?: number')),
+    ), iface('OrderPricing')),
+    Fix('A11', TYPES, "CustomerLead: expiryDate/status added", (
+        Fields(add=('expiryDate?: number', 'status?: string')),
+    ), iface('CustomerLead')),
+    Fix('A12', TYPES, "SellerReport: customerName/customerPhone added", (
+        Fields(add=('customerName?: string', 'customerPhone?: string')),
+    ), iface('SellerReport')),
+    Fix('A13', TYPES, "Certification: issueDate/renewalOf added", (
+        Fields(add=('issueDate?: number', 'renewalOf?: string')),
+    ), iface('Certification'), strict=True),
+
+    # A14. StateChange: causationId?, domain/actor/timestamp → optional
+    Fix('A14a', TYPES, "StateChange.causationId? added", (Fields(add=('causationId?: string',)),),
+        iface('StateChange')),
+    Fix('A14b', TYPES, "StateChange domain/actor/timestamp → optional", (
+        Fields(optional=('domain', 'actor', 'timestamp')),
+    ), iface('StateChange')),
+
+    # A15. ApprovalTicket: approvalRequestId/assignedTo/priority → optional
+    Fix('A15', TYPES, "ApprovalTicket required → optional", (
+        Fields(optional=('approvalRequestId', 'assignedTo', 'priority')),
+    ), iface('ApprovalTicket')),
+
+    # A16. OperationRecord: operation/actor/timestamp → optional; FAILED/RECOVERED added to every
+    #      'SUCCESS' | 'FAILURE' | 'PENDING' union (bản shell replace cả file: OperationRecord.status + ActionLog.result)
+    Fix('A16a', TYPES, "OperationRecord → optional + FAILED/RECOVERED status", (
+        Fields(optional=('operation', 'actor', 'timestamp'), union=(('status', ("'FAILED'", "'RECOVERED'")),)),
+    ), iface('OperationRecord')),
+    Fix('A16b', TYPES, "ActionLog.result + FAILED/RECOVERED", (
+        Fields(union=(('result', ("'FAILED'", "'RECOVERED'")),)),
+    ), iface('ActionLog')),
+
+    # A17. BankTransaction.credit: boolean → boolean | number
+    Fix('A17', TYPES, "BankTransaction.credit → boolean | number", (
+        Sub(r'(credit\?:[^;]*?)boolean;', r'\1boolean | number;', 1),
+    ), iface('BankTransaction'), marker='boolean | number'),
+
+    # A18. DetailedPersonnel: position → unknown, add HRDepartment/HRPosition/HRAttendance
+    Fix('A18a', TYPES, "HR types added to types.ts", (Append(
+        '\n\nexport interface DetailedPersonnel { id: string; name?: string; fullName?: string; employeeCode?: string; email?: string; department?: string; position: unknown; role?: string; status?: string; baseSalary?: number; startDate?: string; kpiPoints?: number; tasksCompleted?: number; lastRating?: string; bankAccountNo?: string; allowanceLunch?: number; allowancePosition?: number; actualWorkDays?: number; bio?: string; [key: string]: unknown; }\n'
+        'export type HRDepartment = unknown;\n'
+        'export type HRPosition = unknown;\n'
+        'export interface HRAttendance { employeeId: string; employee_id?: string; date: string; status: string; hoursWorked?: number; total_hours?: number; checkIn?: number; source?: unknown; [key: string]: unknown; }\n'
+    ),), marker='DetailedPersonnel'),
+    Fix('A18b', TYPES, "DetailedPersonnel.position → unknown", (Fields(retype=(('position', 'unknown'),)),),
+        iface('DetailedPersonnel')),
+
+    # A19. IngestStatus: add EXTRACTING, MAPPING, PENDING_APPROVAL
+    Fix('A19', TYPES, "IngestStatus: EXTRACTING/MAPPING/PENDING_APPROVAL added", (
+        Replace("  QUEUED: 'QUEUED',\n} as const;",
+                "  QUEUED: 'QUEUED',\n  EXTRACTING: 'EXTRACTING',\n  MAPPING: 'MAPPING',\n  PENDING_APPROVAL: 'PENDING_APPROVAL',\n} as const;", -1),
+    ), marker='EXTRACTING', when='IngestStatus'),
+
+    # A20. WarehouseItem in WarehouseEntity: add releaseStock, category
+    Fix('A20', WARE, "WarehouseItem: releaseStock/category/getAllItems added", (
+        Replace('export interface WarehouseItem {\n  id: string;\n  name: string;\n  quantity: number;\n}',
+                'export interface WarehouseItem {\n  id: string;\n  name: string;\n  quantity: number;\n  category?: string;\n  releaseStock?: (qty: number, reason: string, by: string) => void;\n  getAllItems?: () => WarehouseItem[];\n  [key: string]: unknown;\n}', -1),
+    ), marker='releaseStock'),
+
+    # A21. ModuleConfig: allowedRoles? (may already exist)
+    Fix('A21', TYPES, "ModuleConfig.allowedRoles? added", (Append('  allowedRoles?: unknown[];\n'),),
+        iface('ModuleConfig'), marker='allowedRoles'),
+
+    # A22. TaxReport: add amount?
+    Fix('A22', TYPES, "TaxReport.amount? added", (
+        Replace('taxableIncome: number;\n  standardRate: number;', 'taxableIncome: number;\n  standardRate: number;\n  amount?: number;'),
+    ), marker='standardRate: number;\n  amount?: number;'),
+
+    # A23. BaseEvent.event_version → optional
+    # config.service error: BaseEvent requires event_version but service sets it differently
+    Fix('A23', TYPES, "BaseEvent.event_version → optional", (
+        Replace('  event_version: string;', '  event_version?: string;'),
+    )),
+]
+
+
+# ================================================================
+# B. SERVICE FILE REWRITES
+# ================================================================
+THREAT_CLEAN = '''// THReatDetectionService — NATT-OS security threat monitoring
+export const tHReatdetectionservice = {};
+
+export interface SecurityTHReat { id: string; type: string; severity: string; timestamp: number; }
+export interface SystemHealth { status: string; uptime: number; metrics: Record<string, number>; }
+
+export class THReatDetectionService {
+  static getHealth(): SystemHealth { return { status: 'HEALTHY', uptime: Date.now(), metrics: {} }; }
+  static subscribe(_handler: (t: SecurityTHReat) => void): () => void { return () => {}; }
+  static detect(_payload: unknown): SecurityTHReat | null { return null; }
+}
+
+export default THReatDetectionService;
+'''
+
+OMEGA_CLEAN = '''export const OmegaLockdown = {
+  activate: () => {},
+  enforce: async (): Promise<void> => {},
+};
+'''
+
+SELLER_CLEAN = '''// SellerEngine — Commission calculation
+export const sellerengine = {};
+
+export class SellerEngine {
+  static calculateCommission(params: {
+    saleAmount?: number; shellRevenue?: number; stoneRevenue?: number;
+    stoneType?: string; isReportedWithin24h?: boolean;
+    kpiPoints?: number; [key: string]: unknown;
+  }): { total: number; shell: number; stone: number; policyId: string; baseRate: number; kpiFactor: number; estimatedAmount: number; finalAmount: number; status: string } {
+    const shellRev = (params.shellRevenue ?? params.saleAmount) || 0;
+    const stoneRev = params.stoneRevenue || 0;
+    const rate = 0.02;
+    const shell = Math.round(shellRev * rate);
+    const stone = Math.round(stoneRev * rate);
+    const total = shell + stone;
+    return { total, shell, stone, policyId: 'DEFAULT', baseRate: rate, kpiFactor: 1, estimatedAmount: total, finalAmount: total, status: 'CALCULATED' };
+  }
+  static check24hRule(timestamp: number): boolean {
+    return (Date.now() - timestamp) <= 86400000;
+  }
+}
+
+export default { sellerengine: {}, SellerEngine };
+'''
+
+RBAC_DECORATOR = 'function RequirePermission(_p: string) { return (_t: any, _k: string): void => {}; }'
+
+
+def cast_team_performance(c):
+    """D1: TeamPerformance[] → any[], only where a TeamPerformance> generic is not already cast nearby"""
+    at = c.find('TeamPerformance>')
+    if at < 0 or 'as any' in c[at:at + 500]: return c
+    return c.replace(': TeamPerformance[]', ': any[]')
+
+
+def fix_commission_parens(c):
+    """B11: calculateCommission({ … }; → calculateCommission({ … })"""
+    # The broken pattern: `      };` or `    };` after calculateCommission block
+    lines = c.split('\n')
+    for i in range(len(lines)):
+        stripped = lines[i].rstrip()
+        if stripped in ('      };', '    };'):
+            # Look back for calculateCommission
+            ctx = '\n'.join(lines[max(0, i - 10):i])
+            if 'calculateCommission' in ctx and 'setSimulatedComm' not in lines[i + 1] if i + 1 < len(lines) else True:
+                # Check more carefully: the line after should be a statement
+                next_l = lines[i + 1].strip() if i + 1 < len(lines) else ''
+                if next_l and not next_l.startswith(')') and not next_l.startswith(']') and not next_l.startswith(','):
+                    lines[i] = stripped.rstrip(';') + ')'
+    return '\n'.join(lines)
+
+
+def fix_rbac_decorator(c):
+    """B12a: replace RequirePermission with a no-op decorator, drop orphaned body lines"""
+    start = c.find('function RequirePermission(')
+    # brace-counting, as written for the broken file (backticks may be unbalanced)
+    depth = 0; end = start
+    for i in range(start, len(c)):
+        if c[i] == '{': depth += 1
+        elif c[i] == '}':
+            depth -= 1
+            if depth == 0: end = i + 1; break
+    # Remove trailing remnants (backtick, paren, semicolon on same/next line)
+    trailing_end = end
+    while trailing_end < len(c) and c[trailing_end] in ('`', ')', ';', '\r'):
+        trailing_end += 1
+    # Remove orphaned body lines (look for lines between end and next non-orphan)
+    orphan_patterns = ['// Logic check', 'return originalMethod', 'return descriptor;', '        };', '    };']
+    clean_lines = []
+    skip_orphan = True
+    for line in c[trailing_end:].split('\n'):
+        if skip_orphan:
+            stripped = line.strip()
+            if any(p in line for p in orphan_patterns):
+                continue
+            if stripped in ('}', '};', '') and not any(kw in line for kw in ['class', 'export', 'function']):
+                continue
+            skip_orphan = False
+        clean_lines.append(line)
+    return c[:start] + RBAC_DECORATOR + '\n' + '\n'.join(clean_lines)
+
+
+B = [
+    # B1. threatdetectionservice.ts — rewrite with single default export
+    Fix('B1', 'src/services/threatdetectionservice.ts', "threatdetectionservice.ts rewritten — single default export",
+        (Rewrite(THREAT_CLEAN),), when='export default { tHReatdetectionservice }'),
+    # B2. omegalockdown.ts — add enforce() as proper method
+    Fix('B2', 'src/core/audit/omegalockdown.ts', "omegalockdown.ts — enforce() added",
+        (Rewrite(OMEGA_CLEAN),), marker='enforce'),
+    # B3. smart-link.ts — createEnvelope + send Promise<any>
+    Fix('B3', 'src/services/smart-link.ts', "SmartLinkClient: createEnvelope + send Promise<any>", (
+        Replace('static send(_event: string, _data?: unknown): void {}',
+                'static async send(_event: unknown, _data?: unknown): Promise<any> { return undefined; }\n  static createEnvelope(target: string, method: string, payload?: unknown): unknown { return { target, method, payload: payload ?? {}, timestamp: Date.now() }; }', -1),
+    ), marker='createEnvelope'),
+    # B4. documentai.ts — add documentAI namespace as static property of Utilities
+    Fix('B4', 'src/services/documentai.ts', "Utilities.documentAI namespace added", (
+        Replace('class Utilities {', "class Utilities {\n  static documentAI = {\n    getConfig: (): any => ({ threshold: 0.7, model: 'default' }),\n    updateConfig: (_config: any): void => {},\n  };"),
+    ), klass('Utilities'), marker='documentAI'),
+    # B5. einvoiceservice.ts — methods + named export EInvoiceEngine
+    Fix('B5a', 'src/services/einvoiceservice.ts', "EInvoiceService: 3 methods added", (
+        Replace('class EInvoiceService {', "class EInvoiceService {\n  static generateXML(_inv: Record<string, unknown>): string { return '<HDon/>'; }\n  static async signInvoice(id: string): Promise<string> { return 'SIG-' + id; }\n  static async transmitToTaxAuthority(_inv: Record<string, unknown>): Promise<{ success: boolean; code: string }> { return { success: true, code: 'TCT-' + Date.now() }; }"),
+    ), klass('EInvoiceService'), marker='generateXML', strict=True),
+    Fix('B5b', 'src/services/einvoiceservice.ts', "EInvoiceEngine named export added",
+        (Append('\nexport { EInvoiceService as EInvoiceEngine };\n'),), marker='EInvoiceEngine'),
+    # B6. paymentservice.ts — createPayment
+    Fix('B6', 'src/services/paymentservice.ts', "PaymentEngine.createPayment added", (
+        Replace('class PaymentEngine {', "class PaymentEngine {\n  static async createPayment(req: Record<string, unknown>): Promise<{ success: boolean; transactionId: string; amount: number }> { return { success: true, transactionId: 'PAY-' + Date.now(), amount: Number(req.amount) || 0 }; }"),
+    ), klass('PaymentEngine'), marker='createPayment'),
+    # B7. xmlcanonicalizer.ts — canonicalize
+    Fix('B7', 'src/utils/xmlcanonicalizer.ts', "XmlCanonicalizer.canonicalize added", (
+        Replace('class XmlCanonicalizer {', "class XmlCanonicalizer {\n  static canonicalize(xml: string): string { return xml.replace(/\\s+/g, ' ').trim(); }"),
+    ), klass('XmlCanonicalizer'), marker='canonicalize'),
+    # B8. admin/auditservice.ts — logAction 5 params
+    Fix('B8', 'src/admin/auditservice.ts', "AuditProvider.logAction → 5 params", (
+        Replace('static logAction(_actor: string, _action: string, _meta?: unknown): void {}',
+                'static logAction(_actor: string, _action: string, _meta?: unknown, _context?: string, _id?: string): void {}', -1),
+    ), marker='_context'),
+    # B9. event-bridge.ts — fix broken import (keep existing EventBridge, comment out bad re-export)
+    Fix('B9', 'src/services/event-bridge.ts', "event-bridge.ts bad import commented out", (
+        Replace("export { EventBridgeProvider as EventBridge } from '@/cells/event-cell/event-bridge.service';",
+                "// export { EventBridgeProvider as EventBridge } from '@/cells/event-cell/event-bridge.service'; // path not found", -1),
+    ), marker="// export { EventBridgeProvider as EventBridge }"),
+    # B10. sellerengine.ts — rewrite with CommissionInfo shape
+    Fix('B10', 'src/services/sellerengine.ts', "sellerengine.ts rewritten with CommissionInfo shape",
+        (Rewrite(SELLER_CLEAN),), marker=('shell', 'shellRevenue')),
+    # B11. seller-terminal.tsx — fix missing ) in calculateCommission calls
+    Fix('B11', 'src/components/seller-terminal.tsx', "seller-terminal.tsx: missing ) fixed",
+        (Custom(fix_commission_parens),), when='calculateCommission'),
+    # B12. hr-service.ts — fix decorator + template literals (if backtick was eaten)
+    Fix('B12a', 'src/services/hr-service.ts', "hr-service.ts decorator fixed",
+        (Custom(fix_rbac_decorator),), marker=RBAC_DECORATOR, when='function RequirePermission('),
+    Fix('B12b', 'src/services/hr-service.ts', "hr-service.ts template literals → string concat", (
+        Replace("id: `att-${i}`", "id: 'att-' + i", -1),
+        Replace("date: `2026-01-0${i+1}`", "date: '2026-01-0' + (i+1)", -1),
+        Replace("hash: `0x${Math.random().toString(16).slice(2, 40)}`", "hash: '0x' + Math.random().toString(16).slice(2, 40)", -1),
+        Replace('employee_id:', 'employeeId:', -1),
+    )),
+    # B13. sales-cell stubs
+    Fix('B13a', 'src/cells/business/sales-cell/salesterminal.tsx', "salesterminal.tsx stub created", (Create(
+        "import React from 'react';\nconst SaleTerminal = (_props: any) => React.createElement('div', {}, 'SaleTerminal');\nexport default SaleTerminal;\n"),)),
+    Fix('B13b', 'src/cells/business/sales-cell/sales.service.ts', "sales.service.ts stub created", (Create(
+        'export class SalesProvider {\n  static getInstance() { return new SalesProvider(); }\n  createSale(_cmd: unknown): unknown { return {}; }\n  getSales(): unknown[] { return []; }\n}\n'),)),
+]
+
+
+# ================================================================
+# C. IMPORT PATH FIXES
+# ================================================================
+C = [
+    Fix('C1', 'src/core/core/processing/ai/aicore-processor.ts', "aicore-processor types → @/types",
+        (Replace('"../../../types"', '"@/types"'),)),
+    Fix('C2', 'src/core/core/processing/ai/ingestion/index.ts', "ingestion index path",
+        (Replace("'./ingestion-service'", "'../../../../ingestion/ingestion-service'"),)),
+    Fix('C3', 'src/services/analytics/analytics-service.ts', "analytics-service eventbridge",
+        (Replace("'../../eventbridge'", "'../../event-bridge'"),)),
+    Fix('C4', 'src/services/compliance/certification-service.ts', "cert-service notificationservice",
+        (Replace("'@/notificationservice'", "'../notificationservice'"),)),
+    # C5. ingestion-service.ts: fix IngestionService to export Ingestion alias
+    Fix('C5', 'src/core/core/ingestion/ingestion-service.ts', "IngestionService: Ingestion alias exported",
+        (Append('\nexport { IngestionService as Ingestion };\n'),),
+        marker='export { IngestionService as Ingestion }', when='export class IngestionService'),
+]
+
+
+# ================================================================
+# D. LOGIC / TYPE FIXES
+# ================================================================
+D = [
+    # D1. analytics-api.ts: period_date string → Date.now(), TeamPerformance → any
+    Fix('D1', 'src/services/analytics/analytics-api.ts', "analytics-api: period_date → Date.now(), TeamPerformance → any[]", (
+        Replace("const now = new Date().toISOString().split('T')[0];", "const now = Date.now();", -1),
+        Custom(cast_team_performance),
+    )),
+    # D2. smart-link-mapping-engine.ts: transactionDate + destination cast
+    Fix('D2', 'src/services/mapping/smart-link-mapping-engine.ts', "smart-link-mapping-engine: transactionDate + casts", (
+        Replace('transactionDate: new Date()', 'transactionDate: Date.now()', -1),
+        Replace('journalId,', 'journalId: (journalId as any),', -1),
+        # destination: { system... } → cast to any
+        Sub(r'destination: (\{ system:)', r'destination: (\1'),
+        Sub(r"(destination: \()(\{ system: 'ACCOUNTING'[^}]+\})(?! as any\))", r'\1\2 as any)'),
+    )),
+    # D3. smart-link-engine.ts: credit comparison + entries + destination
+    Fix('D3', 'src/core/core/smart-link-engine.ts', "smart-link-engine: credit/entries/destination fixes", (
+        Replace('tx.credit && tx.credit > 0', '(tx as any).credit > 0 || !!(tx as any).credit', -1),
+        Replace('entries: lines,', 'entries: (lines as any),', -1),
+        # destination object → cast
+        Sub(r"destination: \{ system: 'ACCOUNTING'[^}]+\},", cast_destination),
+    )),
+    # D4. runtime.ts: changedAt
+    Fix('D4', 'src/core/runtime.ts', "runtime.ts changedAt → Date.now()",
+        (Replace('changedAt: new Date()', 'changedAt: Date.now()', -1),)),
+    # D5. data-sync-engine.tsx: resolution → any
+    Fix('D5', 'src/core/core/ingestion/data-sync-engine.tsx', "data-sync-engine: resolution → any",
+        (Replace('const resolution = await ConflictEngine', 'const resolution: any = await ConflictEngine', -1),)),
+    # D6. recovery-engine.ts: FAILED → FAILURE, RECOVERED → SUCCESS cast
+    Fix('D6', 'src/services/recovery-engine.ts', "recovery-engine: FAILED/RECOVERED → cast", (
+        Replace("= 'FAILED'", "= 'FAILURE' as any", -1),
+        Replace("= 'RECOVERED'", "= 'SUCCESS' as any", -1),
+    ), when="'FAILED'"),
+    # D7. sales-tax-module.tsx: EInvoiceItem → any, EInvoiceEngine import: named → default
+    Fix('D7', 'src/components/sales-tax-module.tsx', "sales-tax-module: EInvoice types → any, import fixed", (
+        Replace(': EInvoiceItem[]', ': any[]', -1),
+        Replace(': EInvoice;', ': any;', -1),
+        Replace('import { EInvoiceEngine }', 'import EInvoiceEngine', -1),
+    ), after=('B5',)),
+    # D8. certification-service.ts: issueDate → issuedAt
+    Fix('D8', 'src/services/compliance/certification-service.ts', "certification-service: issueDate → issuedAt",
+        (Replace('issueDate:', 'issuedAt:', -1),), marker='issuedAt:', when='issueDate:', after=('A13',)),
+    # D9. module-registry.ts — if ModuleConfig doesn't have allowedRoles, cast each module config entry
+    Fix('D9', 'src/services/module-registry.ts', "module-registry entries cast to any", (
+        Sub(r'(\[ViewType\.\w+\]: \{.*?\}),', cast_entry, flags=re.DOTALL),
+    ), marker='as any', when='allowedRoles'),
+    # D10. admin-config-hub.tsx: context computed property cast + handleWeightChange
+    Fix('D10', 'src/components/admin-config-hub.tsx', "admin-config-hub: context/key cast fixes", (
+        Replace('[context]:', '[context as string]:', -1),
+        Replace('key as any', 'key as string', -1),
+    )),
+    # D11. app.tsx: DataPoint3D value string → number: cast dp to any for the spread
+    Fix('D11', 'src/components/app.tsx', "app.tsx DataPoint3D spread cast to any",
+        (Replace('<DataPoint3D key={i} {...dp} />', '<DataPoint3D key={i} {...dp as any} />', -1),),
+        marker='value: Number', when='DataPoint3D key={i} {...dp}'),
+    # D12. fiscal-workbench-service.ts: ShardingService import
+    Fix('D12', 'src/services/fiscal/fiscal-workbench-service.ts', "fiscal-workbench: ShardingService import added",
+        (Prepend("import { ShardingService } from '@/services/sharding-service';\n"),),
+        marker='import { ShardingService }', when='ShardingService'),
+    # D13. quantum-engine.ts: add id + activeDomains defaults
+    Fix('D13', 'src/services/quantum-engine.ts', "quantum-engine: id + activeDomains defaults added", (
+        Sub(r'(private state: QuantumState = \{)(?!\s*id:)', r"\1\n    id: 'QS-' + Date.now(),"),
+        Sub(r'(private consciousness: ConsciousnessField = \{)(?![^}]*activeDomains)', r"\1\n    activeDomains: [],"),
+    ), after=('A2', 'A3')),
+    # D14. warehouse.service.ts: insuranceStatus cast
+    Fix('D14', 'src/cells/infrastructure/warehouse-cell/application/warehouse.service.ts', "warehouse.service: insuranceStatus cast",
+        (Sub(r"insuranceStatus: '(\w+)'(?! as any)", r"insuranceStatus: '\1' as any"),)),
+]
+
+
+SECTIONS = [
+    ('A', 'TYPES.TS', A),
+    ('B', 'SERVICE FILE REWRITES', B),
+    ('C', 'IMPORT PATH FIXES', C),
+    ('D', 'LOGIC / TYPE FIXES', D),
+]
+FIXES = A + B + C + D
+check_deps(FIXES)
+STEPS = ('A', 'B', 'C', 'D', 'C6', 'E')      # what --only / --skip / --section can name besides fix ids
+
+
+def select(sections=(), only=(), skip=()):
+    """→ ([(key, title, fixes)] to run, set of steps to run: 'C6' / 'E' when selected).
+    sections: section letters (empty = all); only: fix ids / steps (empty = all); skip: fix ids / steps / sections.
+    ValueError on a token that names nothing."""
+    for t in (*sections, *only, *skip):
+        if t not in STEPS and not any(id_matches(f.id, t) for f in FIXES):
+            raise ValueError(f"unknown section / fix id: {t}")
+    bad = [t for t in sections if t not in STEPS or t == 'C6']
+    if bad: raise ValueError(f"not a section: {', '.join(bad)}")
+    in_section = lambda key: (not sections or key in sections) and key not in skip
+    def wanted(f):
+        return (not only or any(id_matches(f.id, t) for t in only)) and not any(id_matches(f.id, t) for t in skip)
+    out = [(key, title, [f for f in fixes if wanted(f)] if in_section(key) else []) for key, title, fixes in SECTIONS]
+    steps = {s for s in ('C6', 'E') if (s in only or not only or s == 'E') and s not in skip
+             and in_section('C' if s == 'C6' else s)}
+    return out, steps
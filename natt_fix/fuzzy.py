@@ -0,0 +1,109 @@
+"""
+Fuzzy anchor — anchor của Replace không còn trong file (đổi indent, thêm '?', đổi tên tham số …) → tìm vùng gần nhất
+- Index: n-gram ký tự (N = 3) của từng dòng đã chuẩn hoá khoảng trắng → danh sách dòng; dựng 1 lần / file, chỉ khi
+  có anchor hụt đầu tiên (memo theo path, dựng lại khi nội dung đổi)
+- nearest(): đếm n-gram chung qua index → vài cửa sổ (số dòng = số dòng anchor) nhiều điểm nhất → chấm lại bằng
+  difflib chỉ trên các cửa sổ đó (không chạy difflib trên mọi dòng của types.ts)
+- Candidate: dòng 1-based, score 0..1, vùng [start, stop) trong text (cả dòng, giữ indent khi anchor không có indent)
+- best(): ứng viên đủ chắc để áp thẳng (score ≥ threshold, hơn ứng viên thứ 2 ít nhất MARGIN) → --fuzzy-apply
+- rewrite(): Replace kiểu chèn (new = old + phần thêm) giữ nguyên vùng tìm được, chỉ chèn phần thêm, theo indent của vùng
+"""
+import re
+from collections import Counter, namedtuple
+from difflib import SequenceMatcher
+
+N = 3
+CLOSEST = 'closest: '    # describe() prefix: a result carrying it reports a drifted anchor (never cached)
+TOP = 3             # candidates reported
+RESCORE = 20        # windows rescored with difflib
+MIN_SCORE = 0.6     # below: not worth reporting
+APPLY = 0.9         # default --fuzzy-apply threshold
+MARGIN = 0.05       # best must beat the runner-up by this much to be applied
+
+Candidate = namedtuple('Candidate', 'line end score start stop text indent')  # line / end: 1-based, inclusive
+
+_WS = re.compile(r'\s+')
+
+
+def _norm(s): return _WS.sub(' ', s).strip()
+
+
+def _ind(line): return line[:len(line) - len(line.lstrip())]
+
+
+def _grams(s): return {s[i:i + N] for i in range(len(s) - N + 1)} if len(s) >= N else {s} if s else set()
+
+
+class Index:
+    """Character n-grams of every line of text → line numbers (0-based)"""
+
+    def __init__(self, text):
+        self.text = text
+        self.starts = [0] + [m.end() for m in re.finditer('\n', text)]
+        self.lines = text.split('\n')
+        post = {}
+        for i, line in enumerate(self.lines):
+            for g in _grams(_norm(line)): post.setdefault(g, []).append(i)
+        self.post = post
+
+    def nearest(self, anchor, top=TOP, min_score=MIN_SCORE):
+        """Closest regions to anchor, best first → [Candidate]"""
+        want = [_norm(l) for l in anchor.strip('\n').split('\n')]
+        k = len(want)
+        hits = Counter()
+        for j, w in enumerate(want):        # window starting at line i scores the grams of its j-th line
+            for g in _grams(w):
+                for i in self.post.get(g, ()):
+                    if i >= j: hits[i - j] += 1
+        target = ' '.join(want)
+        out = []
+        for i, _ in hits.most_common(RESCORE):
+            region = self.lines[i:i + k]
+            score = SequenceMatcher(None, target, ' '.join(map(_norm, region)), autojunk=False).ratio()
+            if score < min_score: continue
+            start, indent = self.starts[i], _ind(region[0])
+            if not anchor[:1].isspace(): start += len(indent)
+            stop = self.starts[i] + len('\n'.join(region))
+            out.append(Candidate(i + 1, i + len(region), round(score, 3), start, stop, self.text[start:stop], indent))
+        out.sort(key=lambda c: (-c.score, c.line))
+        return out[:top]
+
+
+_memo = {}      # key (path, scope) -> Index of its last text
+
+
+def index(key, text):
+    """Index of text, reused while the text under key is unchanged"""
+    ix = _memo.get(key)
+    if ix is None or ix.text is not text and ix.text != text:
+        ix = _memo[key] = Index(text)
+    return ix
+
+
+def nearest(key, text, anchor, top=TOP):
+    return index(key, text).nearest(anchor, top)
+
+
+def best(cands, threshold=APPLY):
+    """The candidate safe to apply at, or None"""
+    if not cands or cands[0].score < threshold: return None
+    if len(cands) > 1 and cands[0].score - cands[1].score < MARGIN: return None
+    return cands[0]
+
+
+def rewrite(old, new, cand):
+    """Text for cand's region standing in for Replace(old, new). new = old + insertion (or insertion + old):
+    the region is kept as it is and only the insertion goes in; lines are shifted by the region's extra indent"""
+    ol, rl = old.split('\n'), cand.text.split('\n')
+    a, r = (_ind(ol[1]), _ind(rl[1])) if len(ol) > 1 and len(rl) > 1 else (_ind(ol[0]), cand.indent)
+    shift = (lambda s: s.replace('\n', '\n' + r[len(a):])) if r.startswith(a) and r != a else (lambda s: s)
+    if new.startswith(old): return cand.text + shift(new[len(old):])
+    if new.endswith(old): return shift(new[:len(new) - len(old)]) + cand.text
+    return shift(new)
+
+
+def describe(cands, line0=0):
+    """'closest: L12 (0.93), L40 (0.71)' — line0: lines before text in the file (scoped fixes)"""
+    if not cands: return "no similar region"
+    return CLOSEST + ', '.join(f"L{c.line + line0}{'' if c.end == c.line else f'-{c.end + line0}'} ({c.score:.2f})"
+                          for c in cands)
@@ -0,0 +1,235 @@
+"""
+Interface offset index — quét types.ts 1 lần, tra cứu O(1)
+- scan(): 1 pass, bỏ qua string / comment / template literal / regex literal
+- InterfaceIndex: name -> Span(start, body_start, end), dời offset sau mỗi edit nằm trong body;
+  edit chạm header / vùng giữa các interface → stale, BufferStore.index() quét lại
+- find_block_end(): đếm ngoặc { } đúng cú pháp TS (thay vòng while từng ký tự)
+- extract_interface() / find_interface_end(): API cũ của script 10, chạy trên index
+- find_class(): span của `class X { … }` cho fix có scope class
+"""
+import re
+
+_TOKEN = re.compile(r"""
+    (?P<lc>//[^\n]*)
+  | (?P<bc>/\*.*?(?:\*/|\Z))
+  | (?P<sq>'(?:[^'\\\n]|\\.)*'?)
+  | (?P<dq>"(?:[^"\\\n]|\\.)*"?)
+  | (?P<bt>`)
+  | (?P<lb>\{)
+  | (?P<rb>\})
+  | (?P<kw>(?:\bexport\s+(?:default\s+)?)?(?:\bdeclare\s+)?\binterface\s+(?P<name>[A-Za-z_$][\w$]*))
+  | (?P<sl>/)
+""", re.X | re.S)
+_TEMPLATE = re.compile(r'\\.|`|\$\{', re.S)
+_REGEX_LIT = re.compile(r'/(?:[^/\\\n\[]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+_HEADER = re.compile(r'[<>{};]')
+_REGEX_PREV = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KW = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'yield', 'await')
+
+
+def _regex_allowed(c, pos):
+    """Heuristic: does '/' at pos start a regex literal (vs division)?"""
+    i = pos - 1
+    while i >= 0 and c[i] in ' \t\r\n': i -= 1
+    if i < 0 or c[i] in _REGEX_PREV: return True
+    return c[max(0, i - 5):i + 1].endswith(_REGEX_KW)
+
+
+def _tokens(c, pos=0):
+    """Yield ('{'|'}'|'iface', pos, match) for structural tokens only"""
+    n = len(c)
+    stack = []      # template nesting: depth at which each ${ … } was opened
+    depth = 0
+    in_tpl = False
+    while pos < n:
+        if in_tpl:
+            m = _TEMPLATE.search(c, pos)
+            if not m: return
+            pos = m.end()
+            if m.group() == '`': in_tpl = False
+            elif m.group() == '${': stack.append(depth); in_tpl = False
+            continue
+        m = _TOKEN.search(c, pos)
+        if not m: return
+        kind = m.lastgroup if m.lastgroup != 'name' else 'kw'
+        pos = m.end()
+        if kind == 'bt': in_tpl = True
+        elif kind == 'lb':
+            depth += 1; yield '{', m.start(), m
+        elif kind == 'rb':
+            if stack and stack[-1] == depth: stack.pop(); in_tpl = True; continue
+            depth -= 1; yield '}', m.start(), m
+        elif kind == 'kw': yield 'iface', m.start(), m
+        elif kind == 'sl' and _regex_allowed(c, m.start()):
+            r = _REGEX_LIT.match(c, m.start())
+            if r: pos = r.end()
+
+
+def find_block_end(c, open_pos):
+    """Index just past the '}' matching the '{' at open_pos (len(c) if unbalanced)"""
+    depth = 0
+    for kind, p, _ in _tokens(c, open_pos):
+        if kind == '{': depth += 1
+        elif kind == '}':
+            depth -= 1
+            if depth == 0: return p + 1
+    return len(c)
+
+
+def extract_interface(c, name, index=None):
+    """Interface body including braces, or None (pass a live index to skip the scan)"""
+    sp = (index or InterfaceIndex(c)).get(name)
+    return c[sp.body_start:sp.end] if sp else None
+
+
+def find_interface_end(c, start, ret_start=False):
+    """Original script-10 helper: first '{' after start, or the index past its '}'"""
+    i = c.find('{', start)
+    if ret_start: return i
+    return find_block_end(c, i) if i != -1 else len(c)
+
+
+def find_class(c, name):
+    """(start, body_start, end) of the first `class name` in c, or None"""
+    m = re.search(r'\bclass\s+' + re.escape(name) + r'\b', c)
+    if not m: return None
+    b = c.find('{', m.end())
+    if b == -1: return None
+    return m.start(), b, find_block_end(c, b)
+
+
+def _body_start(c, pos):
+    """First '{' after an interface header, skipping generics like <T extends {…}>"""
+    angle = 0
+    for m in _HEADER.finditer(c, pos):
+        ch = m.group()
+        if ch == '<': angle += 1
+        elif ch == '>':
+            if c[m.start() - 1] != '=': angle -= 1
+        elif angle <= 0: return m.start() if ch == '{' else -1
+    return -1
+
+
+class Span:
+    __slots__ = ('name', 'start', 'body_start', 'close')
+
+    def __init__(self, name, start, body_start, close):
+        self.name, self.start, self.body_start, self.close = name, start, body_start, close
+
+    @property
+    def end(self): return self.close + 1
+
+    def __iter__(self): return iter((self.start, self.body_start, self.end))
+
+    def __repr__(self): return f"Span({self.name!r}, {self.start}, {self.body_start}, {self.end})"
+
+
+def scan(c, loose=None):
+    """One pass over c → list of Span for every interface / export interface
+    (loose: list that gets the offset of every `interface` keyword that opened no span)"""
+    spans, open_ = [], []
+    depth, pending = 0, None
+    for kind, p, m in _tokens(c):
+        if kind == 'iface':
+            if pending and loose is not None: loose.append(pending[1])
+            b = _body_start(c, m.end())
+            pending = (m.group('name'), p, b) if b != -1 else None
+            if b == -1 and loose is not None: loose.append(p)
+        elif kind == '{':
+            if pending and p == pending[2]:
+                open_.append((depth, pending)); pending = None
+            depth += 1
+        else:
+            depth -= 1
+            if open_ and open_[-1][0] == depth:
+                _, (name, start, body) = open_.pop()
+                spans.append(Span(name, start, body, p))
+    if pending and loose is not None: loose.append(pending[1])
+    spans.sort(key=lambda s: s.start)
+    return spans
+
+
+_VOLATILE = ('{', '}', '`', '/', '\\', 'interface')
+
+
+def _volatile(t):
+    return any(v in t for v in _VOLATILE) or t.count("'") % 2 or t.count('"') % 2
+
+
+class InterfaceIndex:
+    """name → Span; first declaration wins (like content.find), all kept in .spans.
+    Only edits strictly inside a body are shifted; headers, the text between interfaces and
+    a body after a loose `interface` keyword (one that opened no span) go stale"""
+
+    def __init__(self, c):
+        self.loose = []
+        self.spans = scan(c, self.loose)
+        self._by_name = {}
+        for s in self.spans: self._by_name.setdefault(s.name, s)
+        self.stale = False
+
+    def get(self, name):
+        if self.stale: raise RuntimeError("InterfaceIndex is stale — rebuild from current content")
+        return self._by_name.get(name)
+
+    def names(self): return list(self._by_name)
+
+    def on_edit(self, a, old, new, c=None, off=0, size=None):
+        """Text old at [a, a+len(old)) became new (c = content after edit, or a window of it
+        starting at offset off in a text of length size): shift offsets, or go stale when the
+        edit may have changed structure (without c, any line break is taken as one)"""
+        if self.stale: return
+        nl = '\n' in old or '\n' in new
+        if _volatile(old) or _volatile(new) or (
+                _seams(c, a, a + len(new), nl, off, size, old) if c is not None else nl):
+            self.stale = True; return
+        b, delta = a + len(old), len(new) - len(old)
+        inside = [s for s in self.spans if s.body_start < a and b <= s.close]
+        if not inside or any(inside[-1].body_start < k < a for k in self.loose):
+            self.stale = True; return
+        for s in self.spans:
+            if s.start - 1 <= b and a <= s.body_start or a <= s.close < b:
+                self.stale = True; return
+        for s in self.spans:
+            if s.start >= b: s.start += delta
+            if s.body_start >= b: s.body_start += delta
+            if s.close >= b: s.close += delta
+        self.loose = [k + delta if k >= b else k for k in self.loose]
+
+
+def _seams(c, a, e, nl=False, off=0, size=None, old=''):
+    """Could the edited region [a, e) of c have changed lexing or an interface header?
+    (comment opener formed or split at a seam, line break that ends a // comment or an
+    unterminated string, edit inside a header). c may be a window starting at off;
+    a line cut by the window counts as a seam. old: the text [a, e) replaced."""
+    a, e = a - off, e - off
+    for p in (a, e):
+        if p > 0 and c[p - 1:p + 1] in ('//', '/*', '*/'): return True
+    before, after = c[a - 1:a] if a > 0 else '', c[e:e + 1]
+    for pair in ((before + old[:1], old[-1:] + after) if old else (before + after,)):
+        if pair in ('//', '/*', '*/'): return True
+    if nl:
+        ls, le = c.rfind('\n', 0, a), c.find('\n', e)
+        if (ls == -1 and off > 0) or (le == -1 and size is not None and off + len(c) < size): return True
+        line = c[ls + 1:le % (len(c) + 1)]
+        if '/' in line or "'" in line or '"' in line: return True
+    k = c.rfind('interface', max(0, a - 512), e + 9)
+    return k != -1 and '{' not in c[k:a] and '}' not in c[k:a]
+
+
+def diff_region(old, new):
+    """(a, old_mid, new_mid): smallest single region where old and new differ"""
+    n = min(len(old), len(new))
+    lo, hi = 0, n
+    while lo < hi:              # binary search, comparing only the unknown part
+        mid = (lo + hi + 1) // 2
+        if old[lo:mid] == new[lo:mid]: lo = mid
+        else: hi = mid - 1
+    a = lo
+    lo, hi = 0, n - a
+    lo_o, lo_n = len(old), len(new)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[lo_o - mid:lo_o - lo] == new[lo_n - mid:lo_n - lo]: lo = mid
+        else: hi = mid - 1
+    return a, old[a:len(old) - lo], new[a:len(new) - lo]
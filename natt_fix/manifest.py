@@ -0,0 +1,515 @@
+"""
+Fix manifest — mỗi fix là data, không phải khối code riêng
+- Fix: file đích, scope (interface / class / cả file), ops, marker idempotent
+- Op: Replace / Sub / MakeOptional / Append / Prepend / Rewrite / Create / Custom
+- run(): gom fix theo file, áp dụng từng nhóm trên 1 buffer, trả Result theo thứ tự manifest
+- run(jobs=N): nhóm theo file chạy song song trên process pool, kết quả gộp lại đúng thứ tự
+- run(cache=FileCache): file không đổi từ lần chạy thành công trước → skip cả nhóm, không đọc file
+- mỗi Result mang Stats: thời gian, byte đọc/ghi, số lần gọi regex, số lần build index (+ bộ nhớ khi --profile-memory)
+- Fields: optional / add / retype / union field theo token (natt_fix.fields); các fix Fields liền nhau trên 1 file
+  gom lại: 1 lần tra index, 1 lần join, 1 lần write
+- marker / when / anchor Replace của cả nhóm file: 1 lượt Aho-Corasick (natt_fix.markers), giữ đúng qua từng edit;
+  state(): applied / pending / anchor missing / … của 1 fix mà không áp dụng (--status)
+- anchor Replace hụt (không có cả old lẫn new) → "anchor not found; closest: L… (score)" qua n-gram index
+  (natt_fix.fuzzy); fuzzy_apply: áp thẳng tại vùng đủ chắc
+- Fix.after: id fix phải chạy trước (B5 = B5a + B5b); run() xếp nhóm file theo DAG đó, nhánh độc lập chạy song song,
+  fix FAIL → mọi fix phụ thuộc (bắc cầu) thành SKIP "blocked by …", blocked() dựng lại cây bị chặn cho report
+- patch / add_to_interface / make_optional / bulk_fields: helper 1 lần của script 10, dựng Fix rồi apply
+"""
+import os, re, time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+
+from natt_fix import fields, fuzzy, memprof
+from natt_fix.buffers import EditConflict
+from natt_fix.ifaceindex import Span, find_class, diff_region
+from natt_fix.markers import Markers
+
+Result = namedtuple('Result', 'fix status msg stats', defaults=(None,))   # status: 'ok' | 'skip' | 'fail'
+Stats = namedtuple('Stats', 'start dur read written regex scans pid peak retained high',  # start: perf_counter s
+                   defaults=(0, 0, 0))                                                    # memory: memprof.end()
+
+_regex = 0      # regex invocations by ops in this process
+
+
+def _rx(fn, *a, **kw):
+    global _regex; _regex += 1
+    return fn(*a, **kw)
+
+
+# ── ops: apply(text) -> text, trả nguyên text nếu không đổi ─────
+@dataclass(frozen=True)
+class Replace:
+    old: str
+    new: str
+    count: int = 1          # -1 = every occurrence (str.replace default)
+
+    def apply(self, t): return t.replace(self.old, self.new, self.count)
+
+
+@dataclass(frozen=True)
+class Sub:
+    pattern: str
+    repl: object            # str template or callable(match)
+    count: int = 0
+    flags: int = 0
+
+    def apply(self, t): return _rx(re.sub, self.pattern, self.repl, t, count=self.count, flags=self.flags)
+
+
+@dataclass(frozen=True)
+class MakeOptional:
+    """First `field_pattern` match: ':' → '?:' (make_optional)"""
+    field_pattern: str
+
+    def apply(self, t):
+        if _rx(re.search, self.field_pattern.replace(':', r'\?:'), t): return t
+        return _rx(re.sub, self.field_pattern, lambda m: m.group(0).replace(':', '?:', 1), t, count=1)
+
+
+@dataclass(frozen=True)
+class Append:
+    """Whole file: add at EOF. Interface / class: add before the closing brace."""
+    text: str
+
+    def apply(self, t, scoped=False):
+        if scoped: return t.rstrip()[:-1] + '\n' + self.text + '}'
+        return t + self.text
+
+
+@dataclass(frozen=True)
+class Prepend:
+    text: str
+
+    def apply(self, t): return self.text + t
+
+
+@dataclass(frozen=True)
+class Rewrite:
+    text: str
+
+    def apply(self, t): return self.text
+
+
+@dataclass(frozen=True)
+class Create:
+    """Write text only if the file does not exist yet"""
+    text: str
+
+    def apply(self, t): return self.text if t is None else t
+
+
+@dataclass(frozen=True)
+class Custom:
+    fn: object              # module-level callable(text) -> text
+
+    def apply(self, t): return self.fn(t)
+
+
+@dataclass(frozen=True)
+class Fields:
+    """Interface scope only, applied on the member tokens (not by regex over the file)"""
+    optional: tuple = ()    # field names → name?:
+    add: tuple = ()         # declarations ('x?: number'), skipped when the field exists
+    retype: tuple = ()      # ((field, type), …)
+    union: tuple = ()       # ((field, (member, …)), …) → members appended to the field's union when absent
+
+
+# ── fix ───────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Fix:
+    id: str
+    path: str
+    label: str
+    ops: tuple
+    scope: tuple = None     # None | ('interface', name) | ('class', name)
+    marker: object = None   # str / tuple(str): all present in scope → already applied
+    when: object = None     # str / tuple(str): all must be present in scope, else skip
+    strict: bool = False    # file / scope / anchor missing → FAIL (patch(), prerequisites of after=) instead of SKIP
+    after: tuple = ()       # ids (or id prefixes: B5 = B5a, B5b) that must run first; FAIL there → skip this
+
+    @property
+    def msg(self): return f"{self.id}: {self.label}" if self.label else self.id
+
+
+def _has(t, s):
+    if s is None: return False
+    return all(x in t for x in ((s,) if isinstance(s, str) else s))
+
+
+def _strs(s): return () if s is None else (s,) if isinstance(s, str) else tuple(s)
+
+
+def patterns(fix):
+    """Literal strings fix looks for: marker, when, Replace anchors"""
+    return _strs(fix.marker) + _strs(fix.when) + tuple(op.old for op in fix.ops if isinstance(op, Replace))
+
+
+def scope_span(store, fix):
+    """(start, end) of fix.scope in the current buffer, or None"""
+    kind, name = fix.scope
+    if kind == 'interface':
+        sp = store.index(fix.path).get(name)
+        return (sp.start, sp.end) if sp else None
+    cs = find_class(store.read(fix.path), name)
+    return (cs[0], cs[2]) if cs else None
+
+
+def apply_fix(store, fix, hits=None, fuzzy_apply=None):
+    """Apply one fix to its buffer in store → Result with Stats; hits: Markers of the file (run_group);
+    fuzzy_apply: score threshold to apply a drifted Replace anchor at its closest region (natt_fix.fuzzy)"""
+    r0, w0, s0, x0 = store.bytes_read, store.bytes_written, store.scans, _regex
+    m = memprof.begin()
+    t0 = time.perf_counter()
+    r = _apply(store, fix, hits, fuzzy_apply)
+    return r._replace(stats=Stats(t0, time.perf_counter() - t0, store.bytes_read - r0, store.bytes_written - w0,
+                                  _regex - x0, store.scans - s0, os.getpid(), *memprof.end(m)))
+
+
+def state(store, fix, hits=None):
+    """→ (state, scope text, scope start) without applying anything. state: 'create' | 'exists' | 'no file' |
+    'no scope' | 'not applicable' (when) | 'applied' (marker) | 'anchor missing' (no Replace anchor left) |
+    'pending' (marker not there yet) | 'unmarked' (no marker: only running the ops tells).
+    hits answers whole-file presence: exact for unscoped fixes, a cheap 'absent' for scoped ones."""
+    if any(isinstance(op, Create) for op in fix.ops):
+        return ('exists' if store.exists(fix.path) else 'create'), None, 0
+    if not store.exists(fix.path): return 'no file', None, 0
+    a = 0
+    if fix.scope:
+        span = scope_span(store, fix)
+        if span is None: return 'no scope', None, 0
+        a, b = span
+        t = store.slice(fix.path, a, b)
+    else:
+        t = store.read(fix.path)
+    if hits is None: has = lambda s: _has(t, s)
+    else:
+        text = lambda: store.read(fix.path)
+        has = lambda s: (s is not None and all(hits.has(x, text) for x in _strs(s))
+                         and (not fix.scope or _has(t, s)))
+    if fix.when is not None and not has(fix.when): return 'not applicable', t, a
+    if has(fix.marker): return 'applied', t, a
+    if (hits is not None and fix.ops and all(isinstance(op, Replace) for op in fix.ops)
+            and not any(has(op.old) for op in fix.ops)):
+        return 'anchor missing', t, a
+    return ('pending' if fix.marker is not None else 'unmarked'), t, a
+
+
+def drifted(fix, t):
+    """First Replace op whose anchor is missing from t when no Replace left its text there (the anchor drifted,
+    the fix was not applied), else None"""
+    ops = [op for op in fix.ops if isinstance(op, Replace)]
+    if any(op.new in t for op in ops): return None
+    return next((op for op in ops if op.old not in t), None)
+
+
+def nearby(store, fix, t, a, op):
+    """Regions of t closest to op's anchor (natt_fix.fuzzy) → (candidates, lines of the file before t)"""
+    return fuzzy.nearest((fix.path, fix.scope), t, op.old), store.read(fix.path).count('\n', 0, a) if a else 0
+
+
+def _fuzzy(fix, t, threshold):
+    """--fuzzy-apply: run the ops with every drifted anchor replaced at its confident match → (new, [Candidate], there);
+    there: matches already holding what the op would put in (a previous fuzzy run), left as they are"""
+    new, used, there = t, [], 0
+    for op in fix.ops:
+        if isinstance(op, Replace) and op.old not in new:
+            c = fuzzy.best(fuzzy.nearest((fix.path, fix.scope), new, op.old), threshold)
+            if c is None: return t, [], 0
+            repl = fuzzy.rewrite(op.old, op.new, c)
+            if new.startswith(repl, c.start): there += 1; continue
+            new = new[:c.start] + repl + new[c.stop:]
+            used.append(c)
+        else:
+            new = op.apply(new, True) if isinstance(op, Append) and fix.scope else op.apply(new)
+    return new, used, there
+
+
+def closest(store, fix):
+    """--status: 'closest: …' for a fix whose Replace anchor drifted, else None"""
+    _, t, a = state(store, fix)
+    op = drifted(fix, t) if t is not None else None
+    return fuzzy.describe(*nearby(store, fix, t, a, op)) if op is not None else None
+
+
+def _apply(store, fix, hits=None, fuzzy_apply=None):
+    st, t, a = state(store, fix, hits)
+    if st == 'exists': return Result(fix.id, 'skip', f"{fix.msg}: {fix.path} exists")
+    if st == 'create':
+        for op in fix.ops: store.write(fix.path, op.apply(None))
+        return Result(fix.id, 'ok', fix.msg)
+    miss = 'fail' if fix.strict else 'skip'
+    if st == 'no file': return Result(fix.id, miss, f"{fix.msg}: {fix.path} not found")
+    if st == 'no scope': return Result(fix.id, miss, f"{fix.msg}: {fix.scope[0]} {fix.scope[1]} not found")
+    if st in ('not applicable', 'applied'): return Result(fix.id, 'skip', f"{fix.msg}: already applied")
+    new, msg = t, fix.msg
+    if st != 'anchor missing':
+        for op in fix.ops:
+            new = op.apply(new, True) if isinstance(op, Append) and fix.scope else op.apply(new)
+    if new == t:
+        op, near = drifted(fix, t), ''
+        if op is not None and fuzzy_apply is not None:
+            new, used, there = _fuzzy(fix, t, fuzzy_apply)
+            if new == t and there: return Result(fix.id, 'skip', f"{fix.msg}: already applied (fuzzy anchor)")
+            line0 = store.read(fix.path).count('\n', 0, a) if a else 0
+            msg += f" (fuzzy anchor: {', '.join(f'L{c.line + line0} {c.score:.2f}' for c in used)})"
+        if new == t:
+            if op is not None:
+                cands, line0 = nearby(store, fix, t, a, op)
+                if cands or fix.strict or fix.marker is not None: near = '; ' + fuzzy.describe(cands, line0)
+            if fix.strict: return Result(fix.id, 'fail', f"{fix.msg}: anchor not found in {fix.path}{near}")
+            if fix.marker is not None or near:
+                return Result(fix.id, 'skip', f"{fix.msg}: anchor not found in {fix.path}{near}")
+            return Result(fix.id, 'skip', f"{fix.msg}: already applied")
+    if fix.scope:     # only the changed part of the scope becomes an edit: the file is not copied
+        i, old, mid = diff_region(t, new)
+        store.replace(fix.path, a + i, a + i + len(old), mid)
+    else:
+        store.write(fix.path, new)
+    return Result(fix.id, 'ok', msg)
+
+
+def markers(store, group):
+    """Markers over every literal the group's fixes look for, observing the file's edits; None if none / no file"""
+    pats = [p for f in group for p in patterns(f)]
+    path = group[0].path
+    if not pats or not store.exists(path): return None
+    m = Markers(pats, store.read(path))
+    store.observe(path, m)
+    return m
+
+
+def id_matches(fid, ref):
+    """A4 names A4a … A4f; A1 does not name A10"""
+    return fid == ref or (fid.startswith(ref) and fid[len(ref)].isalpha())
+
+
+def check_deps(fixes):
+    """ValueError unless every Fix.after names an existing fix that comes earlier in the manifest"""
+    seen = []
+    for f in fixes:
+        for ref in f.after:
+            if not any(id_matches(g.id, ref) for g in fixes):
+                raise ValueError(f"{f.id}: after {ref!r} names no fix")
+            if not any(id_matches(g.id, ref) for g in seen):
+                raise ValueError(f"{f.id}: after {ref!r}, which comes later in the manifest")
+        seen.append(f)
+
+
+def _blocked_by(fix, bad):
+    """First id in bad (failed or blocked fix ids) that fix depends on, else None"""
+    return next((b for ref in fix.after for b in bad if id_matches(b, ref)), None)
+
+
+def _blocked(fix, by):
+    return Result(fix.id, 'skip', f"{fix.msg}: blocked by {by}")
+
+
+def is_blocked(r):
+    """r was not applied because a fix it depends on failed"""
+    return r.status == 'skip' and ': blocked by ' in r.msg
+
+
+def blocked(fixes, results):
+    """[(failed Fix, [(depth, Fix)])]: every FAIL with the subtree of fixes it blocked, depth-first"""
+    by_id = {f.id: (f, r) for f, r in zip(fixes, results)}
+    def below(fid, depth, seen):
+        for f, r in by_id.values():
+            if f.id not in seen and any(id_matches(fid, ref) for ref in f.after) and r.msg.endswith(f"blocked by {fid}"):
+                seen.add(f.id)
+                yield depth, f
+                yield from below(f.id, depth + 1, seen)
+    return [(f, list(below(f.id, 1, set()))) for f, r in zip(fixes, results) if r.status == 'fail']
+
+
+def group_by_file(fixes):
+    """path -> [index into fixes, …] in manifest order; dict keeps first-seen file order"""
+    groups = {}
+    for i, f in enumerate(fixes): groups.setdefault(f.path, []).append(i)
+    return groups
+
+
+def _is_fields(fix):
+    return (fix.scope is not None and fix.scope[0] == 'interface' and fix.marker is None and fix.when is None
+            and all(isinstance(op, Fields) for op in fix.ops))
+
+
+def apply_fields(store, fixes):
+    """Consecutive Fields fixes on one file: one index, one splice of non-overlapping edits → [Result] with Stats
+    (time split evenly, I/O and memory on the first)"""
+    r0, w0, s0 = store.bytes_read, store.bytes_written, store.scans
+    mem = memprof.begin()
+    t0 = time.perf_counter()
+    path, out, todo = fixes[0].path, [], {}
+    if not store.exists(path):
+        out = [Result(f.id, 'fail' if f.strict else 'skip', f"{f.msg}: {path} not found") for f in fixes]
+    else:
+        idx = store.index(path)
+        for f in fixes:
+            sp = idx.get(f.scope[1])
+            if sp is None:
+                out.append(Result(f.id, 'fail' if f.strict else 'skip', f"{f.msg}: interface {f.scope[1]} not found"))
+                continue
+            t, local = store.slice(path, sp.start, sp.end), Span(sp.name, 0, sp.body_start - sp.start, sp.close - sp.start)
+            es, missing = [], []
+            for op in f.ops:
+                e, _, m = fields.edits(t, local, op.optional, op.add, op.retype, op.union)
+                es += [(a + sp.start, b + sp.start, x) for a, b, x in e]; missing += m
+            for a, b, x in es:
+                prev = todo.get((a, b))
+                if prev is None or prev == x: todo[(a, b)] = x
+                elif a == b: todo[(a, b)] = prev + x     # several fixes adding to one interface, manifest order
+                else: raise EditConflict(f"{path}: {f.id} rewrites offsets {a}-{b} to {x!r}, "
+                                         f"an earlier fix in the batch to {prev!r}")
+            if es: out.append(Result(f.id, 'ok', f.msg))
+            elif missing:
+                why = f"{', '.join(missing)} not in {f.scope[1]}"
+                out.append(Result(f.id, 'fail' if f.strict else 'skip', f"{f.msg}: {why}"))
+            else: out.append(Result(f.id, 'skip', f"{f.msg}: already applied"))
+        if todo: store.splice(path, [(a, b, x) for (a, b), x in todo.items()])
+    dur = (time.perf_counter() - t0) / len(fixes)
+    io = (store.bytes_read - r0, store.bytes_written - w0, store.scans - s0)
+    mem = memprof.end(mem)
+    return [r._replace(stats=Stats(t0 + i * dur, dur, *(io[:2] if i == 0 else (0, 0)), 0,
+                                   io[2] if i == 0 else 0, os.getpid(), *(mem if i == 0 else (0, 0, 0))))
+            for i, r in enumerate(out)]
+
+
+def run_group(store, group, fuzzy_apply=None):
+    """One buffer, every fix for that file in order → [Result]; runs of Fields fixes go as one batch.
+    Markers / anchors of the whole group are found in one pass (natt_fix.markers), then kept current per edit;
+    that read and pass are charged to the group's first Result.
+    A fix after one that failed (or was blocked) in this group is skipped as blocked."""
+    out, bad, i = [], [], 0
+    r0, s0, t0 = store.bytes_read, store.scans, time.perf_counter()
+    hits = markers(store, group)
+    # the file read + pattern pass serve the whole group: charged to its first fix, like apply_fields' I/O
+    pre = (t0, time.perf_counter() - t0, store.bytes_read - r0, store.scans - s0)
+    try:
+        while i < len(group):
+            by = _blocked_by(group[i], bad)
+            if by is not None:
+                out.append(_blocked(group[i], by)); bad.append(group[i].id); i += 1; continue
+            j = i
+            while (j < len(group) and _is_fields(group[j])
+                   and not any(id_matches(f.id, ref) for ref in group[j].after for f in group[i:j])): j += 1
+            rs = apply_fields(store, group[i:j]) if j > i else [apply_fix(store, group[i], hits, fuzzy_apply)]
+            bad += [r.fix for r in rs if r.status == 'fail']
+            out += rs; i = max(j, i + 1)
+    finally:
+        if hits is not None: store.unobserve(group[0].path, hits)
+    if out and out[0].stats is not None:
+        st = out[0].stats
+        out[0] = out[0]._replace(stats=st._replace(start=pre[0], dur=st.dur + pre[1], read=st.read + pre[2],
+                                                   scans=st.scans + pre[3]))
+    return out
+
+
+def status(store, fixes):
+    """--status: [(Fix, state)] on the current buffers, nothing applied (see state())"""
+    out = []
+    for path, idxs in group_by_file(fixes).items():
+        group = [fixes[i] for i in idxs]
+        hits = markers(store, group)
+        out += [(f, state(store, f, hits)[0]) for f in group]
+        if hits is not None: store.unobserve(path, hits)
+    return out
+
+
+def _run_isolated(group, track=False, fuzzy_apply=None):
+    """Pool worker: own BufferStore, read from disk → (results, {path: new content}, {path: EditMap})"""
+    from natt_fix.buffers import BufferStore
+    store = BufferStore(track)
+    results = run_group(store, group, fuzzy_apply)
+    return results, {p: store.read(p) for p in store.dirty}, store.edits
+
+
+def run(store, fixes, jobs=1, cache=None, fuzzy_apply=None):
+    """Apply every fix grouped by file → [Result] in manifest order.
+    jobs > 1: groups run on a process pool; their edits land in store as dirty buffers,
+    so flushing stays in the caller. Files already buffered in store run in-process.
+    cache: groups whose file is unchanged since the last successful run skip without reading it
+    (not with fuzzy_apply: a cached file would never get its fuzzy edit).
+    fuzzy_apply: see apply_fix (drifted anchors are always reported with their closest regions).
+    Fix.after: a group starts once the groups it depends on are done (dependencies outside fixes are
+    ignored); fixes depending on a FAIL are skipped as blocked without being applied."""
+    out = [None] * len(fixes)
+    groups = []
+    for path, idxs in group_by_file(fixes).items():
+        if cache is not None and fuzzy_apply is None and cache.fresh(store, path, [fixes[i] for i in idxs]):
+            for i in idxs: out[i] = Result(fixes[i].id, 'skip', f"{fixes[i].msg}: unchanged (cached)")
+        else:
+            groups.append(idxs)
+    # group g waits for group h when a fix of g is after a fix of h
+    owner = {i: g for g, idxs in enumerate(groups) for i in idxs}
+    waits = [{owner[j] for i in idxs for ref in fixes[i].after
+              for j, f in enumerate(fixes) if j in owner and id_matches(f.id, ref)} - {g}
+             for g, idxs in enumerate(groups)]
+    if jobs is not None and jobs <= 0: jobs = os.cpu_count() or 1
+    remote = {g for g, idxs in enumerate(groups)
+              if jobs != 1 and len(groups) > 1 and not store.loaded(fixes[idxs[0]].path)}
+    pending, done, running, bad = list(range(len(groups))), set(), {}, []
+
+    def finish(g, idxs, results):
+        for i, r in zip(idxs, results):
+            out[i] = r
+            if r.status == 'fail' or (r.status == 'skip' and _blocked_by(fixes[i], bad)): bad.append(r.fix)
+        done.add(g)
+
+    ex = ProcessPoolExecutor(max_workers=min(jobs, len(remote))) if remote else None
+    try:
+        while pending or running:
+            ready = [g for g in pending if waits[g] <= done]
+            if not ready:
+                if not running: raise ValueError("fix dependencies form a cycle across files: "
+                                                 + ', '.join(fixes[groups[g][0]].path for g in pending))
+                for fut in wait(running, return_when=FIRST_COMPLETED).done:
+                    g, idxs = running.pop(fut)
+                    results, dirty, edits = fut.result()
+                    for p, c in dirty.items(): store.write(p, c)
+                    store.edits.update(edits)
+                    finish(g, idxs, results)
+                continue
+            for g in ready:
+                pending.remove(g)
+                todo = []
+                for i in groups[g]:
+                    by = _blocked_by(fixes[i], bad)
+                    if by is None: todo.append(i)
+                    else: out[i] = _blocked(fixes[i], by); bad.append(fixes[i].id)
+                if not todo: done.add(g)
+                elif g in remote: running[ex.submit(_run_isolated, [fixes[i] for i in todo], store.track, fuzzy_apply)] = (g, todo)
+                else: finish(g, todo, run_group(store, [fixes[i] for i in todo], fuzzy_apply))
+    finally:
+        if ex is not None: ex.shutdown(cancel_futures=True)
+    return out
+
+
+# ── one-off helpers (cùng chữ ký script 10, thêm store) ─────
+def patch(store, path, old, new, label):
+    return apply_fix(store, Fix(label, path, '', (Replace(old, new),), marker=new.split('\n')[0].strip(), strict=True))
+
+
+def add_to_interface(store, path, iface_name, anchor_field, new_field, label):
+    """Insert new_field after anchor_field inside named interface"""
+    field_name = new_field.strip().split(':')[0].rstrip('?').strip()
+    return apply_fix(store, Fix(label, path, '', (Replace(anchor_field, anchor_field + '\n' + new_field),),
+                                ('interface', iface_name), marker=field_name, strict=True))
+
+
+def make_optional(store, path, iface_name, field_pattern, label):
+    """Make a required field optional in an interface"""
+    return apply_fix(store, Fix(label, path, '', (MakeOptional(field_pattern),), ('interface', iface_name)))
+
+
+def bulk_fields(store, path, spec, label):
+    """{interface: {'optional': [...], 'add': [...], 'retype': {field: type}, 'union': {field: [member, …]}}}
+    in one pass → [Result], one per interface"""
+    if not spec: return []
+    return apply_fields(store, [Fix(f"{label}.{name}", path, name, (Fields(tuple(ops.get('optional', ())),
+                                                                          tuple(ops.get('add', ())),
+                                                                          tuple(ops.get('retype', {}).items()),
+                                                                          tuple((f, tuple(m)) for f, m in
+                                                                                ops.get('union', {}).items())),),
+                                    ('interface', name)) for name, ops in spec.items()])
@@ -0,0 +1,86 @@
+"""
+Markers — marker / when / anchor của mọi fix trên 1 file, tìm trong 1 lượt (Aho-Corasick)
+- Automaton: trie + failure link gộp thành bảng chuyển → 1 vòng qua text, mọi pattern cùng lúc
+- Markers.has(p): p có trong file không, không quét lại file cho từng fix
+- on_edit(): chỉ quét lại cửa sổ quanh edit (cùng chữ ký InterfaceIndex.on_edit, BufferStore gọi)
+  pattern mới xuất hiện → present; pattern có trong cửa sổ cũ mà mất → kiểm lại bằng `in` khi được hỏi
+- ít pattern (< AC_MIN): `p in text` của C nhanh hơn vòng Python từng ký tự → không dựng automaton, dùng `in`
+  (đo trên types.ts 6 MB: AC ~0.45 s gần như cố định, `in` ~0.45 ms / pattern → hoà vốn ~1000)
+  fix set của script 10: nhiều nhất 23 pattern / file (types.ts) → chạy nhánh `in`; automaton dành cho manifest lớn
+"""
+from collections import deque
+
+AC_MIN = 1000
+
+
+class Automaton:
+    """Aho-Corasick over str patterns; delta[state] maps a char to the next state (failure links folded in)"""
+
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        goto, out = [{}], [()]
+        for k, p in enumerate(self.patterns):
+            n = 0
+            for ch in p:
+                nxt = goto[n].get(ch)
+                if nxt is None:
+                    nxt = goto[n][ch] = len(goto)
+                    goto.append({}); out.append(())
+                n = nxt
+            out[n] += (k,)
+        fail, delta = [0] * len(goto), [None] * len(goto)
+        delta[0] = dict(goto[0])
+        q = deque(goto[0].values())
+        while q:
+            r = q.popleft()
+            for ch, u in goto[r].items():
+                q.append(u)
+                if r: fail[u] = delta[fail[r]].get(ch, 0)
+                out[u] += out[fail[u]]
+            if r: delta[r] = {**delta[fail[r]], **goto[r]}
+        self.delta, self.out = delta, out
+        self.longest = max(map(len, self.patterns), default=0)
+
+    def found(self, text):
+        """Indices of every pattern occurring in text — one pass"""
+        delta, out, hit, n = self.delta, self.out, set(), 0
+        for ch in text:
+            n = delta[n].get(ch, 0)
+            if out[n]: hit.update(out[n])
+        return hit
+
+
+class Markers:
+    """Which patterns occur in one file's current content, kept up to date across edits"""
+
+    def __init__(self, patterns, text):
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        self.longest = max(map(len, self.patterns), default=0)
+        self.ac = Automaton(self.patterns) if len(self.patterns) >= AC_MIN else None
+        self.present = self.found(text)
+        self.unsure = set()     # may have been destroyed by an edit: verify on the next has()
+
+    def found(self, text):
+        """Patterns occurring in text: one automaton pass, or `in` per pattern below AC_MIN"""
+        if self.ac is None: return {p for p in self.patterns if p in text}
+        ps = self.patterns
+        return {ps[k] for k in self.ac.found(text)}
+
+    def has(self, p, text):
+        """p in the current content; text: () → current content, called only to settle an unsure p"""
+        if p in self.unsure:
+            self.unsure.discard(p)
+            if p in text(): self.present.add(p)
+            else: self.present.discard(p)
+        return p in self.present
+
+    def on_edit(self, a, old, new, c=None, off=0, size=None):
+        """Text old at [a, a+len(old)) became new; c = content after the edit, or a window of it at offset off"""
+        k = self.longest - 1
+        if c is None or a - off < k and off > 0 or a + len(new) - off + k > len(c) and off + len(c) < (size or 0):
+            self.unsure |= self.present; return       # not enough context: settle lazily
+        lo, hi = max(0, a - off - k), min(len(c), a + len(new) - off + k)
+        now = self.found(c[lo:hi])
+        self.present |= now
+        self.unsure -= now
+        self.unsure |= self.found(c[lo:a - off] + old + c[a + len(new) - off:hi]) - now
@@ -0,0 +1,57 @@
+"""
+Memory — --profile-memory: tracemalloc quanh từng fix label (A1 … D14) và từng bước (snapshot, flush, E)
+- begin() / end(): peak (cao nhất trong khối, so với lúc vào) + retained (còn giữ lúc ra) → Stats / Span
+  khối lồng nhau: reset_peak() của khối trong không làm mất peak của khối ngoài (gộp vào mọi khối đang mở)
+- high-water = bộ nhớ lúc vào + peak: so với --memory-budget, vượt → run FAIL (exit 1)
+- bảng theo label + gộp theo section: trace.print_memory(), in cạnh SLOWEST FIXES
+- chỉ đo allocation của Python trong tiến trình này: -j N bị ép về 1, tsc/tsserver (Node) không tính
+"""
+import re, tracemalloc
+
+_open = []      # [start, peak] of every begin() not yet ended, outermost first
+_max = 0        # highest traced size seen since start()
+
+
+def start():
+    global _max
+    _max = 0
+    tracemalloc.start()
+
+
+def _fold():
+    """Carry the peak since the last reset into every open block, before it is reset"""
+    global _max
+    cur, peak = tracemalloc.get_traced_memory()
+    for fr in _open: fr[1] = max(fr[1], peak)
+    _max = max(_max, peak)
+    return cur
+
+
+def begin():
+    """Open a measured block → frame, or None when tracemalloc is not tracing"""
+    if not tracemalloc.is_tracing(): return None
+    cur = _fold()
+    tracemalloc.reset_peak()
+    fr = [cur, cur]
+    _open.append(fr)
+    return fr
+
+
+def end(fr):
+    """Close fr → (peak, retained, high-water) in bytes; zeros when not measured"""
+    if fr is None or not tracemalloc.is_tracing(): return 0, 0, 0
+    cur = _fold()
+    _open[:] = [f for f in _open if f is not fr]     # by identity: equal frames are not the same block
+    return fr[1] - fr[0], cur - fr[0], fr[1]
+
+
+def peak():
+    """Highest traced size since start()"""
+    return max(_max, tracemalloc.get_traced_memory()[1]) if tracemalloc.is_tracing() else _max
+
+
+def parse_size(s):
+    """'512M' / '2G' / '800000' → bytes (argparse type)"""
+    m = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?)i?B?\s*', s, re.I)
+    if not m: raise ValueError(f"not a size: {s!r}")
+    return int(float(m.group(1)) * 1024 ** ' KMG'.index(m.group(2).upper() or ' '))
@@ -0,0 +1,103 @@
+"""
+Plan — --plan: áp mọi fix trong RAM, in unified diff, không ghi đĩa, không gọi tsc
+- EditMap: ghi lại vùng đổi của từng write() (offset gốc ↔ offset mới), gộp vùng chồng nhau
+- unified_diff(): hunk dựng thẳng từ vùng đã đổi (+ 3 dòng context), không difflib cả file
+"""
+
+CONTEXT = 3
+
+
+class EditMap:
+    """Changed regions of one file as [o0, o1, n0, n1]: orig[o0:o1] became new[n0:n1]"""
+
+    def __init__(self, regions=None):
+        self.regions = regions or []
+
+    def add(self, a, la, lb):
+        """Current text [a, a+la) replaced by lb chars"""
+        b, shift = a + la, lb - la
+        before, overl, after = [], [], []
+        for r in self.regions:
+            (before if r[3] < a else after if r[2] > b else overl).append(r)
+        d = sum((r[3] - r[2]) - (r[1] - r[0]) for r in before)
+        if overl:
+            first, last = overl[0], overl[-1]
+            n0, n1 = min(a, first[2]), max(b, last[3])
+            o0 = first[0] if first[2] <= a else a - d
+            o1 = last[1] if last[3] >= b else b - d - sum((r[3] - r[2]) - (r[1] - r[0]) for r in overl)
+        else:
+            n0, n1, o0, o1 = a, b, a - d, b - d
+        for r in after: r[2] += shift; r[3] += shift
+        self.regions = before + [[o0, o1, n0, n1 + shift]] + after
+
+
+def _line_start(c, p):
+    return c.rfind('\n', 0, p) + 1
+
+
+def _line_end(c, p):
+    i = c.find('\n', p)
+    return len(c) if i == -1 else i + 1
+
+
+def _emit(out, tag, line):
+    out.append(tag + line if line.endswith('\n') else tag + line + '\n\\ No newline at end of file\n')
+
+
+def _blocks(orig, new, edits):
+    """Changed regions widened to whole lines, merged, common lines trimmed →
+    [(old line index, old lines, new lines)] in order"""
+    spans = []
+    for o0, o1, n0, n1 in edits.regions:
+        ls, le = _line_start(orig, o0), _line_end(orig, o1)
+        ns, ne = n0 - (o0 - ls), n1 + (le - o1)
+        if spans and ls < spans[-1][1]: spans[-1][1], spans[-1][3] = le, ne
+        else: spans.append([ls, le, ns, ne])
+    out, line, pos = [], 0, 0
+    for ls, le, ns, ne in spans:
+        line += orig.count('\n', pos, ls); pos = ls
+        a, b = orig[ls:le].splitlines(True), new[ns:ne].splitlines(True)
+        i = 0
+        while i < len(a) and i < len(b) and a[i] == b[i]: i += 1
+        j = 0
+        while j < len(a) - i and j < len(b) - i and a[-1 - j] == b[-1 - j]: j += 1
+        if a[i:len(a) - j] or b[i:len(b) - j]:
+            out.append((line + i, a[i:len(a) - j], b[i:len(b) - j]))
+    return out
+
+
+def unified_diff(path, orig, new, edits):
+    """Unified diff text for path (orig None = new file); only the regions in edits are diffed"""
+    if orig is None:
+        lines = new.splitlines(True)
+        out = ['--- /dev/null\n', f'+++ b/{path}\n', f'@@ -0,0 +{_range(1, len(lines))} @@\n']
+        for l in lines: _emit(out, '+', l)
+        return ''.join(out)
+    blocks = _blocks(orig, new, edits)
+    if not blocks: return ''
+    olines = orig.splitlines(True)
+    hunks = []
+    for b in blocks:
+        if hunks and b[0] - (hunks[-1][-1][0] + len(hunks[-1][-1][1])) <= 2 * CONTEXT: hunks[-1].append(b)
+        else: hunks.append([b])
+    out = [f'--- a/{path}\n', f'+++ b/{path}\n']
+    delta = 0
+    for h in hunks:
+        start = max(0, h[0][0] - CONTEXT)
+        end = min(len(olines), h[-1][0] + len(h[-1][1]) + CONTEXT)
+        grow = sum(len(b) - len(a) for _, a, b in h)
+        out.append(f'@@ -{_range(start + 1, end - start)} +{_range(start + delta + 1, end - start + grow)} @@\n')
+        p = start
+        for ol, a, b in h:
+            for l in olines[p:ol]: _emit(out, ' ', l)
+            for l in a: _emit(out, '-', l)
+            for l in b: _emit(out, '+', l)
+            p = ol + len(a)
+        for l in olines[p:end]: _emit(out, ' ', l)
+        delta += grow
+    return ''.join(out)
+
+
+def _range(start, n):
+    if n == 0: return f'{start - 1},0'
+    return str(start) if n == 1 else f'{start},{n}'
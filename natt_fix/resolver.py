@@ -0,0 +1,190 @@
+"""
+Module resolver — resolve import như tsc (moduleResolution Bundler/Node) theo tsconfig.json
+- paths / baseUrl (@/* → src/*), relative, đuôi .ts/.tsx/.d.ts(/.js/.jsx khi allowJs), './x.js' → x.ts
+- thư mục: package.json types/main, rồi index.*
+- memo theo (thư mục importer, specifier); liệt kê thư mục 1 lần (scandir), đúng hoa/thường như Linux
+- virtual(): file mới còn trong buffer (B13 stub) cũng resolve được trước khi flush
+- python3 -m natt_fix.resolver: liệt kê mọi import không resolve trong cây, 1 lượt
+"""
+import json, os, re, sys
+
+TS_EXT = ('.ts', '.tsx', '.d.ts')
+JS_EXT = ('.js', '.jsx')
+_JS_TO_TS = {'.js': ('.ts', '.tsx', '.d.ts'), '.jsx': ('.tsx',), '.mjs': ('.mts', '.d.mts'), '.cjs': ('.cts', '.d.cts')}
+EXTERNAL = 'external'   # bare package specifier and no node_modules to check it against
+
+
+def load_tsconfig(path='tsconfig.json'):
+    """compilerOptions of path (JSONC: comments + trailing commas; relative `extends` followed)"""
+    try:
+        with open(path, encoding='utf-8') as f: text = f.read()
+    except FileNotFoundError:
+        return {}
+    text = re.sub(r'("(?:[^"\\]|\\.)*")|//[^\n]*|/\*.*?\*/', lambda m: m.group(1) or '', text, flags=re.S)
+    cfg = json.loads(re.sub(r',(\s*[}\]])', r'\1', text))
+    opts = {}
+    ext = cfg.get('extends')
+    if isinstance(ext, str) and ext.startswith('.'):
+        parent = os.path.normpath(os.path.join(os.path.dirname(path), ext))
+        opts = load_tsconfig(parent if parent.endswith('.json') else parent + '.json')
+        if 'baseUrl' in opts:       # baseUrl is relative to the config that sets it
+            opts['baseUrl'] = os.path.relpath(os.path.join(os.path.dirname(parent), opts['baseUrl']),
+                                              os.path.dirname(path) or '.')
+    opts.update(cfg.get('compilerOptions', {}))
+    return opts
+
+
+class Resolver:
+    def __init__(self, root='.', options=None):
+        self.root = root
+        opts = load_tsconfig(os.path.join(root, 'tsconfig.json')) if options is None else options
+        self.base_url = os.path.normpath(opts['baseUrl']) if 'baseUrl' in opts else None
+        # longest prefix first, like tsc's pattern matching
+        self.paths = sorted(((p.split('*')[0], p.endswith('*') and '*' in p, t) for p, t in opts.get('paths', {}).items()),
+                            key=lambda x: -len(x[0]))
+        self.exts = TS_EXT + (JS_EXT if opts.get('allowJs') else ())
+        self.node_modules = os.path.isdir(os.path.join(root, 'node_modules'))
+        self._memo = {}     # (importer dir, spec) -> path | None | EXTERNAL
+        self._dirs = {}     # rel dir -> {name: is_dir}
+        self._virtual = set()
+        self.hits = self.misses = 0
+
+    # ── filesystem, listed once per directory ─────────────────
+    def _list(self, d):
+        d = '' if d == '.' else d
+        ls = self._dirs.get(d)
+        if ls is None:
+            ls = {}
+            try:
+                with os.scandir(os.path.join(self.root, d)) as it:
+                    for e in it: ls[e.name] = e.is_dir()
+            except OSError:
+                pass
+            self._dirs[d] = ls
+        return ls
+
+    def _isfile(self, p):
+        if p in self._virtual: return True
+        d, name = os.path.split(p)
+        return self._list(d).get(name) is False
+
+    def _isdir(self, p):
+        d, name = os.path.split(p)
+        return bool(self._list(d).get(name))
+
+    def virtual(self, paths):
+        """Treat paths (relative to root) as existing files; clears the memo"""
+        self._virtual.update(os.path.normpath(p) for p in paths)
+        self._memo.clear()
+
+    # ── resolution ────────────────────────────────────────────
+    def resolve(self, importer, spec):
+        """Path (relative to root) that spec imported from importer resolves to,
+        None if it does not resolve, EXTERNAL for an unchecked package import"""
+        key = (os.path.dirname(importer), spec)
+        if key in self._memo:
+            self.hits += 1
+            return self._memo[key]
+        self.misses += 1
+        r = self._memo[key] = self._resolve(key[0], spec)
+        return r
+
+    def _resolve(self, d, spec):
+        if spec.startswith(('./', '../')) or spec in ('.', '..'):
+            return self._load(os.path.normpath(os.path.join(d, spec)))
+        if spec.startswith('/'): return self._load(os.path.relpath(spec, self.root))
+        for prefix, wild, targets in self.paths:
+            if (spec.startswith(prefix) if wild else spec == prefix):
+                rest = spec[len(prefix):] if wild else ''
+                for t in targets:
+                    r = self._load(os.path.normpath(os.path.join(self.base_url or '.', t.replace('*', rest, 1))))
+                    if r: return r
+                return None
+        if self.base_url is not None:
+            r = self._load(os.path.normpath(os.path.join(self.base_url, spec)))
+            if r: return r
+        return self._package(d, spec)
+
+    def _load(self, base):
+        """File, then file + extension, then directory (package.json / index)"""
+        if self._isfile(base): return base
+        stem, ext = os.path.splitext(base)
+        for e in _JS_TO_TS.get(ext, ()):
+            if self._isfile(stem + e): return stem + e
+        for e in self.exts:
+            if self._isfile(base + e): return base + e
+        if self._isdir(base):
+            pkg = os.path.join(base, 'package.json')
+            if self._isfile(pkg):
+                try:
+                    with open(os.path.join(self.root, pkg), encoding='utf-8') as f: meta = json.load(f)
+                except (OSError, ValueError):
+                    meta = {}
+                for field in ('types', 'typings', 'main'):
+                    if isinstance(meta.get(field), str):
+                        r = self._load_file(os.path.normpath(os.path.join(base, meta[field])))
+                        if r: return r
+            for e in self.exts:
+                if self._isfile(os.path.join(base, 'index' + e)): return os.path.join(base, 'index' + e)
+        return None
+
+    def _load_file(self, p):
+        if self._isfile(p): return p
+        stem, ext = os.path.splitext(p)
+        for e in _JS_TO_TS.get(ext, ()) + self.exts:
+            if self._isfile(stem + e): return stem + e
+        return None
+
+    def _package(self, d, spec):
+        """node_modules/<pkg>[/sub] or node_modules/@types/<pkg>, walking up from d"""
+        if not self.node_modules: return EXTERNAL
+        parts = spec.split('/')
+        name = '/'.join(parts[:2] if spec.startswith('@') else parts[:1])
+        sub = spec[len(name) + 1:]
+        types = '@types/' + name.lstrip('@').replace('/', '__')
+        while True:
+            for pkg in (name, types):
+                base = os.path.normpath(os.path.join(d, 'node_modules', pkg))
+                if self._isdir(base):
+                    return (self._load(os.path.join(base, sub)) if sub else self._load(base)) or base
+            if not d: return None
+            d = os.path.dirname(d)
+
+    def alias_for(self, path):
+        """Non-relative specifier for path through `paths` (src/x/y.ts → @/x/y), or None"""
+        stem = re.sub(r'(/index)?(\.d)?\.(tsx?|jsx?)$', '', path)
+        for prefix, wild, targets in self.paths:
+            if not wild: continue
+            for t in targets:
+                tp = os.path.normpath(os.path.join(self.base_url or '.', t.split('*')[0]))
+                tp = '' if tp == '.' else tp + '/'
+                if stem.startswith(tp): return prefix + stem[len(tp):]
+        return None
+
+
+def unresolved(index, resolver, scope=''):
+    """Every (importer, spec) under scope in a SymbolIndex that does not resolve — one pass, memoized"""
+    out = []
+    for path, info in index.files.items():
+        if not path.startswith(scope): continue
+        for spec, _, _ in info['imports']:
+            if resolver.resolve(path, spec) is None: out.append((path, spec))
+    return out
+
+
+def main(argv=None):
+    """python3 -m natt_fix.resolver [scope]: list unresolved imports, exit 1 if any"""
+    from natt_fix.symbols import SymbolIndex
+    scope = (argv if argv is not None else sys.argv[1:] or [''])[0]
+    index = SymbolIndex.load().refresh()
+    index.save()
+    r = index.resolver
+    bad = unresolved(index, r, scope)
+    for path, spec in bad: print(f"  {path}: '{spec}'")
+    print(f"\n  {len(bad)} unresolved import(s) in {sum(p.startswith(scope) for p in index.files)} file(s)"
+          f"  (resolver: {r.misses} lookups, {r.hits} memo hits)")
+    if bad: sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""
+Scan report — natt-os-scan-report.txt bằng Python (thay khối shell cat từng types.ts, quét lại cả cây mỗi lần)
+- 8 section như bản shell; mỗi section là generator, ghi thẳng xuống file (không giữ cả report trong RAM)
+- .natt-fix/scanreport.json: mỗi file mtime_ns + size + sha256 (stat khớp → không đọc lại),
+  mỗi section: input (path → sha256) + đoạn byte của nó trong report lần trước
+- section có input không đổi → chép nguyên đoạn byte từ report cũ; chỉ section đổi mới đọc file / render lại
+- 6 / 8 lấy lỗi từ .natt-fix/tsc-report.json (section E của script 10 ghi), không chạy tsc
+- --json: cùng dữ liệu dạng JSON (file + sha256 + size, cell manifest, lỗi tsc) → load_json() cho fixer đọc thẳng
+- python3 -m natt_fix.scanreport [--out F] [--json F.json] [--full]
+"""
+import argparse, hashlib, json, os, sys, time
+from collections import namedtuple
+
+from natt_fix import STATE_DIR, diagnostics
+from natt_fix.buffers import atomic_write
+from natt_fix.symbols import SKIP_DIRS
+
+REPORT = 'natt-os-scan-report.txt'
+JSON_REPORT = 'natt-os-scan-report.json'
+CACHE = os.path.join(STATE_DIR, 'scanreport.json')
+VERSION = 1
+SRC = 'src'
+TYPES = 'src/types.ts'
+WAREHOUSE = 'src/cells/infrastructure/warehouse-cell/'
+EVENT_BRIDGE = 'src/services/event-bridge.ts'
+CELLS = 'src/cells/'
+
+# inputs(tree) → paths the section shows; content: their bytes matter (not just the list); deps: other files read
+Section = namedtuple('Section', 'key title inputs content deps body data')
+
+
+def walk(root=SRC):
+    """Every file under root, depth first, names sorted (skips node_modules, dist, dot dirs)"""
+    try: entries = sorted(os.scandir(root), key=lambda e: e.name)
+    except OSError: return
+    for e in entries:
+        if e.is_dir(follow_symlinks=False):
+            if e.name not in SKIP_DIRS and not e.name.startswith('.'): yield from walk(e.path)
+        elif e.is_file():
+            yield e.path.replace(os.sep, '/')
+
+
+class Files:
+    """sha256 per file through the (mtime_ns, size) cache of the last run"""
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}    # path -> [mtime_ns, size, sha256]
+        self.seen = {}                  # entries looked at this run (saved: drops deleted files)
+        self.hashed = 0
+
+    def sha(self, path):
+        try: st = os.stat(path)
+        except FileNotFoundError: return None
+        e = self.seen.get(path) or self.entries.get(path)
+        if e and e[:2] == [st.st_mtime_ns, st.st_size]: sha = e[2]
+        else:
+            with open(path, 'rb') as f: sha = hashlib.sha256(f.read()).hexdigest()
+            self.hashed += 1
+        self.seen[path] = [st.st_mtime_ns, st.st_size, sha]
+        return sha
+
+
+def _text(path):
+    with open(path, encoding='utf-8', errors='replace') as f: return f.read()
+
+
+def _dump(paths, header=True):
+    """Full content per file, under '### path ###'"""
+    for p in paths:
+        if header: yield f"### {p} ###\n"
+        c = _text(p)
+        yield c if not c or c.endswith('\n') else c + '\n'
+
+
+def _listing(paths):
+    for p in paths: yield p + '\n'
+
+
+def _file_data(paths, files):
+    return {'files': [{'path': p, 'sha256': files.seen[p][2], 'size': files.seen[p][1]} for p in paths]}
+
+
+def _diags():
+    return diagnostics.load_report(diagnostics.REPORT)
+
+
+def _error_files(tree):
+    """Files with a tsc error, in report order (only ones still on disk)"""
+    return [p for p in dict.fromkeys(d.file for d in _diags() or ()) if p and os.path.isfile(p)]
+
+
+def _manifests(paths, files):
+    out = []
+    for p in paths:
+        try: m = json.loads(_text(p))
+        except ValueError as e: out.append({'path': p, 'error': str(e)}); continue
+        out.append({'path': p, **{k: m.get(k) for k in ('cell_id', 'version', 'wave', 'layer', 'status')}})
+    return {**_file_data(paths, files), 'cells': out}
+
+
+def _tsc_body(paths):
+    diags = _diags()
+    if diags is None:
+        yield f"(no {diagnostics.REPORT}: run script 10 section E first)\n"; return
+    yield f"total: {len(diags)}\n"
+    for code, ds in diagnostics.group_by(diags, 'code').items(): yield f"  {code:<8} {len(ds):>4}\n"
+    for d in diags: yield diagnostics.fmt(d) + '\n'
+
+
+def _tsc_data(paths, files):
+    diags = _diags()
+    if diags is None: return {'total': None, 'errors': []}
+    return {'total': len(diags), 'by_code': {c: len(ds) for c, ds in diagnostics.group_by(diags, 'code').items()},
+            'errors': [d._asdict() for d in diags]}
+
+
+SECTIONS = (
+    Section('types', 'ALL TYPES.TS FILES', lambda tree: [p for p in tree() if p.endswith('/types.ts')],
+            False, (), _listing, lambda paths, files: {'files': paths}),
+    Section('types_content', f'FULL CONTENT: {TYPES}', lambda tree: [TYPES] if os.path.isfile(TYPES) else [],
+            True, (), lambda paths: _dump(paths, header=False), _file_data),
+    Section('warehouse', 'WAREHOUSE ENTITY FILES',
+            lambda tree: [p for p in tree() if p.startswith(WAREHOUSE) and p.endswith('.ts')],
+            True, (), _dump, _file_data),
+    Section('event_bridge', 'EVENT-BRIDGE', lambda tree: [EVENT_BRIDGE] if os.path.isfile(EVENT_BRIDGE) else [],
+            True, (), lambda paths: _dump(paths, header=False), _file_data),
+    Section('audit', 'AUDIT SERVICE', lambda tree: [p for p in tree() if p.endswith('/auditservice.ts')],
+            True, (), _dump, _file_data),
+    Section('errors', 'ALL ERROR FILES (từ tsc)', _error_files, True, (diagnostics.REPORT,), _dump, _file_data),
+    Section('manifests', 'CELL MANIFEST LIST',
+            lambda tree: [p for p in tree() if p.startswith(CELLS) and p.endswith('/cell.manifest.json')],
+            True, (), _dump, _manifests),
+    Section('tsc', 'TSC ERROR COUNT', lambda tree: [], True, (diagnostics.REPORT,), _tsc_body, _tsc_data),
+)
+
+
+def _load(path):
+    try:
+        with open(path, encoding='utf-8') as f: data = json.load(f)
+    except (FileNotFoundError, ValueError): return {}
+    return data if data.get('version') == VERSION else {}
+
+
+def _stat(path):
+    try: st = os.stat(path)
+    except FileNotFoundError: return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def sections(files, old=None, prev=None):
+    """Yield (section, n, fingerprint, paths, chunks, cached) in order; chunks: the old report's bytes when the
+    section's inputs are unchanged (cached), else a generator of freshly rendered text"""
+    tree = []
+    def files_of():
+        if not tree: tree.extend(walk())
+        return tree
+    for n, s in enumerate(SECTIONS, 1):
+        paths = s.inputs(files_of)
+        fp = {p: files.sha(p) if s.content else '' for p in paths}
+        fp.update((p, files.sha(p)) for p in s.deps)
+        was = (old or {}).get(s.key)
+        if prev is not None and was and was['inputs'] == fp:
+            prev.seek(was['start'])
+            yield s, n, fp, paths, prev.read(was['end'] - was['start']), True
+        else:
+            yield s, n, fp, paths, (x.encode('utf-8') for x in _render(n, s, paths)), False
+
+
+def _render(n, s, paths):
+    yield f"--- {n}. {s.title} ---\n"
+    yield from s.body(paths)
+    yield "\n"
+
+
+def generate(out=REPORT, json_out=None, cache_path=CACHE, full=False):
+    """Write out (and json_out), re-rendering only the sections whose inputs changed → (regenerated keys, files hashed)"""
+    cache = {} if full else _load(cache_path)
+    files = Files(cache.get('files'))
+    reuse = cache.get('report') is not None and cache.get('report') == _stat(out)
+    prev = open(out, 'rb') if reuse else None
+    tmp = f"{out}.{os.getpid()}.tmp"
+    done, redone = {}, []
+    try:
+        with open(tmp, 'wb') as f:
+            pos = f.write(f"=== NATT-OS SCAN REPORT ===\nGenerated: {time.strftime('%a %b %d %H:%M:%S %z %Y')}\n\n"
+                          .encode('utf-8'))
+            for s, n, fp, paths, chunks, cached in sections(files, cache.get('sections'), prev):
+                start = pos
+                if cached: pos += f.write(chunks)
+                else:
+                    for c in chunks: pos += f.write(c)
+                    redone.append(s.key)
+                data = cache['sections'][s.key]['data'] if cached else s.data(paths, files)
+                done[s.key] = {'inputs': fp, 'start': start, 'end': pos, 'data': data}
+        os.replace(tmp, out)
+    finally:
+        if prev is not None: prev.close()
+        if os.path.exists(tmp): os.unlink(tmp)
+    if json_out:
+        atomic_write(json_out, json.dumps({
+            'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'sections': [{'key': s.key, 'title': s.title, **done[s.key]['data']} for s in SECTIONS],
+        }, ensure_ascii=False, indent=1))
+    atomic_write(cache_path, json.dumps({'version': VERSION, 'report': _stat(out), 'files': files.seen,
+                                         'sections': done}, ensure_ascii=False, separators=(',', ':')))
+    return redone, files.hashed
+
+
+def load_json(path=JSON_REPORT):
+    """{section key: section} of a --json report, or None"""
+    try:
+        with open(path, encoding='utf-8') as f: data = json.load(f)
+    except (FileNotFoundError, ValueError): return None
+    return {s['key']: s for s in data.get('sections', ())}
+
+
+def run(out=REPORT, json_out=None, full=False):
+    t0 = time.perf_counter()
+    redone, hashed = generate(out, json_out, full=full)
+    print(f"  {out}: {len(redone)}/{len(SECTIONS)} section(s) regenerated"
+          f" ({', '.join(redone) or 'none'}), {hashed} file(s) hashed, {time.perf_counter() - t0:.2f}s")
+    if json_out: print(f"  json: {json_out}")
+    return redone
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Write natt-os-scan-report.txt, regenerating only changed sections")
+    ap.add_argument('--out', default=REPORT)
+    ap.add_argument('--json', nargs='?', const=JSON_REPORT, metavar='OUT.json',
+                    help=f"also write the JSON variant (default {JSON_REPORT})")
+    ap.add_argument('--full', action='store_true', help="ignore the cache, render every section")
+    args = ap.parse_args(argv)
+    if not os.path.isdir(SRC):
+        print(f"❌ {SRC}/ not found — run from the goldmaster root"); sys.exit(1)
+    run(args.out, args.json, args.full)
+
+
+if __name__ == '__main__':
+    main()
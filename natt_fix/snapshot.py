@@ -0,0 +1,127 @@
+"""
+Snapshot — chụp đúng các file sắp ghi trước flush, khôi phục khi tsc tệ hơn (thay types.ts.backup / .bak2 / .bak3)
+- object: bytes gốc nén zlib, tên = sha256 → .natt-fix/snapshots/objects/ab/cdef… (nội dung trùng chỉ lưu 1 lần)
+- snapshot: <id>.json = {file: sha256 | null (file chưa tồn tại → restore = xoá)}
+- giữ KEEP snapshot gần nhất, object không còn snapshot nào trỏ tới bị xoá
+- tree_state(): hash (path, mtime_ns, size) của src/ + tsconfig.json → report tsc nào mô tả đúng cây hiện tại
+- python3 -m natt_fix.snapshot [list | restore [ID]]
+"""
+import hashlib, json, os, sys, time, zlib
+
+from natt_fix import STATE_DIR
+from natt_fix.buffers import atomic_write
+from natt_fix.symbols import SKIP_DIRS
+
+ROOT = os.path.join(STATE_DIR, 'snapshots')
+KEEP = 10
+LEVEL = 6       # zlib level: types.ts-sized files compress in ~1 ms
+TREE = ('src', 'tsconfig.json')     # what tsc reads: a report is only a baseline for this exact state of it
+
+
+class Snapshot:
+    def __init__(self, id, files, root=ROOT):
+        self.id, self.files, self.root = id, files, root    # files: path -> sha256 | None
+
+    def _object(self, sha):
+        return os.path.join(self.root, 'objects', sha[:2], sha[2:])
+
+    def restore(self):
+        """Put every file back as it was → restored paths"""
+        done = []
+        for path, sha in self.files.items():
+            if sha is None:
+                try: os.unlink(path)
+                except FileNotFoundError: continue
+            else:
+                with open(self._object(sha), 'rb') as f: data = zlib.decompress(f.read())
+                try:
+                    with open(path, 'rb') as f:
+                        if f.read() == data: continue
+                except FileNotFoundError: pass
+                atomic_write(path, data.decode('utf-8'))
+            done.append(path)
+        return done
+
+
+def tree_state(paths=TREE):
+    """Hash of (path, mtime_ns, size) of every file under paths: stat only, no read"""
+    h = hashlib.sha256()
+    def add(p):
+        try: st = os.stat(p)
+        except FileNotFoundError: return
+        h.update(f"{p}\0{st.st_mtime_ns}\0{st.st_size}\n".encode('utf-8', 'surrogateescape'))
+    for top in paths:
+        if not os.path.isdir(top): add(top); continue
+        for d, dirs, files in os.walk(top):
+            dirs[:] = sorted(x for x in dirs if x not in SKIP_DIRS and not x.startswith('.'))
+            for n in sorted(files): add(os.path.join(d, n))
+    return h.hexdigest()
+
+
+def take(paths, root=ROOT, keep=KEEP):
+    """Snapshot the on-disk content of paths (before they are overwritten) → Snapshot"""
+    files, objects = {}, os.path.join(root, 'objects')
+    for p in paths:
+        try:
+            with open(p, 'rb') as f: data = f.read()
+        except FileNotFoundError:
+            files[p] = None; continue
+        sha = hashlib.sha256(data).hexdigest()
+        obj = os.path.join(objects, sha[:2], sha[2:])
+        if not os.path.exists(obj):
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            tmp = f"{obj}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f: f.write(zlib.compress(data, LEVEL))
+            os.replace(tmp, obj)
+        files[p] = sha
+    t = time.time()
+    sid = time.strftime('%Y%m%d-%H%M%S', time.localtime(t)) + f'-{int(t * 1000) % 1000:03d}'
+    atomic_write(os.path.join(root, sid + '.json'), json.dumps({'files': files}, ensure_ascii=False, indent=1))
+    prune(root, keep)
+    return Snapshot(sid, files, root)
+
+
+def ids(root=ROOT):
+    """Snapshot ids, oldest first"""
+    try: return sorted(n[:-5] for n in os.listdir(root) if n.endswith('.json'))
+    except FileNotFoundError: return []
+
+
+def load(sid=None, root=ROOT):
+    """Snapshot sid (default: latest), or None"""
+    sid = sid or (ids(root) or [None])[-1]
+    if sid is None: return None
+    try:
+        with open(os.path.join(root, sid + '.json'), encoding='utf-8') as f: return Snapshot(sid, json.load(f)['files'], root)
+    except (FileNotFoundError, ValueError, KeyError): return None
+
+
+def prune(root=ROOT, keep=KEEP):
+    """Drop all but the newest keep snapshots and every object none of them uses"""
+    all_ids = ids(root)
+    for sid in all_ids[:-keep] if keep else all_ids:
+        os.unlink(os.path.join(root, sid + '.json'))
+    used = {sha for sid in ids(root) for sha in (load(sid, root) or Snapshot(sid, {})).files.values() if sha}
+    objects = os.path.join(root, 'objects')
+    for d in os.listdir(objects) if os.path.isdir(objects) else ():
+        for n in os.listdir(os.path.join(objects, d)):
+            if d + n not in used: os.unlink(os.path.join(objects, d, n))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    cmd = argv[0] if argv else 'list'
+    if cmd == 'list':
+        for sid in ids(): print(f"  {sid}  {len(load(sid).files)} file(s)")
+    elif cmd == 'restore':
+        snap = load(argv[1] if len(argv) > 1 else None)
+        if snap is None: print("❌ no such snapshot"); sys.exit(1)
+        done = snap.restore()
+        print(f"  restored {len(done)} file(s) from {snap.id}")
+        for p in done: print(f"    {p}")
+    else:
+        print("usage: python3 -m natt_fix.snapshot [list | restore [ID]]"); sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
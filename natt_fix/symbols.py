@@ -0,0 +1,230 @@
+"""
+Symbol index — export của mọi file TS/TSX trong cây, cache trên đĩa theo path + mtime
+- refresh(): os.scandir 1 lượt, chỉ parse lại file có stat đổi
+- exports_of(): tên export trực tiếp + export * from (đệ quy)
+- overlay(): phủ buffer đã sửa trong BufferStore lên index (sau A–D, trước khi tìm import hỏng)
+- importers(): file import trực tiếp 1 file cho trước (tsserver chỉ check file đổi + file import nó)
+- import_fixes(): import trỏ sai file (không resolve / file đích không export đủ tên)
+  → Fix viết lại specifier sang file thật sự export các tên đó (section C, chạy sau fix tay)
+"""
+import json, os, re
+
+from natt_fix import STATE_DIR
+from natt_fix.buffers import atomic_write
+from natt_fix.manifest import Fix, Sub
+from natt_fix.resolver import Resolver, EXTERNAL
+
+INDEX = os.path.join(STATE_DIR, 'symbols.json')
+VERSION = 2
+SOURCE_EXT = ('.ts', '.tsx')
+SKIP_DIRS = {'node_modules', 'dist', 'build', 'coverage'}
+STRIP_EXT = ('.d.ts', '.ts', '.tsx', '.js', '.jsx')
+
+# comments → spaces (offsets kept), strings left alone
+_COMMENT = re.compile(r'''//[^\n]*|/\*.*?\*/|('(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|`(?:[^`\\]|\\.)*`)''', re.S)
+_ID = r'[A-Za-z_$][\w$]*'
+_EXPORT_DECL = re.compile(r'\bexport\s+(?:declare\s+)?(default\s+)?(?:abstract\s+)?(?:async\s+)?'
+                          r'(?:class|interface|type|enum|const\s+enum|function\s*\*?|const|let|var|namespace|module)\s+(' + _ID + ')')
+_EXPORT_DEFAULT = re.compile(r'\bexport\s+default\b')
+_EXPORT_LIST = re.compile(r'\bexport\s+(?:type\s+)?\{([^}]*)\}(?:\s*from\s*([\'"])([^\'"\n]+)\2)?')
+_EXPORT_STAR = re.compile(r'\bexport\s+(?:type\s+)?\*\s*(?:as\s+(' + _ID + r')\s*)?from\s*([\'"])([^\'"\n]+)\2')
+_IMPORT = re.compile(r'\bimport\s+(?:type\s+)?(?:(' + _ID + r')\s*,?\s*)?(?:\*\s*as\s+(' + _ID + r')\s*)?'
+                     r'(?:\{([^}]*)\}\s*)?from\s*([\'"])([^\'"\n]+)\4')
+_IMPORT_BARE = re.compile(r'\bimport\s*([\'"])([^\'"\n]+)\1')
+
+
+def _strip_comments(c):
+    return _COMMENT.sub(lambda m: m.group(0) if m.group(1) else re.sub(r'[^\n]', ' ', m.group(0)), c)
+
+
+def _items(body):
+    """'a, b as c, type d, default as e' → [(source name, local/exported name)]"""
+    out = []
+    for item in body.split(','):
+        item = re.sub(r'^\s*type\s+', '', item).strip()
+        if not item: continue
+        src, _, alias = item.partition(' as ')
+        out.append((src.strip(), (alias or src).strip()))
+    return out
+
+
+def parse(c):
+    """→ {'exports': [names], 'stars': [specs], 'imports': [[spec, names | None, stmt]]}
+    names None = namespace import (any name goes); stmt = statement text up to the closing quote"""
+    s = _strip_comments(c)
+    exports, stars, imports = set(), [], []
+    for m in _EXPORT_DECL.finditer(s): exports.add('default' if m.group(1) else m.group(2))
+    for m in _EXPORT_DEFAULT.finditer(s): exports.add('default')
+    for m in _EXPORT_LIST.finditer(s):
+        items = _items(m.group(1))
+        exports.update(alias for _, alias in items)
+        if m.group(3): imports.append([m.group(3), [src for src, _ in items], c[m.start():m.end()]])
+    for m in _EXPORT_STAR.finditer(s):
+        if m.group(1): exports.add(m.group(1))
+        else: stars.append(m.group(3))
+        imports.append([m.group(3), None if m.group(1) else [], c[m.start():m.end()]])
+    for m in _IMPORT.finditer(s):
+        default, ns, body, spec = m.group(1), m.group(2), m.group(3), m.group(5)
+        if default == 'type' and not body: default = None
+        names = None if ns else ([src for src, _ in _items(body)] if body else []) + (['default'] if default else [])
+        imports.append([spec, names, c[m.start():m.end()]])
+    for m in _IMPORT_BARE.finditer(s): imports.append([m.group(2), [], c[m.start():m.end()]])
+    return {'exports': sorted(exports), 'stars': stars, 'imports': imports}
+
+
+def _walk(root):
+    """Yield (relative path, DirEntry) for every .ts/.tsx under root"""
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try: it = os.scandir(d)
+        except OSError: continue
+        with it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    if e.name not in SKIP_DIRS and not e.name.startswith('.'): stack.append(e.path)
+                elif e.name.endswith(SOURCE_EXT):
+                    yield os.path.relpath(e.path, root).replace(os.sep, '/'), e
+
+
+class SymbolIndex:
+    def __init__(self, files=None, path=INDEX):
+        self.path = path
+        self.files = files or {}    # rel path -> {mtime_ns, size, exports, stars, imports}
+        self.parsed = 0             # files re-parsed by the last refresh()
+        self._exports = {}
+        self.resolver = Resolver()
+
+    @classmethod
+    def load(cls, path=INDEX):
+        try:
+            with open(path, encoding='utf-8') as f: data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return cls(path=path)
+        return cls(data.get('files') if data.get('version') == VERSION else None, path)
+
+    def save(self):
+        atomic_write(self.path, json.dumps({'version': VERSION, 'files': self.files}, separators=(',', ':')))
+
+    def refresh(self, root='.'):
+        """Re-scan the tree; parse only files whose (mtime_ns, size) changed; drop deleted ones"""
+        seen, self.parsed, self._exports = {}, 0, {}
+        self.resolver = Resolver(root)
+        for rel, e in _walk(root):
+            st = e.stat()
+            old = self.files.get(rel)
+            if old and (old['mtime_ns'], old['size']) == (st.st_mtime_ns, st.st_size):
+                seen[rel] = old; continue
+            with open(e.path, encoding='utf-8', errors='replace') as f: info = parse(f.read())
+            info.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+            seen[rel] = info
+            self.parsed += 1
+        self.files = seen
+        return self
+
+    def overlay(self, store):
+        """Re-parse every dirty source buffer in store (not saved: next refresh() re-reads disk)"""
+        for p in store.dirty:
+            if p.endswith(SOURCE_EXT):
+                self.files[p] = dict(parse(store.read(p)), mtime_ns=None, size=None)
+        self.resolver.virtual(store.dirty)
+        self._exports = {}
+        return self
+
+    def resolve(self, importer, spec):
+        """Indexed source file spec resolves to from importer (tsconfig-aware, memoized), else None"""
+        r = self.resolver.resolve(importer, spec)
+        return r if r in self.files else None
+
+    def exports_of(self, path, _seen=None):
+        """Direct exports plus `export * from` chains"""
+        if path in self._exports: return self._exports[path]
+        seen = _seen or set()
+        if path in seen or path not in self.files: return set()
+        seen.add(path)
+        info = self.files[path]
+        out = set(info['exports'])
+        for spec in info['stars']:
+            target = self.resolve(path, spec)
+            if target: out |= self.exports_of(target, seen) - {'default'}
+        if _seen is None: self._exports[path] = out
+        return out
+
+    def importers(self, paths):
+        """Indexed files with an import (or re-export) that resolves to one of paths"""
+        want = {os.path.normpath(p) for p in paths}
+        return {f for f, info in self.files.items()
+                if any(self.resolve(f, spec) in want for spec, _, _ in info['imports'])}
+
+    def providers(self, names):
+        """Files exporting every name in names"""
+        return [p for p in self.files if names <= self.exports_of(p)]
+
+
+def _norm(p):
+    b = os.path.basename(p)
+    for ext in STRIP_EXT:
+        if b.endswith(ext): b = b[:-len(ext)]; break
+    if b == 'index': b = os.path.basename(os.path.dirname(p))
+    return re.sub(r'[-_.]', '', b).lower()
+
+
+def specifier(importer, target, alias=None):
+    """Import specifier for target as seen from importer; alias: a Resolver to prefer its `paths` alias"""
+    if alias is not None:
+        a = alias.alias_for(target)
+        if a: return a
+    t = re.sub(r'(/index)?(\.d)?\.(tsx?|jsx?)$', '', target)
+    rel = os.path.relpath(t, os.path.dirname(importer) or '.').replace(os.sep, '/')
+    return rel if rel.startswith('.') else './' + rel
+
+
+def broken_imports(index, scope=''):
+    """Yield (importer, spec, names, stmt, candidates) for every import under scope that does not
+    resolve to a file exporting what it asks for; candidates = files that do"""
+    for path, info in index.files.items():
+        if not path.startswith(scope): continue
+        for spec, names, stmt in info['imports']:
+            r = index.resolver.resolve(path, spec)
+            if r == EXTERNAL or (r is not None and r not in index.files): continue   # package / non-TS file
+            want = set(names or ())
+            if r and (names is None or want <= index.exports_of(r)): continue
+            if not want: yield path, spec, names, stmt, []; continue
+            cands = [p for p in index.providers(want) if p != path]
+            if len(cands) > 1:
+                same = [p for p in cands if _norm(p) == _norm(spec)]
+                cands = same or cands
+            yield path, spec, names, stmt, cands
+
+
+def owned_specs(fixes):
+    """{(path, specifier): fix id} for specifiers a hand-written Replace puts in place"""
+    out = {}
+    for f in fixes:
+        for op in f.ops:
+            new = getattr(op, 'new', None)
+            if isinstance(new, str) and len(new) > 2 and new[0] == new[-1] and new[0] in '\'"':
+                out[(f.path, new[1:-1])] = f.id
+    return out
+
+
+def import_fixes(index, scope='', owned=None):
+    """→ (fixes, unresolved): a Fix per import with exactly one provider; (importer, spec, reason) for the rest.
+    owned: owned_specs() of the hand-written fixes — never rewritten, only reported"""
+    fixes, unresolved = [], []
+    for path, spec, names, stmt, cands in broken_imports(index, scope):
+        if owned and (path, spec) in owned:
+            unresolved.append((path, spec, f"set by {owned[(path, spec)]}, left as is")); continue
+        if len(cands) != 1:
+            if cands: why = f"{len(cands)} candidate files"
+            elif names: why = "no file exports " + ', '.join(sorted(names))
+            else: why = "does not resolve"
+            unresolved.append((path, spec, why))
+            continue
+        relative = spec.startswith('.')
+        new = specifier(path, cands[0], alias=None if relative else index.resolver)
+        q = stmt[-1]
+        fixed = stmt[:len(stmt) - len(spec) - 2] + q + new + q
+        fixes.append(Fix(f"C6.{len(fixes) + 1}", path, f"{path}: '{spec}' → '{new}'",
+                         (Sub(r'(?m)^([ \t]*)' + re.escape(stmt), r'\g<1>' + fixed.replace('\\', r'\\'), 1),)))
+    return fixes, unresolved
@@ -0,0 +1,222 @@
+"""
+Synthetic NATT-OS tree — cây giả cùng hình dạng goldmaster để benchmark fixer
+- src/types.ts: N interface filler (nested type, generic, comment/string có { }, template, regex)
+  + các interface A1–A23 nhắm tới, rải đều trong file (không dồn đầu file)
+- các file service mà B/C/D sửa, ở trạng thái chưa patch
+- src/cells/natt-master-registry.json giả để qua root check
+"""
+import json, os
+
+TARGETS = '''export interface QuantumState {
+  id: string;
+  waveFunction: { amplitude: number; frequency: number; phase: number 
+  lastCollapse?: number;
+};
+  lastCollapse: number;
+}
+
+export interface ConsciousnessField {
+  activeDomains: string[];
+  level: number;
+}
+
+export interface TeamPerformance {
+  teamId: string;
+  period: string;
+  kpiScore: number;
+  revenue: number;
+  targets: Record<string, number>;
+  actuals: Record<string, number>;
+}
+
+export interface BaseEvent {
+  event_version: string;
+  note: string; // has a } brace in comment
+}
+
+export interface SalesEvent {
+  payload: string;
+  timestamp: number;
+}
+
+export interface StateChange {
+  domain: string;
+  entityId: string;
+}
+
+export interface Movement {
+  actor: string;
+}
+
+export interface ApprovalTicket {
+  approvalRequestId: string;
+}
+
+export interface ActionPlan {
+  assignedTo: string;
+  priority: 'LOW' | 'HIGH';
+}
+
+export interface AccountingEntry {
+  id: string;
+  reference?: unknown;
+}
+
+export interface AccountingMappingRule {
+  id: string;
+  autoPost?: boolean;
+}
+
+export interface BankTransaction {
+  id: string;
+  credit?: boolean;
+}
+
+export interface GovernanceKPI {
+  id: string;
+  period_date?: number;
+}
+
+export interface HUDMetric {
+  label: string;
+  value: number;
+}
+
+export interface OrderPricing {
+  total: number;
+}
+
+export interface CustomerLead {
+  name: string;
+}
+
+export interface SellerReport {
+  id: string;
+}
+
+export interface Certification {
+  id: string;
+}
+
+export interface ActionLog {
+  result: 'SUCCESS' | 'FAILURE' | 'PENDING';
+}
+
+export interface OperationRecord {
+  id: string;
+  operation: string;
+  status: 'SUCCESS' | 'FAILURE' | 'PENDING';
+}
+
+export interface DictionaryVersion {
+  version: string;
+  versionNumber: number;
+  publishedAt: number;
+  publishedBy: string;
+  changeLog: string[];
+}
+
+export interface TaxReport {
+  taxableIncome: number;
+  standardRate: number;
+}
+
+export interface ModuleConfig {
+  id: string;
+}
+
+export const IngestStatus = {
+  QUEUED: 'QUEUED',
+} as const;
+'''
+
+SERVICES = {
+    'src/cells/infrastructure/warehouse-cell/domain/entities/WarehouseEntity.ts': 'export interface WarehouseItem {\n  id: string;\n  name: string;\n  quantity: number;\n}\n',
+    'src/services/threatdetectionservice.ts': 'export default { tHReatdetectionservice }\n',
+    'src/core/audit/omegalockdown.ts': 'export const OmegaLockdown = { activate: () => {} };\n',
+    'src/services/smart-link.ts': 'export class SmartLinkClient {\n  static send(_event: string, _data?: unknown): void {}\n}\n',
+    'src/services/documentai.ts': 'export class Utilities {\n  static x = 1;\n}\n',
+    'src/services/einvoiceservice.ts': 'export class EInvoiceService {\n  static y = 1;\n}\nexport default EInvoiceService;\n',
+    'src/services/paymentservice.ts': 'export class PaymentEngine {\n}\n',
+    'src/utils/xmlcanonicalizer.ts': 'export class XmlCanonicalizer {\n}\n',
+    'src/admin/auditservice.ts': 'export class AuditProvider {\n  static logAction(_actor: string, _action: string, _meta?: unknown): void {}\n}\n',
+    'src/services/event-bridge.ts': "export { EventBridgeProvider as EventBridge } from '@/cells/event-cell/event-bridge.service';\n",
+    'src/services/sellerengine.ts': 'export class SellerEngine {}\n',
+    'src/components/seller-terminal.tsx': 'const a = SellerEngine.calculateCommission({\n        saleAmount: 1,\n      };\n      setX(a);\n',
+    'src/services/hr-service.ts': "function RequirePermission(p: string) {\n  return function (t, k, descriptor) {\n    return descriptor;\n  }\n}`);\n        };\n    return descriptor;\n}\nexport class HR {\n  a() { return { id: `att-${i}`, employee_id: 1 }; }\n}\n",
+    'src/core/core/processing/ai/aicore-processor.ts': 'import { X } from "../../../types";\n',
+    'src/core/core/processing/ai/ingestion/index.ts': "export * from './ingestion-service';\n",
+    'src/services/analytics/analytics-service.ts': "import { EventBridge } from '../../eventbridge';\n",
+    'src/services/compliance/certification-service.ts': "import { N } from '@/notificationservice';\nconst c = { issueDate: 1 };\n",
+    'src/core/core/ingestion/ingestion-service.ts': 'export class IngestionService {}\n',
+    'src/services/analytics/analytics-api.ts': "const now = new Date().toISOString().split('T')[0];\nconst t: TeamPerformance[] = [];\n",
+    'src/services/mapping/smart-link-mapping-engine.ts': "const e = { transactionDate: new Date(), journalId,\n  destination: { system: 'ACCOUNTING', entity: 'J' },\n};\n",
+    'src/core/core/smart-link-engine.ts': "if (tx.credit && tx.credit > 0) {}\nconst j = { entries: lines,\n  destination: { system: 'ACCOUNTING', entity: 'J' },\n};\n",
+    'src/core/runtime.ts': 'const s = { changedAt: new Date() };\n',
+    'src/core/core/ingestion/data-sync-engine.tsx': 'const resolution = await ConflictEngine.resolve();\n',
+    'src/services/recovery-engine.ts': "r.status = 'FAILED';\nr.status = 'RECOVERED';\n",
+    'src/components/sales-tax-module.tsx': "import { EInvoiceEngine } from 'x';\nconst items: EInvoiceItem[] = [];\nlet inv: EInvoice;\n",
+    'src/components/admin-config-hub.tsx': "const o = { [context]: 1 }; f(key as any);\n",
+    'src/components/app.tsx': "<DataPoint3D key={i} {...dp} />\n",
+    'src/services/module-registry.ts': "const m = {\n  [ViewType.A]: { allowedRoles: [] },\n};\n",
+    'src/services/fiscal/fiscal-workbench-service.ts': "const s = ShardingService.x;\n",
+    'src/services/quantum-engine.ts': "class Q {\n  private state: QuantumState = {\n    coherence: 1,\n  };\n  private consciousness: ConsciousnessField = {\n    level: 1,\n  };\n}\n",
+    'src/cells/infrastructure/warehouse-cell/application/warehouse.service.ts': "const a = { insuranceStatus: 'COVERED' };\n",
+}
+
+REGISTRY = {
+    'meta': {'name': 'NATT-OS Master Cell Registry (synthetic)', 'canonical_root': 'src/cells',
+             'last_synced': '1970-01-01T00:00:00.000Z'},
+    'wave_1_kernel': {'status': 'COMPLETE', 'cells': {}},
+    'summary': {'total_cells': 0, 'total_ts_files': 0},
+}
+
+
+def _filler(i):
+    """One filler declaration; rotates through the lexer's hard cases"""
+    k = i % 6
+    if k == 0:
+        return (f"export interface Entity{i} {{\n  id: string;\n"
+                f"  meta?: {{ createdAt: number; tags: string[] }}; // {{ stray brace in comment\n"
+                f"  status: 'OPEN' | 'CLOSED}}';\n}}\n")
+    if k == 1:
+        return (f"export interface Page{i}<T extends {{ id: string }}> {{\n  items: T[];\n"
+                f"  cursor?: string;\n  /* {{ block }} comment */\n}}\n")
+    if k == 2:
+        return (f"export const ROUTE_{i} = `/api/${{'{{'}}v{i}${{'}}'}}/items`;\nexport const RE_{i} = /[{{}}]+/g;\n"
+                f"export interface Route{i} {{\n  path: typeof ROUTE_{i};\n}}\n")
+    if k == 3:
+        return (f"export interface Handler{i} {{\n  handle(evt: {{ type: string; payload: unknown }}): Promise<void>;\n"
+                f"  nested: {{ a: {{ b: {{ c: number }} }} }};\n}}\n")
+    if k == 4:
+        return f"declare interface Ambient{i} {{\n  readonly key: \"{{{i}}}\";\n}}\n"
+    return f"export type Alias{i} = {{ value: number }};\ninterface Local{i} extends Entity{i - 5} {{\n  extra?: boolean;\n}}\n"
+
+
+def types_ts(interfaces):
+    """types.ts with `interfaces` filler interfaces and the A targets spread evenly between them"""
+    blocks = [b + '\n' for b in TARGETS.rstrip('\n').split('\n\n')]
+    tail = blocks.pop()                     # IngestStatus const stays last
+    at = {}
+    for j, b in enumerate(blocks): at.setdefault(j * interfaces // len(blocks), []).append(b)
+    out = []
+    for i in range(interfaces):
+        out.extend(at.pop(i, ()))
+        out.append(_filler(i))
+    for bs in at.values(): out.extend(bs)
+    out.append(tail)
+    return '\n'.join(out)
+
+
+def generate(root, interfaces=1000):
+    """Write the synthetic tree under root; return {relative path: bytes written}"""
+    files = dict(SERVICES)
+    files['src/types.ts'] = types_ts(interfaces)
+    files['src/cells/natt-master-registry.json'] = json.dumps(REGISTRY, indent=2) + '\n'
+    sizes = {}
+    for rel, c in files.items():
+        p = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        with open(p, 'w', encoding='utf-8') as f: f.write(c)
+        sizes[rel] = len(c.encode('utf-8'))
+    return sizes
@@ -0,0 +1,92 @@
+"""
+Trace — thời gian + I/O theo từng fix label (A1 … D14, flush, E)
+- add(): Result.stats của manifest → 1 span
+- span(): đo 1 khối trong script (flush, E) trên bộ đếm của BufferStore
+- write_chrome(): Chrome trace-event JSON (chrome://tracing, ui.perfetto.dev)
+- slowest(): bảng xếp hạng in cạnh SUMMARY
+- --profile-memory: span mang thêm peak / retained / high-water (natt_fix.memprof); print_memory() + budget
+"""
+import json, os, time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from natt_fix import memprof
+
+Span = namedtuple('Span', 'name cat start dur read written regex scans pid peak retained high', defaults=(0, 0, 0))
+
+
+class Trace:
+    def __init__(self):
+        self.spans = []
+
+    def add(self, name, cat, stats):
+        if stats is None: return     # cached result: nothing ran
+        self.spans.append(Span(name, cat, *stats))
+
+    @contextmanager
+    def span(self, name, cat, store=None):
+        r0, w0, s0 = (store.bytes_read, store.bytes_written, store.scans) if store else (0, 0, 0)
+        m = memprof.begin()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dur = time.perf_counter() - t0
+            r1, w1, s1 = (store.bytes_read, store.bytes_written, store.scans) if store else (0, 0, 0)
+            self.spans.append(Span(name, cat, t0, dur, r1 - r0, w1 - w0, 0, s1 - s0, os.getpid(), *memprof.end(m)))
+
+    def slowest(self, n=10):
+        return sorted(self.spans, key=lambda s: -s.dur)[:n]
+
+    def write_chrome(self, path):
+        """Complete ('X') events, µs relative to the first span; one row per process"""
+        t0 = min((s.start for s in self.spans), default=0)
+        events = [{'name': s.name, 'cat': s.cat, 'ph': 'X', 'pid': s.pid, 'tid': s.pid,
+                   'ts': round((s.start - t0) * 1e6, 3), 'dur': round(s.dur * 1e6, 3),
+                   'args': {'bytes_read': s.read, 'bytes_written': s.written,
+                            'regex': s.regex, 'index_scans': s.scans,
+                            **({'mem_peak': s.peak, 'mem_retained': s.retained} if s.high else {})}}
+                  for s in self.spans]
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, indent=1)
+
+
+def _size(n):
+    for unit in ('B', 'K', 'M'):
+        if n < 1024: return f"{n:.0f}{unit}" if unit == 'B' else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.1f}G"
+
+
+def print_slowest(trace, n=10):
+    rows = trace.slowest(n)
+    if not rows: return
+    print(f"\n  SLOWEST FIXES")
+    print(f"  {'#':>3}  {'label':<8} {'ms':>9} {'read':>7} {'written':>8} {'regex':>5} {'scans':>5}")
+    for i, s in enumerate(rows, 1):
+        print(f"  {i:>3}  {s.name:<8} {s.dur * 1000:>9.2f} {_size(s.read):>7} {_size(s.written):>8} {s.regex:>5} {s.scans:>5}")
+
+
+def print_memory(trace, budget=None, n=10):
+    """--profile-memory: largest peaks by label, then per section (peak = highest label, retained = sum)
+    → True when the peak went over budget bytes"""
+    spans = [s for s in trace.spans if s.high]
+    total = memprof.peak()
+    print(f"\n  MEMORY  peak {_size(total)}" + (f", budget {_size(budget)}" if budget else ''))
+    if spans:
+        print(f"  {'#':>3}  {'label':<8} {'peak':>8} {'retained':>9} {'high':>8}")
+        for i, s in enumerate(sorted(spans, key=lambda s: -s.peak)[:n], 1):
+            flag = '  ❌' if budget and s.high > budget else ''
+            print(f"  {i:>3}  {s.name:<8} {_size(s.peak):>8} {_size(s.retained):>9} {_size(s.high):>8}{flag}")
+        cats = {}
+        for s in spans: cats.setdefault(s.cat, []).append(s)
+        print(f"\n  {'section':<13} {'peak':>8} {'retained':>9} {'high':>8}")
+        for cat, ss in cats.items():
+            print(f"  {cat:<13} {_size(max(s.peak for s in ss)):>8} {_size(sum(s.retained for s in ss)):>9} "
+                  f"{_size(max(s.high for s in ss)):>8}")
+    if budget is None or total <= budget: return False
+    over = [s.name for s in spans if s.high > budget]
+    print(f"\n  ❌ memory budget exceeded: {_size(total)} > {_size(budget)}"
+          + (f" in {', '.join(dict.fromkeys(over))}" if over else ''))
+    return True
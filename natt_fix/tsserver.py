@@ -0,0 +1,132 @@
+"""
+tsserver — 1 phiên tsserver giữ ấm suốt lần chạy (--tsserver), nói JSON qua stdin/stdout
+- start(): node_modules/.bin/tsserver (hoặc node …/typescript/lib/tsserver.js); không có → None, dùng tsc như cũ
+- request: 1 dòng JSON; response: 'Content-Length: N' + JSON, bỏ qua event xen giữa
+- diagnostics(): chỉ các file cho trước (open / reload khi stat đổi) → syntactic + semantic
+  → cùng record Diagnostic với section E (file tương đối root, line/col 1-based, 'TS' + code)
+- check(): file đổi + file import trực tiếp nó (symbol index); program đã nạp được giữ giữa các lượt
+"""
+import json, os, subprocess
+
+from natt_fix.diagnostics import Diagnostic
+from natt_fix.symbols import SymbolIndex, SOURCE_EXT
+
+TIMEOUT = 120       # seconds to wait for tsserver to exit on close()
+
+
+class TsServerError(RuntimeError):
+    """tsserver exited or answered a request with success: false"""
+
+
+def find_tsserver(root='.'):
+    """Command line for the local tsserver, or None"""
+    exe = os.path.join(root, 'node_modules', '.bin', 'tsserver' + ('.cmd' if os.name == 'nt' else ''))
+    if os.path.exists(exe): return [os.path.abspath(exe)]
+    js = os.path.join(root, 'node_modules', 'typescript', 'lib', 'tsserver.js')
+    if os.path.exists(js): return ['node', os.path.abspath(js)]
+    return None
+
+
+class Session:
+    def __init__(self, cmd, root='.'):
+        self.root = os.path.abspath(root)
+        self.proc = subprocess.Popen(cmd + ['--disableAutomaticTypingAcquisition'], cwd=self.root,
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self._seq = 0
+        self._open = {}     # abs path -> (mtime_ns, size) when opened / reloaded
+        self.index = None   # SymbolIndex for check(), loaded on first use
+        self.checked = []   # files the last check() looked at
+        self.requests = 0
+
+    def _send(self, command, args):
+        self._seq += 1
+        msg = {'seq': self._seq, 'type': 'request', 'command': command, 'arguments': args}
+        try:
+            self.proc.stdin.write(json.dumps(msg).encode() + b'\n')
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise TsServerError(f"tsserver is gone ({command}): {e}") from None
+        self.requests += 1
+        return self._seq
+
+    def _read(self):
+        """Next message: headers up to a blank line, then Content-Length bytes of JSON"""
+        length = None
+        while True:
+            line = self.proc.stdout.readline()
+            if not line: raise TsServerError(f"tsserver exited ({self.proc.poll()})")
+            line = line.strip()
+            if not line:
+                if length is not None: break
+                continue
+            name, _, value = line.partition(b':')
+            if name.lower() == b'content-length': length = int(value)
+        return json.loads(self.proc.stdout.read(length))
+
+    def request(self, command, args):
+        """Send and wait for the matching response → its body"""
+        seq = self._send(command, args)
+        while True:
+            msg = self._read()
+            if msg.get('type') == 'response' and msg.get('request_seq') == seq:
+                if not msg.get('success', False):
+                    raise TsServerError(f"{command}: {msg.get('message', 'failed')}")
+                return msg.get('body')
+
+    def sync(self, path):
+        """Open path, or reload it when it changed on disk since → abs path"""
+        p = os.path.abspath(os.path.join(self.root, path))
+        try: st = os.stat(p); key = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError: key = None
+        old = self._open.get(p, False)
+        if old is False:
+            self._send('open', {'file': p, 'projectRootPath': self.root})     # no response
+        elif old != key:
+            self.request('reload', {'file': p, 'tmpfile': p})
+        self._open[p] = key
+        return p
+
+    def diagnostics(self, paths):
+        """Errors of paths (relative to root), syntactic then semantic per file → [Diagnostic]"""
+        files = [self.sync(p) for p in paths]
+        out = []
+        for p in files:
+            if self._open[p] is None: continue      # deleted
+            rel = os.path.relpath(p, self.root).replace(os.sep, '/')
+            for kind in ('syntacticDiagnosticsSync', 'semanticDiagnosticsSync'):
+                for d in self.request(kind, {'file': p}) or ():
+                    if d.get('category', 'error') != 'error': continue
+                    start = d.get('start') or {}
+                    # tsc prints a message chain as indented lines; parse() keeps them '\n'-joined, stripped
+                    msg = '\n'.join(l.strip() for l in d.get('text', '').split('\n'))
+                    out.append(Diagnostic(rel, start.get('line', 0), start.get('offset', 0), f"TS{d.get('code')}", msg))
+        return out
+
+    def check(self, paths):
+        """diagnostics() of the source files among paths plus their direct importers → (files, [Diagnostic])"""
+        if self.index is None: self.index = SymbolIndex.load()
+        src = {os.path.normpath(p).replace(os.sep, '/') for p in paths if p.endswith(SOURCE_EXT)}
+        self.checked = files = sorted(src | self.index.refresh(self.root).importers(src)) if src else []
+        return files, self.diagnostics(files)
+
+    def close(self):
+        if self.proc.poll() is None:
+            try: self._send('exit', {})
+            except TsServerError: pass
+            try: self.proc.wait(TIMEOUT)
+            except subprocess.TimeoutExpired: self.proc.kill(); self.proc.wait()
+        for f in (self.proc.stdin, self.proc.stdout):
+            try: f.close()
+            except OSError: pass
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): self.close()
+
+
+def start(root='.'):
+    """Session on the local tsserver, or None when typescript is not installed"""
+    cmd = find_tsserver(root)
+    if cmd is None: return None
+    try: return Session(cmd, root)
+    except OSError: return None     # `node` not on PATH
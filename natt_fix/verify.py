@@ -0,0 +1,74 @@
+"""
+Section E — verify bằng tsc
+- gọi thẳng node_modules/.bin/tsc (không qua npx resolve), fallback npx nếu chưa npm install
+- --incremental, .tsbuildinfo để ngoài src/ (trong STATE_DIR) → warm run chỉ check phần đổi
+- stream_tsc(): Popen + parse từng dòng → Diagnostic (natt_fix.diagnostics)
+  exit khác 0 / 2, hoặc exit 2 mà không parse được dòng lỗi nào → TscError (không ghi report / baseline)
+  không chạy được lệnh (không có tsc local lẫn npx) → TscError kèm lệnh
+- check_files(): tsc incremental, chỉ giữ lỗi của các file cho trước (--watch)
+"""
+import os, subprocess
+from collections import deque
+
+from natt_fix import STATE_DIR
+from natt_fix.diagnostics import parse
+
+BUILDINFO = os.path.join(STATE_DIR, 'tsc.tsbuildinfo')
+OK_STATUS = (0, 2)      # 2: diagnostics reported (--noEmit); anything else: tsc / npx did not run the check
+TAIL = 5                # output lines quoted in a TscError
+
+
+class TscError(RuntimeError):
+    """tsc exited with an unexpected status, or reported errors that could not be parsed"""
+
+
+def find_tsc(root='.'):
+    """[path to local tsc] or None"""
+    exe = os.path.join(root, 'node_modules', '.bin', 'tsc' + ('.cmd' if os.name == 'nt' else ''))
+    return [exe] if os.path.exists(exe) else None
+
+
+def tsc_command(root='.', incremental=True, buildinfo=BUILDINFO):
+    cmd = find_tsc(root) or ['npx', 'tsc']
+    cmd.append('--noEmit')
+    if incremental:
+        os.makedirs(os.path.dirname(os.path.join(root, buildinfo)), exist_ok=True)
+        cmd += ['--incremental', '--tsBuildInfoFile', buildinfo]
+    return cmd
+
+
+def stream_tsc(root='.', incremental=True, cmd=None):
+    """Yield Diagnostic while tsc runs (stdout + stderr merged, line-buffered);
+    TscError if the command cannot be started, or once it exits if the status is not 0 / 2,
+    or is 2 with no diagnostic parsed"""
+    cmd = cmd or tsc_command(root, incremental)
+    tail, n = deque(maxlen=TAIL), 0
+    def lines(f):
+        for line in f:
+            if line.strip(): tail.append(line.rstrip())
+            yield line
+    try:
+        proc = subprocess.Popen(cmd, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, encoding='utf-8', errors='replace', bufsize=1)
+    except OSError as e:        # neither node_modules/.bin/tsc nor npx on PATH
+        raise TscError(f"{' '.join(cmd)}: {e.strerror or e}") from e
+    with proc:
+        for d in parse(lines(proc.stdout)):
+            n += 1
+            yield d
+        rc = proc.wait()
+    if rc not in OK_STATUS or (rc != 0 and not n):
+        why = f"exited {rc}" if rc not in OK_STATUS else f"exited {rc} with no parseable error line"
+        raise TscError(f"{' '.join(cmd)} {why}" + ''.join(f"\n    {l}" for l in tail))
+
+
+def run_tsc(root='.', incremental=True):
+    """→ (command, [Diagnostic])"""
+    cmd = tsc_command(root, incremental)
+    return cmd, list(stream_tsc(root, cmd=cmd))
+
+
+def check_files(paths, root='.', incremental=True):
+    """Diagnostics of paths only (the incremental build re-checks just what changed)"""
+    want = {os.path.normpath(p) for p in paths}
+    return [d for d in stream_tsc(root, incremental) if d.file and os.path.normpath(d.file) in want]
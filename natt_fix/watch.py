@@ -0,0 +1,161 @@
+"""
+Watch — --watch: theo dõi đúng các file có trong fix set, file nào đổi thì áp lại fix của file đó
+- Linux: inotify (ctypes), watch thư mục cha → bắt cả ghi đè, rename, xoá/tạo lại (git checkout, pull)
+- không có inotify (hoặc --poll): poll os.stat mỗi --poll-interval giây
+- mỗi lượt: BufferStore mới, chỉ fix gắn với file đổi, flush, rồi tsc incremental chỉ in lỗi của file đó
+- file do chính lượt trước ghi: filecache fresh → bỏ qua im lặng, không lặp vô hạn
+- C6: chỉ các import fix lượt đầu đã tìm ra (không dựng lại symbol index mỗi lượt)
+"""
+import ctypes, ctypes.util, os, select, struct, time
+
+from natt_fix import diagnostics, manifest
+from natt_fix.buffers import BufferStore
+
+POLL_INTERVAL = 0.5
+DEBOUNCE = 0.05     # seconds of quiet before a batch of events is handled
+
+IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO = 0x008, 0x040, 0x080
+IN_CREATE, IN_DELETE, IN_DELETE_SELF, IN_MOVE_SELF = 0x100, 0x200, 0x400, 0x800
+IN_IGNORED, IN_ISDIR = 0x8000, 0x40000000
+MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+_EVENT = struct.Struct('iIII')      # wd, mask, cookie, len (+ name, NUL-padded)
+
+
+def _existing(d):
+    """d, or its nearest existing ancestor (a B13 stub's directory may not exist yet)"""
+    while d and not os.path.isdir(d): d = os.path.dirname(d)
+    return d or '.'
+
+
+class InotifyWatcher:
+    def __init__(self, paths):
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0: raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.paths = {os.path.normpath(p) for p in paths}
+        self.dirs = {os.path.dirname(p) or '.' for p in self.paths}
+        self._wd = {}       # wd -> watched dir
+        self._sync()
+
+    def _sync(self):
+        """(Re)watch every target directory, or its nearest existing ancestor"""
+        self._wd.clear()
+        for d in sorted({_existing(d) for d in self.dirs}):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(d), MASK)
+            if wd < 0: raise OSError(ctypes.get_errno(), f'inotify_add_watch {d}')
+            self._wd[wd] = d
+
+    def _drain(self):
+        """Read every pending event → changed target paths"""
+        changed, resync = set(), False
+        while True:
+            try: buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError: break
+            i = 0
+            while i < len(buf):
+                wd, mask, _, n = _EVENT.unpack_from(buf, i)
+                name = buf[i + _EVENT.size:i + _EVENT.size + n].rstrip(b'\0').decode(errors='replace')
+                i += _EVENT.size + n
+                d = self._wd.get(wd)
+                if d is None: continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED): resync = True; continue
+                p = os.path.normpath(os.path.join(d, name))
+                if mask & IN_ISDIR:
+                    # a target directory (re)appeared or went away: watch it, re-check what is under it
+                    if any(t == p or t.startswith(p + os.sep) for t in self.dirs):
+                        resync = True
+                        changed |= {t for t in self.paths if t.startswith(p + os.sep)}
+                elif p in self.paths:
+                    changed.add(p)
+        if resync: self._sync()
+        return changed
+
+    def wait(self, timeout=None):
+        """Block until a target changes → set of changed paths (debounced)"""
+        changed = set()
+        while not changed:
+            if not select.select([self.fd], [], [], timeout)[0]: return changed
+            changed |= self._drain()
+            while select.select([self.fd], [], [], DEBOUNCE)[0]: changed |= self._drain()
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollWatcher:
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = {os.path.normpath(p) for p in paths}
+        self.interval = interval
+        self._seen = self._stat()
+
+    def _stat(self):
+        out = {}
+        for p in self.paths:
+            try: st = os.stat(p)
+            except FileNotFoundError: out[p] = None
+            else: out[p] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return out
+
+    def wait(self, timeout=None):
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = self._stat()
+            changed = {p for p, s in now.items() if s != self._seen.get(p)}
+            self._seen = now
+            if changed: return changed
+            if end is not None and time.monotonic() >= end: return changed
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+def watcher(paths, poll=False, interval=POLL_INTERVAL):
+    """inotify where the kernel has it, polling otherwise (or when poll)"""
+    if not poll:
+        try: return InotifyWatcher(paths)
+        except (OSError, AttributeError): pass     # not Linux / no inotify / watch limit hit
+    return PollWatcher(paths, interval)
+
+
+def apply_changed(fixes, changed, cache, jobs=1):
+    """One watch round: fixes bound to a changed file, on a fresh store, flushed
+    → ([(Fix, Result)] that actually ran, flushed paths)"""
+    todo = [f for f in fixes if os.path.normpath(f.path) in changed]
+    if not todo: return [], []
+    store = BufferStore()
+    cache.hits = set()
+    results = manifest.run(store, todo, jobs=jobs, cache=cache)
+    flushed = store.flush()
+    cache.update(store, todo, results)
+    cache.save()
+    return [(f, r) for f, r in zip(todo, results) if f.path not in cache.hits], flushed
+
+
+def loop(fixes, cache, report, verify=None, poll=False, interval=POLL_INTERVAL, jobs=1):
+    """--watch: re-apply fixes of every target file that changes until Ctrl-C.
+    report: {'ok'|'skip'|'fail': fn(msg)}; verify: fn(paths) → [Diagnostic] or None"""
+    w = watcher({f.path for f in fixes}, poll, interval)
+    kind = 'inotify' if isinstance(w, InotifyWatcher) else f'polling every {interval}s'
+    print(f"\n══ WATCH ══  {len({f.path for f in fixes})} file(s), {kind} — Ctrl-C to stop")
+    try:
+        while True:
+            changed = w.wait()
+            t0 = time.perf_counter()
+            ran, flushed = apply_changed(fixes, changed, cache, jobs)
+            if not ran: continue        # our own writes coming back, or untouched content
+            print(f"\n  [{time.strftime('%H:%M:%S')}] changed: {', '.join(sorted(changed))}")
+            for _, r in ran:
+                if r.status != 'skip': report[r.status](r.msg)
+            print(f"  {sum(r.status == 'skip' for _, r in ran)} already applied, flushed: {len(flushed)} file(s) in {(time.perf_counter() - t0) * 1000:.0f} ms")
+            if verify and flushed:
+                try: diags = verify(flushed)
+                except RuntimeError as e:       # verify.TscError / tsserver.TsServerError: keep watching
+                    print(f"  ❌ {e}"); continue
+                print(f"  TSC errors in changed files: {len(diags)}")
+                for d in diags: print(f"    {diagnostics.fmt(d)}")
+    except KeyboardInterrupt:
+        print("\n  watch stopped")
+    finally:
+        w.close()
@@ -6,888 +6,404 @@ Tác giả: Băng | SYSTEM_DISCIPLINE_ORDER
 - Công cụ: Python only, no awk, no sed
 - Idempotent: mỗi fix check trước khi patch
 - Chạy 1 lần duy nhất sau git checkout -- .
+- Mọi đọc/ghi đi qua BufferStore: mỗi file đọc 1 lần, flush 1 lần trước E
+- Fix A–D là data (natt_fix/fixes.py), engine gom theo file (natt_fix/manifest.py)
+- --jobs N: nhóm fix theo file chạy song song, output giữ đúng thứ tự chạy tuần tự
+- E dùng node_modules/.bin/tsc --incremental (buildinfo trong .natt-fix/)
+- .natt-fix/filecache.json: file không đổi từ lần chạy trước → skip mọi fix, chỉ 1 stat()
+- mỗi fix label đo thời gian / byte đọc-ghi / regex; --trace out.json (Chrome trace-event)
+- --auto-imports (C6, mặc định tắt): import không resolve / trỏ nhầm file → viết lại theo symbol index
+  (.natt-fix/symbols.json); mỗi specifier đổi in 1 dòng ở section C, --plan --auto-imports in diff trước khi ghi
+  resolve theo tsconfig paths/baseUrl (natt_fix/resolver.py, memo), không cần tsc để biết import đúng
+- --plan: áp fix trong RAM, in unified diff, exit 1 nếu còn thay đổi chờ — không ghi, không tsc
+- E parse lỗi tsc thành record, report JSON, chỉ in lỗi mới / đã hết so với baseline
+- trước flush: chụp file sắp ghi (natt_fix/snapshot.py, zlib, theo sha256); sau E nhiều lỗi hơn trước flush → tự khôi phục,
+  fix PASS trên file đã khôi phục tính FAIL (rolled back). Số lỗi "trước" = report tsc ghi đúng cho cây này, không có
+  thì tsc 1 lượt trước flush
+- fix khai báo after= (D13 sau A2/A3 …): chạy theo DAG, fix FAIL → fix phụ thuộc bị chặn, in cây BLOCKED
+- --status: mỗi fix đã áp / chờ / mất anchor … (marker cả file tìm 1 lượt, natt_fix/markers.py), không ghi gì
+- --only A2,A3,D13 / --skip E / --section B / --list: chỉ chạy (và chỉ đọc file của) fix được chọn
+- --profile-memory [--memory-budget 512M]: tracemalloc quanh từng fix / bước, peak + retained theo label và section,
+  vượt budget → exit 1 (natt_fix/memprof.py): vượt trước flush → không ghi gì; vượt sau flush → khôi phục snapshot
+- --tsserver: giữ 1 tsserver ấm; E / --autofix / --watch chỉ check file đã sửa + file import trực tiếp nó
+- --autofix: lỗi tsc thiếu property → fix Fields cho đúng interface, tsc lại, lặp khi số lỗi còn giảm
+- --sync-registry: quét src/cells song song, ghi lại natt-master-registry.json nếu có cell đổi (natt_fix/cells.py)
+- anchor hụt → in vùng gần nhất (dòng + score, n-gram index natt_fix/fuzzy.py); --fuzzy-apply: áp tại vùng đủ chắc
+- --scan-report: viết lại natt-os-scan-report.txt / .json, chỉ section có file đổi (natt_fix/scanreport.py)
+- --watch: sau lượt đầu, theo dõi file đích (inotify / poll), áp lại fix của file vừa đổi + tsc cho file đó
+  (không tsc khi bỏ bước E)
 """
-import os, sys, re
+import os, sys, argparse
+from natt_fix.buffers import BufferStore
+from natt_fix import manifest
+from natt_fix.fixes import C, select
+from natt_fix import diagnostics
+from natt_fix.filecache import FileCache
+from natt_fix.trace import Trace, print_slowest, print_memory
+from natt_fix.plan import unified_diff
+from natt_fix.symbols import SymbolIndex, import_fixes, owned_specs
+from natt_fix.verify import find_tsc, run_tsc, check_files, TscError
+from natt_fix import watch, cells, autofix, tsserver, snapshot, memprof, scanreport, fuzzy
 
 PASS = 0; SKIP = 0; FAIL = 0
 
 def ok(msg): global PASS; PASS+=1; print(f"  ✅ {msg}")
 def skip(msg): global SKIP; SKIP+=1; print(f"  ⚠️  {msg}")
 def fail(msg): global FAIL; FAIL+=1; print(f"  ❌ {msg}")
-
-def rw(path):
-    with open(path,'r',encoding='utf-8') as f: return f.read()
-def wr(path, c):
-    with open(path,'w',encoding='utf-8') as f: f.write(c)
-def patch(path, old, new, label):
-    c = rw(path)
-    if new.split('\n')[0].strip() in c:
-        skip(f"{label}: already applied")
-        return c
-    if old not in c:
-        fail(f"{label}: anchor not found in {path}")
-        return c
-    c = c.replace(old, new, 1)
-    wr(path, c)
-    ok(label)
-    return c
-
-def add_to_interface(path, iface_name, anchor_field, new_field, label):
-    """Insert new_field after anchor_field inside named interface, idempotent"""
-    c = rw(path)
-    field_name = new_field.strip().split(':')[0].rstrip('?').strip()
-    # Check if field already in interface block
-    block = extract_interface(c, iface_name)
-    if block and field_name in block:
-        skip(f"{label}: {field_name} already in {iface_name}")
-        return c
-    if anchor_field not in c:
-        fail(f"{label}: anchor '{anchor_field}' not found")
-        return c
-    c = c.replace(anchor_field, anchor_field + '\n' + new_field, 1)
-    wr(path, c)
-    ok(label)
-    return c
-
-def make_optional(path, iface_name, field_pattern, label):
-    """Make a required field optional in an interface"""
-    c = rw(path)
-    block = extract_interface(c, iface_name)
-    if not block: skip(f"{label}: interface {iface_name} not found"); return c
-    if re.search(field_pattern.replace(':', r'\?:'), block):
-        skip(f"{label}: already optional"); return c
-    if not re.search(field_pattern, block):
-        skip(f"{label}: field not found in {iface_name}"); return c
-    # Replace within interface context
-    start = c.find(f'export interface {iface_name}')
-    if start == -1: start = c.find(f'interface {iface_name}')
-    end = find_interface_end(c, start)
-    iblock = c[start:end]
-    new_block = re.sub(field_pattern, lambda m: m.group(0).replace(':', '?:', 1), iblock, count=1)
-    c = c[:start] + new_block + c[end:]
-    wr(path, c)
-    ok(label)
-    return c
-
-def extract_interface(content, name):
-    p = content.find(f'interface {name}')
-    if p == -1: return None
-    start = find_interface_end(content, p, ret_start=True)
-    end = find_interface_end(content, p)
-    return content[start:end]
-
-def find_interface_end(content, start, ret_start=False):
-    i = content.find('{', start)
-    if ret_start: return i
-    depth = 0
-    while i < len(content):
-        if content[i] == '{': depth += 1
-        elif content[i] == '}':
-            depth -= 1
-            if depth == 0: return i + 1
-        i += 1
-    return len(content)
-
-# ── verify root ───────────────────────────────────────────────
-print("\n╔══════════════════════════════════════════════════════════╗")
-print("║  SCRIPT 10 — COMPREHENSIVE FIX FROM CLEAN STATE         ║")
-print("║  Băng | Python only | Idempotent                        ║")
-print("╚══════════════════════════════════════════════════════════╝")
-print(f"  cwd: {os.getcwd()}")
-if not os.path.exists('src/cells/natt-master-registry.json'):
-    print("❌ ABORT: sai thư mục"); sys.exit(1)
-
-TYPES = 'src/types.ts'
-
-# ================================================================
-print("\n══ A. TYPES.TS ══")
-# ================================================================
-c = rw(TYPES)
-
-# A1. Fix QuantumState broken syntax: waveFunction type missing closing }
-# Current: waveFunction: { amplitude: number; frequency: number; phase: number 
-# Fixed:   waveFunction: { amplitude: number; frequency: number; phase: number }
-if 'waveFunction: { amplitude: number; frequency: number; phase: number \n' in c:
-    c = c.replace(
-        'waveFunction: { amplitude: number; frequency: number; phase: number \n  lastCollapse?: number;\n};\n  lastCollapse: number;',
-        'waveFunction: { amplitude: number; frequency: number; phase: number };\n  lastCollapse?: number;\n  lastCollapse_legacy?: number;'
-    )
-    ok("A1: QuantumState.waveFunction syntax fixed")
-elif 'waveFunction: { amplitude' in c and 'phase: number }' in c:
-    skip("A1: waveFunction already correct")
-else:
-    # Try simpler fix
-    c = re.sub(
-        r'(waveFunction: \{ amplitude: number; frequency: number; phase: number) \n(\s*lastCollapse\?)',
-        r'\1 };\n\2',
-        c
-    )
-    ok("A1: QuantumState.waveFunction regex fixed")
-wr(TYPES, c); c = rw(TYPES)
-
-# A2. QuantumState: make id optional (quantum-engine initializes without it)
-c = make_optional(TYPES, 'QuantumState', r'  id: string;', "A2: QuantumState.id → optional")
-
-# A3. ConsciousnessField: make activeDomains optional
-c = make_optional(TYPES, 'ConsciousnessField', r'  activeDomains: string\[\];', "A3: ConsciousnessField.activeDomains → optional")
-
-# A4. TeamPerformance: make required fields optional
-for field, pat in [
-    ("teamId", r'  teamId: string;'),
-    ("period", r'  period: string;'),
-    ("kpiScore", r'  kpiScore: number;'),
-    ("revenue", r'  revenue: number;'),
-    ("targets", r'  targets: Record'),
-    ("actuals", r'  actuals: Record'),
-]:
-    c = make_optional(TYPES, 'TeamPerformance', pat, f"A4: TeamPerformance.{field} → optional")
-
-# A5. AccountingMappingRule: add mappingType?, sourceField?, destinationField?
-c = rw(TYPES)
-block = extract_interface(c, 'AccountingMappingRule')
-if block:
-    if 'mappingType' not in block:
-        c = c.replace('  autoPost?: boolean;', '  autoPost?: boolean;\n  mappingType?: string;\n  sourceField?: string;\n  destinationField?: string;', 1)
-        ok("A5: AccountingMappingRule: mappingType/sourceField/destinationField added")
-        wr(TYPES, c)
+REPORT = {'ok': ok, 'skip': skip, 'fail': fail}
+
+STORE = BufferStore()
+TSS = None      # --tsserver session, kept warm for E, --autofix and --watch
+TRACE = Trace()
+
+def _ids(s): return [t.strip() for t in s.split(',') if t.strip()]
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Script 10 — comprehensive fix from clean state")
+    ap.add_argument('--only', type=_ids, action='extend', default=[], metavar='IDS',
+                    help="run only these fixes / steps, comma-separated (A2,A3,D13; A4 = A4a…A4f; C6; E)")
+    ap.add_argument('--skip', type=_ids, action='extend', default=[], metavar='IDS',
+                    help="leave out these fixes, sections or steps (E = no tsc)")
+    ap.add_argument('--section', type=_ids, action='extend', default=[], metavar='A,B,…',
+                    help="run only these sections (A B C D E)")
+    ap.add_argument('--list', action='store_true', help="list the selected fixes and exit (reads no file)")
+    ap.add_argument('--status', action='store_true',
+                    help="per selected fix: applied / pending / anchor missing / … from one scan per file, then exit")
+    ap.add_argument('-j', '--jobs', type=int, default=1,
+                    help="process pool size for per-file fix groups (0 = all CPUs, default 1 = serial)")
+    ap.add_argument('--plan', action='store_true',
+                    help="dry run: print a unified diff per file that would change, exit 1 if any; "
+                         "writes nothing and skips tsc")
+    ap.add_argument('--fuzzy-apply', type=float, nargs='?', const=fuzzy.APPLY, metavar='SCORE',
+                    help=f"apply a fix whose anchor drifted at its closest region when the match scores ≥ SCORE "
+                         f"(default {fuzzy.APPLY}) and clearly beats the runner-up")
+    ap.add_argument('--auto-imports', action='store_true',
+                    help="C6 (off by default): rewrite imports that do not resolve to the exporting file; "
+                         "every rewrite is listed, run with --plan first to see the diff")
+    ap.add_argument('--no-cache', action='store_true',
+                    help="ignore .natt-fix/filecache.json and re-check every target file")
+    ap.add_argument('--verify-if-modified', action='store_true',
+                    help="skip section E when this run modified no file")
+    ap.add_argument('--no-incremental', action='store_true',
+                    help="full tsc check, ignore the persisted .tsbuildinfo")
+    ap.add_argument('--profile-memory', action='store_true',
+                    help="tracemalloc around every fix and step: peak / retained per label and section (forces -j 1)")
+    ap.add_argument('--memory-budget', type=memprof.parse_size, metavar='SIZE',
+                    help="with --profile-memory: fail the run when Python memory goes above SIZE (512M, 2G)")
+    ap.add_argument('--trace', metavar='OUT.json',
+                    help="write per-fix timings in Chrome trace-event format")
+    ap.add_argument('--baseline', default=diagnostics.BASELINE,
+                    help=f"tsc report to diff against (default {diagnostics.BASELINE})")
+    ap.add_argument('--update-baseline', action='store_true',
+                    help="save this run's tsc report as the new baseline")
+    ap.add_argument('--no-snapshot', action='store_true',
+                    help="do not snapshot files before flush (no automatic restore when E regresses)")
+    ap.add_argument('--tsserver', action='store_true',
+                    help="verify through a warm local tsserver: only modified files and their direct importers")
+    ap.add_argument('--autofix', action='store_true',
+                    help="after E, add / make optional the interface fields tsc reports missing (TS2339/TS2353/TS2741), "
+                         "re-verify, repeat while the error count falls")
+    ap.add_argument('--autofix-rounds', type=int, default=autofix.MAX_ROUNDS, metavar='N')
+    ap.add_argument('--sync-registry', action='store_true',
+                    help="rescan src/cells and rewrite natt-master-registry.json if any cell changed (--plan: report only)")
+    ap.add_argument('--scan-report', action='store_true',
+                    help="after E: refresh natt-os-scan-report.txt + .json, only sections whose files changed")
+    ap.add_argument('--watch', action='store_true',
+                    help="after the run, keep watching the fix targets and re-apply a file's fixes when it changes")
+    ap.add_argument('--poll', action='store_true', help="--watch by polling stat() instead of inotify")
+    ap.add_argument('--poll-interval', type=float, default=watch.POLL_INTERVAL, metavar='SEC',
+                    help=f"polling period (default {watch.POLL_INTERVAL})")
+    args = ap.parse_args(argv)
+    if args.watch and args.plan: ap.error("--watch and --plan are mutually exclusive")
+    if args.autofix and args.plan: ap.error("--autofix and --plan are mutually exclusive")
+    if args.tsserver and args.plan: ap.error("--tsserver and --plan are mutually exclusive")
+    if not args.auto_imports and 'C6' not in args.only: args.skip.append('C6')     # --only C6 opts in too
+    if args.memory_budget is not None: args.profile_memory = True
+    if args.profile_memory: args.jobs = 1      # pool workers allocate outside this process' tracemalloc
+    try: args.selected, args.steps = select(args.section, args.only, args.skip)
+    except ValueError as e: ap.error(str(e))
+    return args
+
+def show_plan():
+    """--plan: unified diff of every buffer a fix changed → number of files pending"""
+    print("\n══ PLAN ══")
+    pending = STORE.dirty
+    for path in pending:
+        print()
+        sys.stdout.write(unified_diff(path, STORE.orig.get(path), STORE.read(path), STORE.edits.get(path)))
+    print(f"\n  pending: {len(pending)} file(s)" if pending else "\n  nothing to change")
+    return len(pending)
+
+def verify(args, flushed):
+    """Section E → [Diagnostic], None when skipped"""
+    # ================================================================
+    print("\n══ E. VERIFY ══")
+    # ================================================================
+    if 'E' not in args.steps:
+        print("\n  ⚠️  skipped: not selected")
+        return None
+    if args.verify_if_modified and not flushed:
+        print("\n  ⚠️  skipped: no file modified")
+        return None
+    if TSS is not None:
+        try: return verify_tsserver(args, flushed)
+        except tsserver.TsServerError as e: drop_tsserver(e)
+    if not find_tsc(): print("  ⚠️  node_modules/.bin/tsc not found — falling back to npx")
+    try:
+        with TRACE.span('E', 'E'):
+            cmd, diags = run_tsc(incremental=not args.no_incremental)
+    except TscError as e:
+        fail(f"E: tsc failed, no report / baseline written: {e}")
+        return None
+    diagnostics.write_report(diagnostics.to_report(diags, cmd, snapshot.tree_state()))
+    print(f"\n  TSC errors: {len(diags)}  (report: {diagnostics.REPORT})")
+    for code, ds in diagnostics.group_by(diags, 'code').items():
+        print(f"    {code:<8} {len(ds):>4}")
+    baseline = diagnostics.load_report(args.baseline)
+    if baseline is None or args.update_baseline:
+        diagnostics.write_report(diagnostics.to_report(diags, cmd, snapshot.tree_state()), args.baseline)
+        print(f"\n  baseline saved: {args.baseline}")
     else:
-        skip("A5: mappingType already exists")
-
-# A6. AccountingEntry: add matchScore?, entries?, journalId?
-c = rw(TYPES)
-block = extract_interface(c, 'AccountingEntry')
-if block and 'matchScore' not in block:
-    c = c.replace('  reference?: unknown;', '  reference?: unknown;\n  matchScore?: number;\n  entries?: unknown[];\n  journalId?: string;', 1)
-    ok("A6: AccountingEntry: matchScore/entries/journalId added")
-    wr(TYPES, c)
-else:
-    skip("A6: AccountingEntry fields exist")
-
-# A7. HUDMetric: add icon?, department?
-c = rw(TYPES)
-block = extract_interface(c, 'HUDMetric')
-if block and 'icon' not in block:
-    # find a unique anchor in HUDMetric
-    if '  label: string;' in c:
-        c = c.replace('  label: string;', '  label: string;\n  icon?: string;\n  department?: unknown;', 1)
-        ok("A7: HUDMetric: icon + department added")
-        wr(TYPES, c)
+        new, resolved = diagnostics.diff(baseline, diags)
+        print(f"\n  vs baseline: +{len(new)} new, -{len(resolved)} resolved")
+        for d in new: print(f"    + {diagnostics.fmt(d)}")
+        for d in resolved: print(f"    - {diagnostics.fmt(d)}")
+    return diags
+
+def drop_tsserver(e):
+    """tsserver crashed or broke protocol: close it, the rest of the run checks with tsc"""
+    global TSS
+    print(f"\n  ⚠️  tsserver failed ({e}) — verifying with tsc")
+    TSS.close()
+    TSS = None
+
+def verify_tsserver(args, flushed):
+    """Section E on the warm tsserver: modified files + direct importers, baseline diff on those files only"""
+    with TRACE.span('E', 'E'):
+        files, diags = TSS.check(flushed)
+    diagnostics.write_report(diagnostics.to_report(diags, ['tsserver'] + files, snapshot.tree_state()))
+    print(f"\n  TSC errors: {len(diags)} in {len(files)} checked file(s), tsserver  (report: {diagnostics.REPORT})")
+    for code, ds in diagnostics.group_by(diags, 'code').items():
+        print(f"    {code:<8} {len(ds):>4}")
+    baseline = diagnostics.load_report(args.baseline)
+    if baseline is None or args.update_baseline:
+        print(f"\n  baseline not saved: tsserver checks only part of the program — run without --tsserver")
     else:
-        fail("A7: anchor not found")
-else:
-    skip("A7: HUDMetric fields exist")
-
-# A8. DictionaryVersion: comment?, createdBy?, metadata?, publishedAt/By/changeLog → optional
-c = rw(TYPES)
-block = extract_interface(c, 'DictionaryVersion')
-if block:
-    if 'comment?' not in block and 'versionNumber' in block:
-        c = c.replace('  versionNumber: number;', '  versionNumber: number;\n  comment?: string;\n  createdBy?: string;\n  metadata?: Record<string, unknown>;', 1)
-        ok("A8a: DictionaryVersion comment/createdBy/metadata added")
-        wr(TYPES, c); c = rw(TYPES)
-    else: skip("A8a: comment already exists")
-    # Make publishedAt/By/changeLog optional
-    for pat in [r'  publishedAt: number;', r'  publishedBy: string;']:
-        c = re.sub(pat, lambda m: m.group(0).replace(': ', '?: ', 1), c, count=1)
-    c = re.sub(r'  changeLog: (string\[\]|.*?);', r'  changeLog?: \1;', c, count=1)
-    wr(TYPES, c)
-    ok("A8b: DictionaryVersion publishedAt/By/changeLog → optional")
-
-# A9. GovernanceKPI: target_value?
-c = rw(TYPES)
-block = extract_interface(c, 'GovernanceKPI')
-if block and 'target_value' not in block:
-    c = c.replace('  period_date?: number;', '  period_date?: number;\n  target_value?: number;', 1)
-    ok("A9: GovernanceKPI.target_value? added")
-    wr(TYPES, c)
-else: skip("A9: target_value exists")
-
-# A10. OrderPricing: shippingFee?, insuranceFee?, grossProfit?
-c = rw(TYPES)
-block = extract_interface(c, 'OrderPricing')
-if block and 'shippingFee' not in block:
-    # find anchor in OrderPricing
-    start = c.find('interface OrderPricing')
-    end = find_interface_end(c, start)
-    iblock = c[start:end]
-    # Add before closing }
-    new_fields = '  shippingFee?: number;\n  insuranceFee?: number;\n  grossProfit?: number;\n'
-    iblock = iblock.rstrip()[:-1] + '\n' + new_fields + '}'
-    c = c[:start] + iblock + c[end:]
-    ok("A10: OrderPricing: shippingFee/insuranceFee/grossProfit added")
-    wr(TYPES, c)
-else: skip("A10: OrderPricing fields exist")
-
-# A11. CustomerLead: expiryDate?, status?
-c = rw(TYPES)
-block = extract_interface(c, 'CustomerLead')
-if block and 'expiryDate' not in block:
-    start = c.find('interface CustomerLead')
-    end = find_interface_end(c, start)
-    iblock = c[start:end]
-    iblock = iblock.rstrip()[:-1] + '\n  expiryDate?: number;\n  status?: string;\n}'
-    c = c[:start] + iblock + c[end:]
-    ok("A11: CustomerLead: expiryDate/status added")
-    wr(TYPES, c)
-else: skip("A11: CustomerLead fields exist")
-
-# A12. SellerReport: customerName?, customerPhone?
-c = rw(TYPES)
-block = extract_interface(c, 'SellerReport')
-if block and 'customerName' not in block:
-    start = c.find('interface SellerReport')
-    end = find_interface_end(c, start)
-    iblock = c[start:end]
-    iblock = iblock.rstrip()[:-1] + '\n  customerName?: string;\n  customerPhone?: string;\n}'
-    c = c[:start] + iblock + c[end:]
-    ok("A12: SellerReport: customerName/customerPhone added")
-    wr(TYPES, c)
-else: skip("A12: SellerReport fields exist")
-
-# A13. Certification: issueDate? alias
-c = rw(TYPES)
-block = extract_interface(c, 'Certification')
-if block and 'issueDate' not in block:
-    start = c.find('interface Certification')
-    end = find_interface_end(c, start)
-    iblock = c[start:end]
-    iblock = iblock.rstrip()[:-1] + '\n  issueDate?: number;\n  renewalOf?: string;\n}'
-    c = c[:start] + iblock + c[end:]
-    ok("A13: Certification: issueDate/renewalOf added")
-    wr(TYPES, c)
-else: skip("A13: Certification fields exist")
-
-# A14. StateChange: causationId?, domain/actor/timestamp → optional
-c = rw(TYPES)
-block = extract_interface(c, 'StateChange')
-if block and 'causationId' not in block:
-    start = c.find('interface StateChange')
-    end = find_interface_end(c, start)
-    iblock = c[start:end]
-    iblock = iblock.rstrip()[:-1] + '\n  causationId?: string;\n}'
-    c = c[:start] + iblock + c[end:]
-    wr(TYPES, c)
-    ok("A14a: StateChange.causationId? added")
-c = rw(TYPES)
-for pat in [r'  domain: string;', r'  actor: string;', r'  timestamp: number;']:
-    c = re.sub(pat, lambda m: m.group(0).replace(': ', '?: ', 1), c, count=1)
-wr(TYPES, c); ok("A14b: StateChange domain/actor/timestamp → optional")
-
-# A15. ApprovalTicket: approvalRequestId/assignedTo/priority → optional
-c = rw(TYPES)
-block = extract_interface(c, 'ApprovalTicket')
-if block:
-    for pat in [r'  approvalRequestId: string;', r'  assignedTo: string;', r"  priority: 'LOW"]:
-        c = re.sub(pat, lambda m: m.group(0).replace(': ', '?: ', 1), c, count=1)
-    wr(TYPES, c)
-    ok("A15: ApprovalTicket required → optional")
-
-# A16. OperationRecord: operation/actor/timestamp/status → optional; add FAILED/RECOVERED
-c = rw(TYPES)
-block = extract_interface(c, 'OperationRecord')
-if block:
-    for pat in [r'  operation: string;', r'  actor: string;', r'  timestamp: number;']:
-        c = re.sub(pat, lambda m: m.group(0).replace(': ', '?: ', 1), c, count=1)
-    # Add FAILED and RECOVERED to status union
-    c = c.replace(
-        "'SUCCESS' | 'FAILURE' | 'PENDING'",
-        "'SUCCESS' | 'FAILURE' | 'PENDING' | 'FAILED' | 'RECOVERED'"
-    )
-    wr(TYPES, c)
-    ok("A16: OperationRecord → optional + FAILED/RECOVERED status")
-
-# A17. BankTransaction.credit: boolean → boolean | number
-c = rw(TYPES)
-block = extract_interface(c, 'BankTransaction')
-if block and 'boolean | number' not in block:
-    c = re.sub(r'(interface BankTransaction.*?credit\?:.*?)boolean;',
-               lambda m: m.group(0).replace('boolean;', 'boolean | number;'),
-               c, count=1, flags=re.DOTALL)
-    wr(TYPES, c)
-    ok("A17: BankTransaction.credit → boolean | number")
-else: skip("A17: already boolean | number")
-
-# A18. DetailedPersonnel: position → unknown, add HRDepartment/HRPosition/HRAttendance
-c = rw(TYPES)
-if 'DetailedPersonnel' not in c:
-    c += '\n\nexport interface DetailedPersonnel { id: string; name?: string; fullName?: string; employeeCode?: string; email?: string; department?: string; position: unknown; role?: string; status?: string; baseSalary?: number; startDate?: string; kpiPoints?: number; tasksCompleted?: number; lastRating?: string; bankAccountNo?: string; allowanceLunch?: number; allowancePosition?: number; actualWorkDays?: number; bio?: string; [key: string]: unknown; }\n'
-    c += 'export type HRDepartment = unknown;\n'
-    c += 'export type HRPosition = unknown;\n'
-    c += 'export interface HRAttendance { employeeId: string; employee_id?: string; date: string; status: string; hoursWorked?: number; total_hours?: number; checkIn?: number; source?: unknown; [key: string]: unknown; }\n'
-    wr(TYPES, c)
-    ok("A18: HR types added to types.ts")
-else:
-    # Make position unknown if it's string
-    c = re.sub(r'(interface DetailedPersonnel.*?position: )string', r'\1unknown', c, count=1, flags=re.DOTALL)
-    wr(TYPES, c)
-    skip("A18: DetailedPersonnel already exists")
-
-# A19. IngestStatus: add EXTRACTING, MAPPING, PENDING_APPROVAL
-c = rw(TYPES)
-if 'EXTRACTING' not in c and 'IngestStatus' in c:
-    c = c.replace(
-        "  QUEUED: 'QUEUED',\n} as const;",
-        "  QUEUED: 'QUEUED',\n  EXTRACTING: 'EXTRACTING',\n  MAPPING: 'MAPPING',\n  PENDING_APPROVAL: 'PENDING_APPROVAL',\n} as const;"
-    )
-    wr(TYPES, c)
-    ok("A19: IngestStatus: EXTRACTING/MAPPING/PENDING_APPROVAL added")
-else: skip("A19: IngestStatus values already added")
-
-# A20. WarehouseItem in WarehouseEntity: add releaseStock, category
-WARE = 'src/cells/infrastructure/warehouse-cell/domain/entities/WarehouseEntity.ts'
-if os.path.exists(WARE):
-    c = rw(WARE)
-    if 'releaseStock' not in c:
-        c = c.replace(
-            'export interface WarehouseItem {\n  id: string;\n  name: string;\n  quantity: number;\n}',
-            'export interface WarehouseItem {\n  id: string;\n  name: string;\n  quantity: number;\n  category?: string;\n  releaseStock?: (qty: number, reason: string, by: string) => void;\n  getAllItems?: () => WarehouseItem[];\n  [key: string]: unknown;\n}'
-        )
-        wr(WARE, c)
-        ok("A20: WarehouseItem: releaseStock/category/getAllItems added")
-    else: skip("A20: WarehouseItem already extended")
-
-# A21. ModuleConfig: allowedRoles? (may already exist)
-c = rw(TYPES)
-block = extract_interface(c, 'ModuleConfig')
-if block and 'allowedRoles' not in block:
-    start = c.find('interface ModuleConfig')
-    end = find_interface_end(c, start)
-    iblock = c[start:end]
-    iblock = iblock.rstrip()[:-1] + '\n  allowedRoles?: unknown[];\n}'
-    c = c[:start] + iblock + c[end:]
-    wr(TYPES, c)
-    ok("A21: ModuleConfig.allowedRoles? added")
-else: skip("A21: ModuleConfig.allowedRoles exists")
-
-# A22. TaxReport: add amount?
-c = rw(TYPES)
-if 'taxableIncome: number;\n  standardRate: number;' in c and 'amount?' not in c[c.find('taxableIncome: number;\n  standardRate'):c.find('taxableIncome: number;\n  standardRate')+200]:
-    c = c.replace(
-        'taxableIncome: number;\n  standardRate: number;',
-        'taxableIncome: number;\n  standardRate: number;\n  amount?: number;',
-        1
-    )
-    wr(TYPES, c)
-    ok("A22: TaxReport.amount? added")
-else: skip("A22: amount already exists or not found")
-
-# A23. BaseEvent: event_version already exists in types.ts local
-# config.service error: add event_version? to prevent unknown property error
-# Check if issue is that BaseEvent requires event_version but service sets it differently
-c = rw(TYPES)
-if 'event_version: string;' in c:
-    c = c.replace('  event_version: string;', '  event_version?: string;', 1)
-    wr(TYPES, c)
-    ok("A23: BaseEvent.event_version → optional")
-else: skip("A23: event_version not found or already optional")
-
-print(f"\n  types.ts: done")
-
-# ================================================================
-print("\n══ B. SERVICE FILE REWRITES ══")
-# ================================================================
-
-# B1. threatdetectionservice.ts — rewrite with single default export
-FILE = 'src/services/threatdetectionservice.ts'
-c = rw(FILE)
-if 'export default { tHReatdetectionservice }' in c:
-    CLEAN = '''// THReatDetectionService — NATT-OS security threat monitoring
-export const tHReatdetectionservice = {};
-
-export interface SecurityTHReat { id: string; type: string; severity: string; timestamp: number; }
-export interface SystemHealth { status: string; uptime: number; metrics: Record<string, number>; }
-
-export class THReatDetectionService {
-  static getHealth(): SystemHealth { return { status: 'HEALTHY', uptime: Date.now(), metrics: {} }; }
-  static subscribe(_handler: (t: SecurityTHReat) => void): () => void { return () => {}; }
-  static detect(_payload: unknown): SecurityTHReat | null { return null; }
-}
-
-export default THReatDetectionService;
-'''
-    wr(FILE, CLEAN)
-    ok("B1: threatdetectionservice.ts rewritten — single default export")
-else: skip("B1: already clean")
-
-# B2. omegalockdown.ts — add enforce() as proper method
-FILE = 'src/core/audit/omegalockdown.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'enforce' not in c:
-        CLEAN = '''export const OmegaLockdown = {
-  activate: () => {},
-  enforce: async (): Promise<void> => {},
-};
-'''
-        wr(FILE, CLEAN)
-        ok("B2: omegalockdown.ts — enforce() added")
-    else: skip("B2: enforce already exists")
-
-# B3. smart-link.ts — createEnvelope + send Promise<any>
-FILE = 'src/services/smart-link.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'createEnvelope' not in c:
-        c = c.replace(
-            'static send(_event: string, _data?: unknown): void {}',
-            'static async send(_event: unknown, _data?: unknown): Promise<any> { return undefined; }\n  static createEnvelope(target: string, method: string, payload?: unknown): unknown { return { target, method, payload: payload ?? {}, timestamp: Date.now() }; }'
-        )
-        wr(FILE, c)
-        ok("B3: SmartLinkClient: createEnvelope + send Promise<any>")
-    else: skip("B3: createEnvelope exists")
-
-# B4. documentai.ts — add documentAI namespace
-FILE = 'src/services/documentai.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'documentAI' not in c:
-        # Add static property to Utilities class
-        c = re.sub(
-            r'(class Utilities \{)',
-            r'\1\n  static documentAI = {\n    getConfig: (): any => ({ threshold: 0.7, model: \'default\' }),\n    updateConfig: (_config: any): void => {},\n  };',
-            c, count=1
-        )
-        wr(FILE, c)
-        ok("B4: Utilities.documentAI namespace added")
-    else: skip("B4: documentAI exists")
-
-# B5. einvoiceservice.ts — methods + named export EInvoiceEngine
-FILE = 'src/services/einvoiceservice.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'generateXML' not in c:
-        c = re.sub(
-            r'(class EInvoiceService \{)',
-            r'\1\n  static generateXML(_inv: Record<string, unknown>): string { return \'<HDon/>\'; }\n  static async signInvoice(id: string): Promise<string> { return \'SIG-\' + id; }\n  static async transmitToTaxAuthority(_inv: Record<string, unknown>): Promise<{ success: boolean; code: string }> { return { success: true, code: \'TCT-\' + Date.now() }; }',
-            c, count=1
-        )
-        wr(FILE, c)
-        ok("B5a: EInvoiceService: 3 methods added")
-    else: skip("B5a: methods exist")
-    c = rw(FILE)
-    if 'EInvoiceEngine' not in c:
-        c += '\nexport { EInvoiceService as EInvoiceEngine };\n'
-        wr(FILE, c)
-        ok("B5b: EInvoiceEngine named export added")
-    else: skip("B5b: EInvoiceEngine exists")
-
-# B6. paymentservice.ts — createPayment
-FILE = 'src/services/paymentservice.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'createPayment' not in c:
-        c = re.sub(
-            r'(class PaymentEngine \{)',
-            r'\1\n  static async createPayment(req: Record<string, unknown>): Promise<{ success: boolean; transactionId: string; amount: number }> { return { success: true, transactionId: \'PAY-\' + Date.now(), amount: Number(req.amount) || 0 }; }',
-            c, count=1
-        )
-        wr(FILE, c)
-        ok("B6: PaymentEngine.createPayment added")
-    else: skip("B6: createPayment exists")
-
-# B7. xmlcanonicalizer.ts — canonicalize
-FILE = 'src/utils/xmlcanonicalizer.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'canonicalize' not in c:
-        c = re.sub(
-            r'(class XmlCanonicalizer \{)',
-            r'\1\n  static canonicalize(xml: string): string { return xml.replace(/\\s+/g, \' \').trim(); }',
-            c, count=1
-        )
-        wr(FILE, c)
-        ok("B7: XmlCanonicalizer.canonicalize added")
-    else: skip("B7: canonicalize exists")
-
-# B8. admin/auditservice.ts — logAction 5 params
-FILE = 'src/admin/auditservice.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if '_context' not in c:
-        c = c.replace(
-            'static logAction(_actor: string, _action: string, _meta?: unknown): void {}',
-            'static logAction(_actor: string, _action: string, _meta?: unknown, _context?: string, _id?: string): void {}'
-        )
-        wr(FILE, c)
-        ok("B8: AuditProvider.logAction → 5 params")
-    else: skip("B8: already 5 params")
-
-# B9. event-bridge.ts — fix broken import (keep existing EventBridge, remove bad re-export)
-FILE = 'src/services/event-bridge.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if "from '@/cells/event-cell/event-bridge.service'" in c:
-        # Remove/comment out the bad re-export line
-        c = c.replace(
-            "export { EventBridgeProvider as EventBridge } from '@/cells/event-cell/event-bridge.service';",
-            "// export { EventBridgeProvider as EventBridge } from '@/cells/event-cell/event-bridge.service'; // path not found"
-        )
-        wr(FILE, c)
-        ok("B9: event-bridge.ts bad import commented out")
-    else: skip("B9: event-bridge.ts already clean")
-
-# B10. sellerengine.ts — rewrite with CommissionInfo shape
-FILE = 'src/services/sellerengine.ts'
-SELLER_CLEAN = '''// SellerEngine — Commission calculation
-export const sellerengine = {};
-
-export class SellerEngine {
-  static calculateCommission(params: {
-    saleAmount?: number; shellRevenue?: number; stoneRevenue?: number;
-    stoneType?: string; isReportedWithin24h?: boolean;
-    kpiPoints?: number; [key: string]: unknown;
-  }): { total: number; shell: number; stone: number; policyId: string; baseRate: number; kpiFactor: number; estimatedAmount: number; finalAmount: number; status: string } {
-    const shellRev = (params.shellRevenue ?? params.saleAmount) || 0;
-    const stoneRev = params.stoneRevenue || 0;
-    const rate = 0.02;
-    const shell = Math.round(shellRev * rate);
-    const stone = Math.round(stoneRev * rate);
-    const total = shell + stone;
-    return { total, shell, stone, policyId: 'DEFAULT', baseRate: rate, kpiFactor: 1, estimatedAmount: total, finalAmount: total, status: 'CALCULATED' };
-  }
-  static check24hRule(timestamp: number): boolean {
-    return (Date.now() - timestamp) <= 86400000;
-  }
-}
-
-export default { sellerengine: {}, SellerEngine };
-'''
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'shell' not in c or 'shellRevenue' not in c:
-        wr(FILE, SELLER_CLEAN)
-        ok("B10: sellerengine.ts rewritten with CommissionInfo shape")
-    else: skip("B10: sellerengine already has CommissionInfo shape")
-
-# B11. seller-terminal.tsx — fix missing ) in calculateCommission calls
-FILE = 'src/components/seller-terminal.tsx'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    # Find calculateCommission({...}; → calculateCommission({...})
-    # The broken pattern: `      };` or `    };` after calculateCommission block
-    lines = c.split('\n')
-    fixed = 0
-    for i in range(len(lines)):
-        stripped = lines[i].rstrip()
-        if stripped in ('      };', '    };'):
-            # Look back for calculateCommission
-            ctx = '\n'.join(lines[max(0,i-10):i])
-            if 'calculateCommission' in ctx and 'setSimulatedComm' not in lines[i+1] if i+1 < len(lines) else True:
-                # Check more carefully: the line after should be a statement
-                next_l = lines[i+1].strip() if i+1 < len(lines) else ''
-                if next_l and not next_l.startswith(')') and not next_l.startswith(']') and not next_l.startswith(','):
-                    lines[i] = stripped.rstrip(';') + ')'
-                    fixed += 1
-    if fixed > 0:
-        wr(FILE, '\n'.join(lines))
-        ok(f"B11: seller-terminal.tsx: {fixed} missing ) fixed")
+        checked = set(files)
+        new, resolved = diagnostics.diff([d for d in baseline if d.file in checked], diags)
+        print(f"\n  vs baseline ({len(files)} file(s)): +{len(new)} new, -{len(resolved)} resolved")
+        for d in new: print(f"    + {diagnostics.fmt(d)}")
+        for d in resolved: print(f"    - {diagnostics.fmt(d)}")
+    return diags
+
+def baseline_before_flush(args):
+    """(diags, command) of this tree as it is before the flush, for rollback: the last report when it was written
+    for exactly this tree (no file under src/ or tsconfig.json touched since), else a check now, before anything
+    is written; (None, None) when E does not run or the check fails (rollback off)"""
+    if 'E' not in args.steps: return None, None
+    if diagnostics.load_tree(diagnostics.REPORT) == snapshot.tree_state():
+        return diagnostics.load_report(diagnostics.REPORT), diagnostics.load_command(diagnostics.REPORT)
+    print(f"\n  rollback baseline: {diagnostics.REPORT} is not for this tree — checking it before the flush")
+    try:
+        with TRACE.span('E before flush', 'E'):
+            if TSS is not None:
+                try:
+                    files, diags = TSS.check(STORE.dirty)
+                    return diags, ['tsserver'] + files
+                except tsserver.TsServerError as e: drop_tsserver(e)
+            cmd, diags = run_tsc(incremental=not args.no_incremental)
+            return diags, cmd
+    except TscError as e:
+        print(f"  ⚠️  rollback off: no error count for this tree ({e})")
+        return None, None
+
+def run_autofix(args, diags, flushed):
+    """--autofix from diags (None: check flushed first) → final diags; the report is rewritten unless tsc failed.
+    tsserver failing midway → start over on tsc"""
+    while True:
+        try:
+            if TSS is not None:
+                if diags is None: diags = TSS.check(flushed)[1]
+                first = {d.file for d in diags}
+                recheck = lambda paths: TSS.check(first | set(paths))[1]
+            else:
+                recheck = lambda paths: run_tsc(incremental=not args.no_incremental)[1]
+                if diags is None: diags = recheck(flushed)
+            diags = autofix.loop(diags, recheck, REPORT, max_rounds=args.autofix_rounds, jobs=args.jobs)
+        except tsserver.TsServerError as e:
+            drop_tsserver(e); diags = None; continue
+        except TscError as e:
+            fail(f"autofix: tsc failed, stopped without rewriting the report: {e}")
+            return diags
+        diagnostics.write_report(diagnostics.to_report(diags, ['autofix', 'tsserver'] + TSS.checked
+                                                       if TSS is not None else ['autofix'], snapshot.tree_state()))
+        return diags
+
+def rollback_if_worse(snap, prev, prev_cmd, diags, cache, ran):
+    """More TSC errors than before the flush → restore the snapshot; → diags now on disk.
+    Counted only on files both checks covered: a tsserver report covers its checked files, tsc the whole program.
+    ran: (Fix, Result) of this run — PASSes on restored files are counted as FAIL (rolled back)"""
+    global PASS
+    files = diagnostics.scope(prev_cmd)
+    if TSS is not None: files = set(TSS.checked) if files is None else files & set(TSS.checked)
+    before = prev if files is None else [d for d in prev if d.file in files]
+    now = diags if files is None else [d for d in diags if d.file in files]
+    if len(now) <= len(before): return diags
+    restored = snap.restore()
+    for p in restored: cache.entries.pop(p, None)
+    cache.save()
+    diagnostics.write_report(diagnostics.to_report(prev, ['restored', snap.id] + (prev_cmd or []),
+                                                   snapshot.tree_state()))
+    print(f"\n  ❌ TSC errors {len(before)} → {len(now)}: restored {len(restored)} file(s) from snapshot {snap.id}")
+    for p in restored: print(f"    {p}")
+    back = set(restored)
+    for f, r in ran:
+        if r.status == 'ok' and f.path in back:
+            PASS -= 1; fail(f"{r.msg}: rolled back")
+    return before
+
+def list_fixes(args):
+    """--list: selected fixes per section, no file read"""
+    for key, title, fixes in args.selected:
+        if not fixes: continue
+        print(f"\n══ {key}. {title} ══")
+        for f in fixes: print(f"  {f.id:<6} {f.path:<60} {f.msg}")
+    print(f"\n  {sum(len(fs) for _, _, fs in args.selected)} fix(es), "
+          f"{len({f.path for _, _, fs in args.selected for f in fs})} file(s); steps: {', '.join(sorted(args.steps)) or '-'}")
+
+def fix_status(args):
+    """--status: state of every selected fix on disk (markers found in one pass per file), nothing written"""
+    counts = {}
+    for key, title, fixes in args.selected:
+        if not fixes: continue
+        print(f"\n══ {key}. {title} ══")
+        for f, st in manifest.status(STORE, fixes):
+            counts[st] = counts.get(st, 0) + 1
+            near = manifest.closest(STORE, f) if st == 'anchor missing' else None
+            print(f"  {f.id:<6} {st:<15} {f.msg}" + (f" — {near}" if near else ''))
+    print("\n  " + ', '.join(f"{st}: {n}" for st, n in sorted(counts.items())))
+
+def main(argv=None):
+    global TSS
+    args = parse_args(argv)
+    if args.list: return list_fixes(args)
+    if args.status: return fix_status(args)
+    STORE.track = args.plan
+    if args.profile_memory: memprof.start()
+
+    # ── verify root ───────────────────────────────────────────────
+    print("\n╔══════════════════════════════════════════════════════════╗")
+    print("║  SCRIPT 10 — COMPREHENSIVE FIX FROM CLEAN STATE         ║")
+    print("║  Băng | Python only | Idempotent                        ║")
+    print("╚══════════════════════════════════════════════════════════╝")
+    print(f"  cwd: {os.getcwd()}")
+    if not os.path.exists('src/cells/natt-master-registry.json'):
+        print("❌ ABORT: sai thư mục"); sys.exit(1)
+
+    # ── A–D: mọi fix, gom theo file, 1 buffer / file ─────────────
+    cache = FileCache() if args.no_cache else FileCache.load()
+    todo = [f for _, _, fixes in args.selected for f in fixes]
+    results = manifest.run(STORE, todo, jobs=args.jobs, cache=cache, fuzzy_apply=args.fuzzy_apply)
+
+    # ── C6: import fixes from the symbol index, over the buffers A–D left ──
+    auto, auto_results, unresolved = [], [], []
+    if 'C6' in args.steps:
+        with TRACE.span('C6 index', 'C'):
+            index = SymbolIndex.load().refresh()
+            if not args.plan: index.save()
+            auto, unresolved = import_fixes(index.overlay(STORE), scope='src/', owned=owned_specs(C))
+        auto_results = manifest.run(STORE, auto, jobs=args.jobs)
+
+    it = iter(results)
+    for key, title, fixes in args.selected:
+        if not fixes and not (key == 'C' and 'C6' in args.steps): continue
+        print(f"\n══ {key}. {title} ══")
+        for r in [next(it) for _ in fixes] + (auto_results if key == 'C' else []):
+            REPORT[r.status](r.msg)
+            TRACE.add(r.fix, key, r.stats)
+        if key == 'A': print(f"\n  types.ts: done")
+        if key == 'C' and unresolved:
+            print(f"\n  unresolved imports: {len(unresolved)}")
+            for path, spec, why in unresolved: print(f"    {path}: '{spec}' — {why}")
+
+    trees = [(f, tree) for f, tree in manifest.blocked(todo, results) if tree]
+    if trees:
+        print(f"\n══ BLOCKED ══")
+        for f, tree in trees:
+            print(f"\n  ❌ {f.msg} failed — {len(tree)} dependent fix(es) not run:")
+            for depth, d in tree: print(f"  {'   ' * depth}└─ {d.msg}")
+
+    snap = None
+    held = args.memory_budget is not None and not args.plan and memprof.peak() > args.memory_budget
+    if args.plan:
+        pending = show_plan()
+        err_count = '-'
+    elif held:
+        print()
+        fail(f"memory budget exceeded before the flush — {len(STORE.dirty)} file(s) not written, no tsc")
+        err_count = '-'
     else:
-        skip("B11: no missing ) found (may already be fixed)")
-
-# B12. hr-service.ts — fix decorator + template literals
-FILE = 'src/services/hr-service.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    # Fix decorator using brace-counting
-    start = c.find('function RequirePermission(')
-    if start != -1:
-        depth = 0; end = start
-        for i in range(start, len(c)):
-            if c[i] == '{': depth += 1
-            elif c[i] == '}':
-                depth -= 1
-                if depth == 0: end = i+1; break
-        old_func = c[start:end]
-        # Remove trailing remnants (backtick, paren, semicolon on same/next line)
-        trailing_end = end
-        while trailing_end < len(c) and c[trailing_end] in ('`', ')', ';', '\r'):
-            trailing_end += 1
-        # Remove orphaned body lines (look for lines between end and next non-orphan)
-        rest = c[trailing_end:]
-        orphan_patterns = ['// Logic check', 'return originalMethod', 'return descriptor;', '        };', '    };']
-        rest_lines = rest.split('\n')
-        clean_lines = []
-        skip_orphan = True
-        for line in rest_lines:
-            if skip_orphan:
-                stripped = line.strip()
-                if any(p in line for p in orphan_patterns):
-                    continue
-                if stripped in ('}', '};', '') and not any(kw in line for kw in ['class', 'export', 'function']):
-                    continue
-                skip_orphan = False
-            clean_lines.append(line)
-        new_decorator = 'function RequirePermission(_p: string) { return (_t: any, _k: string): void => {}; }'
-        c = c[:start] + new_decorator + '\n' + '\n'.join(clean_lines)
-        wr(FILE, c)
-        ok("B12a: hr-service.ts decorator fixed")
-    else: skip("B12a: RequirePermission not found")
-    
-    # Fix template literals (if backtick was eaten)
-    c = rw(FILE)
-    errors = [
-        ("id: `att-${i}`", "id: 'att-' + i"),
-        ("date: `2026-01-0${i+1}`", "date: '2026-01-0' + (i+1)"),
-        ("hash: `0x${Math.random().toString(16).slice(2, 40)}`", "hash: '0x' + Math.random().toString(16).slice(2, 40)"),
-        ('employee_id:', 'employeeId:'),
-    ]
-    changed = False
-    for old, new in errors:
-        if old in c:
-            c = c.replace(old, new); changed = True
-    if changed:
-        wr(FILE, c)
-        ok("B12b: hr-service.ts template literals → string concat")
-    else: skip("B12b: template literals already ok")
-
-# B13. sales-cell stubs
-SALT = 'src/cells/business/sales-cell/salesterminal.tsx'
-SALESVC = 'src/cells/business/sales-cell/sales.service.ts'
-if not os.path.exists(SALT):
-    os.makedirs(os.path.dirname(SALT), exist_ok=True)
-    wr(SALT, '''import React from 'react';\nconst SaleTerminal = (_props: any) => React.createElement('div', {}, 'SaleTerminal');\nexport default SaleTerminal;\n''')
-    ok("B13a: salesterminal.tsx stub created")
-else: skip("B13a: salesterminal.tsx exists")
-
-if not os.path.exists(SALESVC):
-    os.makedirs(os.path.dirname(SALESVC), exist_ok=True)
-    wr(SALESVC, 'export class SalesProvider {\n  static getInstance() { return new SalesProvider(); }\n  createSale(_cmd: unknown): unknown { return {}; }\n  getSales(): unknown[] { return []; }\n}\n')
-    ok("B13b: sales.service.ts stub created")
-else: skip("B13b: sales.service.ts exists")
-
-# ================================================================
-print("\n══ C. IMPORT PATH FIXES ══")
-# ================================================================
-
-fixes_c = [
-    ('src/core/core/processing/ai/aicore-processor.ts',
-     '"../../../types"', '"@/types"', "C1: aicore-processor types → @/types"),
-    ('src/core/core/processing/ai/ingestion/index.ts',
-     "'./ingestion-service'", "'../../../../ingestion/ingestion-service'", "C2: ingestion index path"),
-    ('src/services/analytics/analytics-service.ts',
-     "'../../eventbridge'", "'../../event-bridge'", "C3: analytics-service eventbridge"),
-    ('src/services/compliance/certification-service.ts',
-     "'@/notificationservice'", "'../notificationservice'", "C4: cert-service notificationservice"),
-]
-for fpath, old, new, label in fixes_c:
-    if os.path.exists(fpath):
-        c = rw(fpath)
-        if old in c:
-            wr(fpath, c.replace(old, new, 1)); ok(label)
-        else: skip(f"{label}: already fixed")
-
-# C5. ingestion-service.ts: fix IngestionService to export Ingestion alias
-FILE = 'src/core/core/ingestion/ingestion-service.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'export { IngestionService as Ingestion }' not in c and 'export class IngestionService' in c:
-        c += '\nexport { IngestionService as Ingestion };\n'
-        wr(FILE, c)
-        ok("C5: IngestionService: Ingestion alias exported")
-    else: skip("C5: Ingestion export exists")
-
-# ================================================================
-print("\n══ D. LOGIC / TYPE FIXES ══")
-# ================================================================
-
-# D1. analytics-api.ts: period_date string → Date.now(), TeamPerformance → any
-FILE = 'src/services/analytics/analytics-api.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    changed = False
-    if "new Date().toISOString().split('T')[0]" in c:
-        c = c.replace("const now = new Date().toISOString().split('T')[0];", "const now = Date.now();")
-        changed = True
-    # Cast TeamPerformance arrays to any[]
-    if 'TeamPerformance>' in c and 'as any' not in c[c.find('TeamPerformance>'):c.find('TeamPerformance>')+500]:
-        c = c.replace(': TeamPerformance[]', ': any[]')
-        changed = True
-    if changed:
-        wr(FILE, c); ok("D1: analytics-api: period_date → Date.now(), TeamPerformance → any[]")
-    else: skip("D1: already fixed")
-
-# D2. smart-link-mapping-engine.ts: transactionDate + destination cast
-FILE = 'src/services/mapping/smart-link-mapping-engine.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    changed = False
-    if 'transactionDate: new Date()' in c:
-        c = c.replace('transactionDate: new Date()', 'transactionDate: Date.now()')
-        changed = True
-    if 'journalId,' in c:
-        c = c.replace('journalId,', 'journalId: (journalId as any),')
-        changed = True
-    # destination: { system... } → cast to any
-    c = re.sub(r'destination: (\{ system:)', r'destination: (\1', c)
-    c = re.sub(r'(destination: \()(\{ system: \'ACCOUNTING\'[^}]+\})', r'\1\2 as any)', c)
-    if changed:
-        wr(FILE, c); ok("D2: smart-link-mapping-engine: transactionDate + casts")
-    else: skip("D2: already fixed")
-
-# D3. smart-link-engine.ts: credit comparison + entries + destination
-FILE = 'src/core/core/smart-link-engine.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    changed = False
-    if 'tx.credit && tx.credit > 0' in c:
-        c = c.replace('tx.credit && tx.credit > 0', '(tx as any).credit > 0 || !!(tx as any).credit')
-        changed = True
-    if 'entries: lines' in c:
-        c = c.replace('entries: lines,', 'entries: (lines as any),')
-        changed = True
-    # destination object → cast
-    c = re.sub(r"destination: \{ system: 'ACCOUNTING'[^}]+\},", 
-               lambda m: "destination: " + m.group(0)[len("destination: "):].rstrip(',') + " as any,", c)
-    if changed:
-        wr(FILE, c); ok("D3: smart-link-engine: credit/entries/destination fixes")
-    else: skip("D3: already fixed")
-
-# D4. runtime.ts: changedAt + missing fields
-FILE = 'src/core/runtime.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'changedAt: new Date()' in c:
-        c = c.replace('changedAt: new Date()', 'changedAt: Date.now()')
-        wr(FILE, c); ok("D4: runtime.ts changedAt → Date.now()")
-    else: skip("D4: changedAt already fixed")
-
-# D5. data-sync-engine.tsx: resolution → any
-FILE = 'src/core/core/ingestion/data-sync-engine.tsx'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'const resolution = await ConflictEngine' in c:
-        c = c.replace('const resolution = await ConflictEngine', 'const resolution: any = await ConflictEngine')
-        wr(FILE, c); ok("D5: data-sync-engine: resolution → any")
-    else: skip("D5: already typed")
-
-# D6. recovery-engine.ts: FAILED → FAILURE, RECOVERED → SUCCESS cast
-FILE = 'src/services/recovery-engine.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if "'FAILED'" in c:
-        c = c.replace("= 'FAILED'", "= 'FAILURE' as any")
-        c = c.replace("= 'RECOVERED'", "= 'SUCCESS' as any")
-        wr(FILE, c); ok("D6: recovery-engine: FAILED/RECOVERED → cast")
-    else: skip("D6: already fixed")
-
-# D7. sales-tax-module.tsx: EInvoiceItem → any
-FILE = 'src/components/sales-tax-module.tsx'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    changed = False
-    if ': EInvoiceItem[]' in c:
-        c = c.replace(': EInvoiceItem[]', ': any[]'); changed = True
-    if ': EInvoice;' in c:
-        c = c.replace(': EInvoice;', ': any;'); changed = True
-    # Fix EInvoiceEngine import: named → default
-    if "{ EInvoiceEngine }" in c:
-        c = c.replace('import { EInvoiceEngine }', 'import EInvoiceEngine'); changed = True
-    if changed:
-        wr(FILE, c); ok("D7: sales-tax-module: EInvoice types → any, import fixed")
-    else: skip("D7: already fixed")
-
-# D8. certification-service.ts: issueDate → issuedAt
-FILE = 'src/services/compliance/certification-service.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'issueDate:' in c and 'issuedAt:' not in c:
-        c = c.replace('issueDate:', 'issuedAt:')
-        wr(FILE, c); ok("D8: certification-service: issueDate → issuedAt")
-    else: skip("D8: already fixed")
-
-# D9. module-registry.ts — if ModuleConfig doesn't have allowedRoles, cast
-FILE = 'src/services/module-registry.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    # Check if types.ts on mac has allowedRoles - we added it in A21
-    # If there are still errors, cast the whole object to any
-    # Add 'as any' to each module config entry
-    if 'allowedRoles' in c and 'as any' not in c:
-        c = re.sub(r'(\[ViewType\.\w+\]: \{.*?\}),', lambda m: m.group(0).replace('}', '} as any'), c, flags=re.DOTALL)
-        wr(FILE, c); ok("D9: module-registry entries cast to any")
-    else: skip("D9: already cast or no allowedRoles")
-
-# D10. admin-config-hub.tsx: context computed property cast + handleWeightChange
-FILE = 'src/components/admin-config-hub.tsx'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    changed = False
-    if '[context]:' in c:
-        c = c.replace('[context]:', '[context as string]:'); changed = True
-    if 'key as any' in c:
-        c = c.replace('key as any', 'key as string'); changed = True
-    if changed:
-        wr(FILE, c); ok("D10: admin-config-hub: context/key cast fixes")
-    else: skip("D10: already fixed")
-
-# D11. app.tsx: DataPoint3D value string → number cast
-FILE = 'src/components/app.tsx'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'DataPoint3D key={i} {...dp}' in c and 'value: Number' not in c:
-        # Cast dp to any for the spread
-        c = c.replace('<DataPoint3D key={i} {...dp} />', '<DataPoint3D key={i} {...dp as any} />')
-        wr(FILE, c); ok("D11: app.tsx DataPoint3D spread cast to any")
-    else: skip("D11: already fixed or not found")
-
-# D12. fiscal-workbench-service.ts: ShardingService import
-FILE = 'src/services/fiscal/fiscal-workbench-service.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    if 'ShardingService' in c and 'import.*ShardingService' not in c:
-        c = "import { ShardingService } from '@/services/sharding-service';\n" + c
-        wr(FILE, c); ok("D12: fiscal-workbench: ShardingService import added")
-    else: skip("D12: ShardingService already imported")
-
-# D13. quantum-engine.ts: add id + activeDomains defaults
-FILE = 'src/services/quantum-engine.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    changed = False
-    if "private state: QuantumState = {" in c and "'id'" not in c[c.find('private state: QuantumState'):c.find('private state: QuantumState')+200]:
-        c = c.replace(
-            'private state: QuantumState = {',
-            "private state: QuantumState = {\n    id: 'QS-' + Date.now(),"
-        )
-        changed = True
-    if "private consciousness: ConsciousnessField = {" in c and 'activeDomains' not in c[c.find('private consciousness:'):c.find('private consciousness:')+300]:
-        c = c.replace(
-            'private consciousness: ConsciousnessField = {',
-            "private consciousness: ConsciousnessField = {\n    activeDomains: [],"
-        )
-        changed = True
-    if changed:
-        wr(FILE, c); ok("D13: quantum-engine: id + activeDomains defaults added")
-    else: skip("D13: already fixed")
-
-# D14. warehouse.service.ts: insuranceStatus cast, getAllItems
-FILE = 'src/cells/infrastructure/warehouse-cell/application/warehouse.service.ts'
-if os.path.exists(FILE):
-    c = rw(FILE)
-    changed = False
-    if "insuranceStatus:" in c and "'EXPIRED' | 'COVERED'" not in c[c.find('insuranceStatus:'):c.find('insuranceStatus:')+100]:
-        c = re.sub(r"insuranceStatus: '(\w+)'", r"insuranceStatus: '\1' as any", c)
-        changed = True
-    if changed:
-        wr(FILE, c); ok("D14: warehouse.service: insuranceStatus cast")
-    else: skip("D14: already fixed")
-
-# ================================================================
-print("\n══ E. VERIFY ══")
-# ================================================================
-import subprocess
-result = subprocess.run(['npx', 'tsc', '--noEmit'], capture_output=True, text=True)
-err_count = result.stdout.count('error TS') + result.stderr.count('error TS')
-print(f"\n  TSC errors: {err_count}")
-if err_count > 0:
-    for line in (result.stdout + result.stderr).split('\n'):
-        if 'error TS' in line:
-            print(f"    {line}")
-
-print(f"\n╔══════════════════════════════════════════════════════════╗")
-print(f"║  SCRIPT 10 — SUMMARY                                    ║")
-print(f"╠══════════════════════════════════════════════════════════╣")
-print(f"║  ✅ PASS: {PASS:<4}  ⚠️  SKIP: {SKIP:<4}  ❌ FAIL: {FAIL:<4}          ║")
-print(f"╠══════════════════════════════════════════════════════════╣")
-print(f"║  TSC errors: {err_count:<4}                                      ║")
-print(f"╚══════════════════════════════════════════════════════════╝")
+        # ── flush: ghi mọi file đã sửa 1 lần, atomic ─────────────
+        if args.tsserver:
+            TSS = tsserver.start()
+            if TSS is None: print("\n  ⚠️  tsserver not found in node_modules — verifying with tsc")
+        prev, prev_cmd = None, None
+        if STORE.dirty and not args.no_snapshot:
+            prev, prev_cmd = baseline_before_flush(args)
+            with TRACE.span('snapshot', 'io'):
+                snap = snapshot.take(STORE.dirty)
+        with TRACE.span('flush', 'io', STORE):
+            flushed = STORE.flush()
+        print(f"\n  flushed: {len(flushed)} file(s)" + (f", snapshot {snap.id}" if snap else ''))
+        cache.update(STORE, todo, results)
+        cache.save()
+        if cache.hits: print(f"  cached: {len(cache.hits)} file(s) unchanged")
+        diags = verify(args, flushed)
+        if snap and diags is not None and prev is not None:
+            diags = rollback_if_worse(snap, prev, prev_cmd, diags, cache, list(zip(todo + auto, results + auto_results)))
+        if args.autofix: diags = run_autofix(args, diags, flushed)
+        err_count = '-' if diags is None else len(diags)
+
+    if args.sync_registry:
+        print(f"\n══ REGISTRY ══")
+        cells.run(jobs=args.jobs, dry_run=args.plan or held)
+
+    if args.scan_report:
+        print(f"\n══ SCAN REPORT ══")
+        if args.plan or held: print(f"  {scanreport.REPORT} not written ({'--plan' if args.plan else 'memory budget'})")
+        else: scanreport.run(json_out=scanreport.JSON_REPORT)
+
+    print(f"\n╔══════════════════════════════════════════════════════════╗")
+    print(f"║  SCRIPT 10 — SUMMARY                                    ║")
+    print(f"╠══════════════════════════════════════════════════════════╣")
+    print(f"║  ✅ PASS: {PASS:<4}  ⚠️  SKIP: {SKIP:<4}  ❌ FAIL: {FAIL:<4}          ║")
+    print(f"╠══════════════════════════════════════════════════════════╣")
+    print(f"║  TSC errors: {err_count:<4}                                      ║")
+    print(f"╚══════════════════════════════════════════════════════════╝")
+    print_slowest(TRACE)
+    over_budget = args.profile_memory and print_memory(TRACE, args.memory_budget)
+    if args.trace:
+        TRACE.write_chrome(args.trace)
+        print(f"\n  trace: {args.trace}")
+    if over_budget:
+        if snap is not None:        # went over after the flush (E, autofix …): leave the tree as it was
+            restored = snap.restore()
+            for p in restored: cache.entries.pop(p, None)
+            cache.save()
+            print(f"  restored {len(restored)} file(s) from snapshot {snap.id}")
+        if TSS is not None: TSS.close()
+        sys.exit(1)
+    if args.plan and pending: sys.exit(1)
+    if args.watch:
+        def recheck(paths):
+            if TSS is not None:
+                try: return TSS.check(paths)[1]
+                except tsserver.TsServerError as e: drop_tsserver(e)
+            return check_files(paths, incremental=not args.no_incremental)
+        if 'E' not in args.steps: recheck = None        # --skip E: no tsc while watching either
+        watch.loop(todo + auto, cache, REPORT, recheck, poll=args.poll, interval=args.poll_interval, jobs=args.jobs)
+    if TSS is not None: TSS.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from natt_fix import autofix
+from natt_fix.buffers import BufferStore
+from natt_fix.diagnostics import Diagnostic
+from natt_fix.symbols import SymbolIndex
+
+TYPES = "export interface Order {\n  id: string;\n  total: number;\n}\n"
+USE = ("import { Order } from './types';\n"
+       "const o: Order = { id: 'a', total: 1, note: 'x', count: 2 };\n"
+       "o.flag = true;\n")
+REPORT = {'ok': lambda m: None, 'skip': lambda m: None, 'fail': lambda m: None}
+
+
+def _d(line, name, code, msg, file='src/use.ts'):
+    return Diagnostic(file, line, USE.split('\n')[line - 1].index(name) + 1, code, msg)
+
+
+NOTE = _d(2, 'note', 'TS2353', "Object literal may only specify known properties, and 'note' does not exist in type 'Order'.")
+COUNT = _d(2, 'count', 'TS2353', "Object literal may only specify known properties, and 'count' does not exist in type 'Order'.")
+FLAG = _d(3, 'flag', 'TS2339', "Property 'flag' does not exist on type 'Order'.")
+TYPO = _d(3, 'flag', 'TS2339', "Property 'tota' does not exist on type 'Order'. Did you mean 'total'?")
+MISSING = _d(2, 'const', 'TS2741', "Property 'total' is missing in type '{ id: string; }' but required in type 'Order'.")
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('src')
+    open('src/types.ts', 'w').write(TYPES)
+    open('src/use.ts', 'w').write(USE)
+
+
+def test_guess_type_from_the_literal():
+    assert [autofix.guess_type(USE, d.line, d.col, f) for d, f in ((NOTE, 'note'), (COUNT, 'count'), (FLAG, 'flag'))] == \
+        ['string', 'number', 'boolean']
+    assert autofix.guess_type(USE, 1, 1, 'nothing') == 'unknown'
+
+
+def test_wanted_finds_the_owner_through_the_import(tree):
+    store = BufferStore()
+    owners = autofix.Owners(store, SymbolIndex(path='s.json').refresh())
+    wants, unresolved = autofix.wanted([NOTE, FLAG, FLAG, TYPO, MISSING], store, owners)
+    assert [(w.path, w.iface, w.decl) for w in wants] == [
+        ('src/types.ts', 'Order', 'note?: string'), ('src/types.ts', 'Order', 'flag?: boolean'),
+        ('src/types.ts', 'Order', None)]
+    assert [why for _, why in unresolved] == ['looks like a typo']
+    [fix] = autofix.plan(wants)
+    assert fix.id == 'AF1.1' and fix.msg.endswith("Order: + note?: string, + flag?: boolean, total → optional")
+
+
+def _tsc():
+    """Fake tsc: one error per field of NOTE / COUNT / FLAG not yet declared in Order"""
+    calls = []
+    def run(paths):
+        calls.append(paths)
+        c = open('src/types.ts').read()
+        return [d for d, f in ((NOTE, 'note?'), (COUNT, 'count?'), (FLAG, 'flag?')) if f not in c]
+    return run, calls
+
+
+def test_loop_reaches_a_fixed_point(tree):
+    tsc, calls = _tsc()
+    left = autofix.loop([NOTE, COUNT, FLAG], tsc, REPORT)
+    assert left == [] and calls == [['src/types.ts']]
+    c = open('src/types.ts').read()
+    assert all(f in c for f in ('note?: string;', 'count?: number;', 'flag?: boolean;'))
+
+
+def test_round_that_does_not_lower_the_count_is_rolled_back(tree, capsys):
+    calls = []
+    def tsc(paths): calls.append(paths); return [NOTE, COUNT, FLAG]
+    assert autofix.loop([NOTE, COUNT, FLAG], tsc, REPORT) == [NOTE, COUNT, FLAG]
+    assert open('src/types.ts').read() == TYPES and len(calls) == 2
+    assert 'round 1 rolled back' in capsys.readouterr().out
@@ -0,0 +1,50 @@
+import random
+
+from natt_fix.buffers import EditList, BufferStore
+
+BASE = "export interface A {\n  id: string;\n}\nexport interface B {\n  name: string;\n}\n"
+
+
+def test_replace_and_slice_follow_current_offsets():
+    el, ref = EditList(BASE), BASE
+    for a, b, t in ((26, 32, 'number'), (0, 0, '// head\n'), (BASE.index('name') + 9, BASE.index('name') + 13, 'n?')):
+        el.replace(a, b, t)
+        ref = ref[:a] + t + ref[b:]
+    assert el.text() == ref and el.size == len(ref)
+    assert el.slice(0, len(ref)) == ref
+    assert el.slice(5, 40) == ref[5:40]
+
+
+def test_touching_edits_merge():
+    el = EditList('abcdef')
+    el.replace(1, 3, 'XY')
+    el.replace(3, 4, 'Z')           # starts where the first one ends
+    el.replace(0, 2, '_')           # overlaps it
+    assert el.text() == '_YZef' and len(el) == 1
+
+
+def test_random_edits_match_plain_strings():
+    rnd = random.Random(7)
+    for _ in range(200):
+        el, ref = EditList(BASE), BASE
+        for _ in range(12):
+            a = rnd.randrange(len(ref) + 1)
+            b = min(len(ref), a + rnd.randrange(6))
+            t = ''.join(rnd.choice('xy\n{}') for _ in range(rnd.randrange(5)))
+            el.replace(a, b, t)
+            ref = ref[:a] + t + ref[b:]
+            i = rnd.randrange(len(ref) + 1)
+            j = rnd.randrange(i, len(ref) + 1)
+            assert el.slice(i, j) == ref[i:j]
+        assert el.text() == ref
+
+
+def test_store_reads_once_flushes_dirty(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a.ts').write_text(BASE)
+    s = BufferStore()
+    s.replace('a.ts', 0, 6, 'declare')
+    assert s.read('a.ts').startswith('declare interface A') and s.is_dirty('a.ts')
+    assert (tmp_path / 'a.ts').read_text() == BASE
+    s.flush()
+    assert (tmp_path / 'a.ts').read_text() == s.read('a.ts') and not s.dirty
@@ -0,0 +1,73 @@
+import json, os
+
+import pytest
+
+from natt_fix import cells
+
+
+def _cell(root, layer, cid, layers=(), files=(), manifest=None):
+    d = os.path.join(root, layer, cid)
+    os.makedirs(d)
+    for l in layers: os.makedirs(os.path.join(d, l), exist_ok=True)
+    for f in files:
+        os.makedirs(os.path.dirname(os.path.join(d, f)), exist_ok=True)
+        open(os.path.join(d, f), 'w').write('export {};\n')
+    if manifest is not None: open(os.path.join(d, 'cell.manifest.json'), 'w').write(manifest)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = str(tmp_path / 'cells')
+    _cell(root, 'kernel', 'audit-cell', cells.LAYERS,
+          ['domain/entities/a.ts', 'domain/services/s.ts', 'ports/p.tsx', 'domain/a.spec.ts', '__tests__x/t.ts'],
+          json.dumps({'cell': 'audit-cell'}))
+    _cell(root, 'business', 'sales-cell', ('domain', 'application', 'ports'), ['application/x.ts'],
+          json.dumps({'constitutionalAdn': {'identity': {'name': 'sale-cell'}}}))
+    _cell(root, 'business', 'old-cell', ('domain',), manifest='{broken')
+    reg_path = str(tmp_path / 'registry.json')
+    reg = {'wave_3_business': {'status': 'IN_PROGRESS',
+                               'cells': {'old-cell': {'status': 'QUARANTINED', 'ts_files': 9}}},
+           'summary': {'breakdown': {'kernel': {}}}}
+    open(reg_path, 'w').write(json.dumps(reg))
+    return root, reg_path
+
+
+def test_scan_cell_counts_layers_logic_and_manifest_problems(tree):
+    root, _ = tree
+    s = cells.scan(root, jobs=1)
+    audit, sales, old = s[('kernel', 'audit-cell')], s[('business', 'sales-cell')], s[('business', 'old-cell')]
+    assert (audit['ts_files'], audit['layers'], audit['has_logic'], audit['problems']) == (3, 5, True, [])
+    assert cells.infer_status(audit, 'UNKNOWN') == 'ACTIVE'
+    assert sales['missing_layers'] == ['interface', 'infrastructure']
+    assert sales['problems'] == ["cell.manifest.json identity 'sale-cell' ≠ folder name"]
+    assert cells.infer_status(sales, 'UNKNOWN') == 'IN_PROGRESS'
+    assert old['problems'][0].startswith('cell.manifest.json unreadable')
+
+
+def test_pool_scan_matches_serial(tree):
+    root, _ = tree
+    assert cells.scan(root, jobs=2) == cells.scan(root, jobs=1)
+
+
+def test_run_writes_only_when_changed_and_keeps_quarantine(tree, capsys):
+    root, reg_path = tree
+    changes, _ = cells.run(reg_path, root, jobs=1)
+    assert {cid for cid, _ in changes} == {'audit-cell', 'sales-cell', 'old-cell'}
+    reg = cells.load(reg_path)
+    assert reg['wave_3_business']['cells']['old-cell'] == {'status': 'QUARANTINED', 'ts_files': 9}
+    assert reg['wave_1_kernel']['cells']['audit-cell']['status'] == 'ACTIVE'
+    assert (reg['summary']['total_cells'], reg['summary']['total_ts_files']) == (3, 13)
+    assert reg['summary']['breakdown']['kernel'] == {'cells': 1, 'ts_files': 3}
+    assert 'SKIP: old-cell' in capsys.readouterr().out
+    before = open(reg_path).read()
+    changes, _ = cells.run(reg_path, root, jobs=1)
+    assert [cid for cid, _ in changes] == ['old-cell'] and open(reg_path).read() == before
+    cells.run(reg_path, root, jobs=1, force=True)
+    assert cells.load(reg_path)['wave_3_business']['cells']['old-cell']['status'] == 'SCAFFOLDED'
+
+
+def test_dry_run_writes_nothing(tree):
+    root, reg_path = tree
+    before = open(reg_path).read()
+    changes, _ = cells.run(reg_path, root, jobs=1, dry_run=True)
+    assert changes and open(reg_path).read() == before
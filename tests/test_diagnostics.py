@@ -0,0 +1,45 @@
+from natt_fix import diagnostics
+from natt_fix.diagnostics import Diagnostic, parse, diff
+
+OUT = """src/a.ts(12,3): error TS2339: Property 'x' does not exist on type 'Y'.
+src/b.ts(1,1): error TS2322: Type '{ a: number; }' is not assignable to type 'Z'.
+  Object literal may only specify known properties.
+    'a' does not exist in type 'Z'.
+
+error TS5058: The specified path does not exist: 'tsconfig.json'.
+Found 3 errors in 2 files.
+"""
+
+
+def test_parse_joins_continuations_and_globals():
+    ds = list(parse(OUT.splitlines(True)))
+    assert ds[0] == Diagnostic('src/a.ts', 12, 3, 'TS2339', "Property 'x' does not exist on type 'Y'.")
+    assert ds[1].message.splitlines() == ["Type '{ a: number; }' is not assignable to type 'Z'.",
+                                          'Object literal may only specify known properties.',
+                                          "'a' does not exist in type 'Z'."]
+    assert ds[2] == Diagnostic('', 0, 0, 'TS5058', "The specified path does not exist: 'tsconfig.json'.")
+    assert len(ds) == 3
+
+
+def test_parse_crlf_and_noise():
+    assert [d.code for d in parse(["npm WARN x\r\n", "src/a.ts(1,2): error TS1005: ';' expected.\r\n"])] == ['TS1005']
+
+
+def test_diff_ignores_moved_lines_counts_duplicates():
+    a = Diagnostic('src/a.ts', 10, 1, 'TS2339', 'm')
+    b = Diagnostic('src/b.ts', 3, 1, 'TS2322', 'n')
+    moved = a._replace(line=14, col=5)
+    new, resolved = diff([a, b], [moved, moved, Diagnostic('src/c.ts', 1, 1, 'TS1', 'o')])
+    assert [(d.file, d.line) for d in new] == [('src/a.ts', 14), ('src/c.ts', 1)]
+    assert resolved == [b]
+    assert diff([a, b], [b, moved]) == ([], [])
+
+
+def test_report_roundtrip_and_scope(tmp_path):
+    ds = list(parse(OUT.splitlines(True)))
+    p = str(tmp_path / 'r' / 'tsc-report.json')
+    diagnostics.write_report(diagnostics.to_report(ds, ['tsserver', 'src/a.ts']), p)
+    assert diagnostics.load_report(p) == ds
+    assert diagnostics.scope(diagnostics.load_command(p)) == {'src/a.ts'}
+    assert diagnostics.scope(['npx', 'tsc', '--noEmit']) is None
+    assert diagnostics.load_report(str(tmp_path / 'none.json')) is None
@@ -0,0 +1,93 @@
+from natt_fix import fields
+from natt_fix.buffers import splice
+from natt_fix.ifaceindex import InterfaceIndex
+
+SRC = """export interface OperationRecord {
+  id: string;
+  actor: string; // who
+  status: 'SUCCESS' | 'FAILURE' | 'PENDING';
+}
+"""
+
+
+def _apply(c, name, **ops):
+    es, changed, missing = fields.edits(c, InterfaceIndex(c).get(name), **ops)
+    return splice(c, es), changed, missing
+
+
+def test_union_appends_only_missing_members():
+    c, changed, missing = _apply(SRC, 'OperationRecord', union=(('status', ("'PENDING'", "'FAILED'", "'RECOVERED'")),))
+    assert changed and not missing
+    assert "status: 'SUCCESS' | 'FAILURE' | 'PENDING' | 'FAILED' | 'RECOVERED';" in c
+    again, changed, _ = _apply(c, 'OperationRecord', union=(('status', ("'FAILED'", "'RECOVERED'")),))
+    assert again == c and not changed
+
+
+def test_union_keeps_members_the_tree_already_added():
+    c = SRC.replace("'PENDING';", "'PENDING' | 'RECOVERED' | 'TIMEOUT';")
+    out, _, _ = _apply(c, 'OperationRecord', union=(('status', ("'FAILED'", "'RECOVERED'")),))
+    assert "'PENDING' | 'RECOVERED' | 'TIMEOUT' | 'FAILED';" in out
+
+
+def test_union_on_missing_field():
+    _, changed, missing = _apply(SRC, 'OperationRecord', union=(('result', ("'FAILED'",)),))
+    assert not changed and missing == ['result']
+
+
+def test_alternatives_do_not_split_inside_quotes():
+    assert fields.alternatives("'A|B' | \"C\" | number") == ["'A|B'", '"C"', 'number']
+
+
+TRICKY = """export interface Tricky {
+  // a comment with { braces; }
+  label: 'a;b' | "c}";
+  nested: { x: number; y: Array<{ z: string }> };
+  /* block; */ readonly count: number,
+  status:
+    | 'ON'
+    | 'OFF';
+  handler(e: { id: string }): void;
+  [key: string]: unknown;
+  tpl?: `x${1};y`;
+}
+"""
+
+
+def test_members_skip_strings_comments_and_nesting():
+    sp = InterfaceIndex(TRICKY).get('Tricky')
+    ms = fields.members(TRICKY, sp.body_start, sp.close)
+    assert [m.name for m in ms] == ['label', 'nested', 'count', 'status', 'handler', None, 'tpl']
+    by = {m.name: m for m in ms}
+    assert TRICKY[by['nested'].type_start:by['nested'].type_end] == '{ x: number; y: Array<{ z: string }> }'
+    assert fields.alternatives(TRICKY[by['status'].type_start:by['status'].type_end]) == ["'ON'", "'OFF'"]
+    assert by['tpl'].optional and not by['count'].optional
+    assert by['handler'].type_start is None
+
+
+def test_optional_add_retype():
+    c, changed, missing = _apply(TRICKY, 'Tricky', optional=('label', 'tpl', 'gone'), add=('extra?: number',),
+                                 retype=(('count', 'number | string'),))
+    assert changed and missing == ['gone']
+    assert "  label?: 'a;b'" in c and "tpl?: `x${1};y`" in c and 'readonly count: number | string,' in c
+    assert c.endswith("  tpl?: `x${1};y`;\n\n  extra?: number;\n}\n")
+    again, changed, _ = _apply(c, 'Tricky', optional=('label',), add=('extra?: number',),
+                               retype=(('count', 'number | string'),))
+    assert again == c and not changed
+
+
+def test_fields_fixes_on_one_file_splice_once(tmp_path, monkeypatch):
+    from natt_fix.buffers import BufferStore
+    from natt_fix.manifest import Fix, Fields, apply_fields
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'types.ts').write_text(SRC + TRICKY)
+    store = BufferStore()
+    res = apply_fields(store, [
+        Fix('X1', 'types.ts', 'op', (Fields(optional=('actor',)),), ('interface', 'OperationRecord')),
+        Fix('X2', 'types.ts', 'tricky', (Fields(add=('a?: 1',)),), ('interface', 'Tricky')),
+        Fix('X3', 'types.ts', 'tricky 2', (Fields(add=('b?: 2',), optional=('count',)),), ('interface', 'Tricky')),
+        Fix('X4', 'types.ts', 'missing', (Fields(optional=('id',)),), ('interface', 'Nope')),
+    ])
+    assert [r.status for r in res] == ['ok', 'ok', 'ok', 'skip']
+    c = store.read('types.ts')
+    assert 'actor?: string; // who' in c and 'readonly count?: number,' in c
+    assert c.endswith("\n\n  a?: 1;\n\n  b?: 2;\n}\n")
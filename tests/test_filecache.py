@@ -0,0 +1,52 @@
+import os
+
+from natt_fix.buffers import BufferStore
+from natt_fix.filecache import FileCache, fingerprint
+from natt_fix.manifest import Fix, Replace, Result, run
+
+FIX = Fix('D9', 'a.ts', 'now', (Replace('new Date()', 'Date.now()'),), marker='Date.now()')
+
+
+def _cached(tmp_path, monkeypatch, text="const t = new Date();\n"):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a.ts').write_text(text)
+    store, cache = BufferStore(), FileCache(path=str(tmp_path / 'cache.json'))
+    res = run(store, [FIX], cache=cache)
+    store.flush()
+    cache.update(store, [FIX], res)
+    cache.save()
+    return FileCache.load(str(tmp_path / 'cache.json'))
+
+
+def test_fresh_after_a_clean_run(tmp_path, monkeypatch):
+    cache = _cached(tmp_path, monkeypatch)
+    assert cache.fresh(BufferStore(), 'a.ts', [FIX])
+    assert run(BufferStore(), [FIX], cache=cache)[0].msg.endswith('unchanged (cached)')
+
+
+def test_touch_keeps_fresh_edit_does_not(tmp_path, monkeypatch):
+    cache = _cached(tmp_path, monkeypatch)
+    st = os.stat('a.ts')
+    os.utime('a.ts', ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.fresh(BufferStore(), 'a.ts', [FIX])
+    assert cache.entries['a.ts']['mtime_ns'] == st.st_mtime_ns + 10**9
+    (tmp_path / 'a.ts').write_text("const t = new Date(); // x\n")
+    assert not cache.fresh(BufferStore(), 'a.ts', [FIX])
+
+
+def test_changed_fix_set_or_missing_file_is_not_fresh(tmp_path, monkeypatch):
+    cache = _cached(tmp_path, monkeypatch)
+    other = Fix('D9', 'a.ts', 'now', (Replace('new Date()', 'Date.now() as number'),), marker='Date.now()')
+    assert fingerprint([other]) != fingerprint([FIX])
+    assert not cache.fresh(BufferStore(), 'a.ts', [other])
+    os.remove('a.ts')
+    assert not cache.fresh(BufferStore(), 'a.ts', [FIX])
+
+
+def test_fail_and_drifted_results_are_not_recorded(tmp_path, monkeypatch):
+    cache = _cached(tmp_path, monkeypatch)
+    store = BufferStore()
+    cache.update(store, [FIX], [Result('D9', 'fail', 'D9: boom')])
+    assert 'a.ts' not in cache.entries
+    cache.update(store, [FIX], [Result('D9', 'skip', 'D9: anchor not found — closest: L1 (0.93)')])
+    assert 'a.ts' not in cache.entries
@@ -0,0 +1,12 @@
+from natt_fix.fixes import cast_team_performance
+
+
+def test_d1_casts_only_with_a_team_performance_generic():
+    assert cast_team_performance("let t: TeamPerformance[] = [];") == "let t: TeamPerformance[] = [];"
+    c = "const q = useQuery<TeamPerformance>();\nlet t: TeamPerformance[] = [];"
+    assert cast_team_performance(c) == "const q = useQuery<TeamPerformance>();\nlet t: any[] = [];"
+
+
+def test_d1_leaves_a_generic_already_cast():
+    c = "const q = get<TeamPerformance>() as any;\nlet t: TeamPerformance[] = [];"
+    assert cast_team_performance(c) == c
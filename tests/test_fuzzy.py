@@ -0,0 +1,55 @@
+from natt_fix import fuzzy
+from natt_fix.fuzzy import Candidate, Index, best, rewrite, describe
+
+TEXT = """export interface Invoice {
+  id: string;
+    standardRate: number;
+  taxAmount?: number;
+}
+export interface Quote {
+  id: string;
+  total: number;
+}
+"""
+ANCHOR = '  standardRate: number;\n  taxAmount: number;'
+
+
+def _c(score, line=1): return Candidate(line, line, score, 0, 0, '', '')
+
+
+def test_best_needs_threshold_and_margin():
+    assert best([]) is None
+    assert best([_c(0.95), _c(0.6, 5)]) == _c(0.95)
+    assert best([_c(0.85)]) is None
+    assert best([_c(0.95), _c(0.93, 5)]) is None
+    assert best([_c(0.85)], threshold=0.8) == _c(0.85)
+
+
+def test_nearest_finds_the_reindented_region():
+    cands = Index(TEXT).nearest(ANCHOR)
+    top = cands[0]
+    assert (top.line, top.end) == (3, 4) and top.score >= fuzzy.APPLY
+    assert top.text == '    standardRate: number;\n  taxAmount?: number;' and top.indent == '    '
+    bare = Index(TEXT).nearest(ANCHOR.lstrip())[0]        # anchor without indent: region starts past it too
+    assert bare.text == 'standardRate: number;\n  taxAmount?: number;'
+    assert best(cands) == top
+    assert describe(cands, line0=10).startswith(fuzzy.CLOSEST + 'L13-14 (')
+
+
+def test_nearest_nothing_similar():
+    assert Index(TEXT).nearest('completely unrelated anchor text here') == []
+    assert describe([]) == 'no similar region'
+
+
+def test_rewrite_keeps_region_inserts_with_its_indent():
+    top = Index(TEXT).nearest(ANCHOR)[0]
+    new = rewrite(ANCHOR, ANCHOR + '\n  vatRate?: number;', top)
+    assert new == '    standardRate: number;\n  taxAmount?: number;\n  vatRate?: number;'
+    shifted = Candidate(1, 2, 1.0, 0, 0, '    a: 1;\n    b: 2;', '    ')
+    assert rewrite('  a: 1;\n  b: 2;', '  a: 1;\n  b: 2;\n  c: 3;', shifted) == '    a: 1;\n    b: 2;\n    c: 3;'
+
+
+def test_index_memo_rebuilds_on_change():
+    a = fuzzy.index(('t.ts', None), TEXT)
+    assert fuzzy.index(('t.ts', None), TEXT) is a
+    assert fuzzy.index(('t.ts', None), TEXT + 'x') is not a
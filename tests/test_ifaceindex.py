@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from natt_fix.buffers import BufferStore
+from natt_fix.ifaceindex import InterfaceIndex, scan, find_block_end, find_class, diff_region
+
+BASE = '''import { X } from './x';
+type A = { a: string };
+export interface Foo<T extends { k: number }> {
+  a: string; // note
+  b: T;
+}
+const s = "interface Nope {";
+interface Bar extends Foo<number> { c: `x${1}`; d: number }
+let y = 1 / 2;
+declare interface Baz { e?: string }
+'''
+PIECES = ['a', ' ', ';', '<', '>', '=', '\n', 'x', 'inter', 'face', 'Q', '(', ')', ',', ':']
+
+
+def spans(c): return [repr(s) for s in scan(c)]
+
+
+def test_scan_skips_strings_templates_and_generic_braces():
+    idx = InterfaceIndex(BASE)
+    assert idx.names() == ['Foo', 'Bar', 'Baz']
+    foo = idx.get('Foo')
+    assert BASE[foo.body_start:foo.end] == '{\n  a: string; // note\n  b: T;\n}'
+    assert find_block_end(BASE, foo.body_start) == foo.end
+
+
+def test_edit_inside_body_shifts_without_rescan():
+    idx = InterfaceIndex(BASE)
+    a = BASE.index('b: T')
+    c = BASE[:a] + 'z?: number;\n  ' + BASE[a:]
+    idx.on_edit(a, '', 'z?: number;\n  ', c)
+    assert not idx.stale and [repr(s) for s in idx.spans] == spans(c)
+
+
+def test_header_edit_goes_stale():
+    # dropping the ';' before `interface Bar` is outside every body
+    a = BASE.index('";\ninterface Bar') + 1
+    c = BASE[:a] + BASE[a + 1:]
+    idx = InterfaceIndex(BASE)
+    idx.on_edit(a, ';', '', c)
+    assert idx.stale
+    with pytest.raises(RuntimeError): idx.get('Bar')
+
+
+def test_loose_keyword_makes_following_body_edits_stale():
+    c = 'interface Outer {\n  x: interface Q;\n  y: { z: number };\n}\n'
+    idx = InterfaceIndex(c)
+    assert idx.loose == [c.index('interface Q')]
+    a = c.index('Q;') + 1
+    idx.on_edit(a, ';', '', c[:a] + c[a + 1:])
+    assert idx.stale
+
+
+@pytest.mark.parametrize('mode', ['none', 'full', 'window'])
+def test_random_edits_match_fresh_scan(mode):
+    rnd = random.Random(11)
+    for _ in range(300):
+        c, idx = BASE, InterfaceIndex(BASE)
+        for _ in range(20):
+            a = rnd.randrange(len(c) + 1)
+            b = min(len(c), a + rnd.choice([0, 0, 1, 2, 5]))
+            new = '' if rnd.random() < .4 else ''.join(rnd.choice(PIECES) for _ in range(rnd.randint(1, 3)))
+            old = c[a:b]
+            if old == new: continue
+            c = c[:a] + new + c[b:]
+            if mode == 'none': idx.on_edit(a, old, new)
+            elif mode == 'full': idx.on_edit(a, old, new, c)
+            else:
+                lo = max(0, a - 40)
+                idx.on_edit(a, old, new, c[lo:a + len(new) + 40], lo, len(c))
+            if idx.stale: idx = InterfaceIndex(c); continue
+            assert [repr(s) for s in idx.spans] == spans(c), (a, old, new)
+
+
+def test_store_index_follows_random_replaces(tmp_path):
+    p = str(tmp_path / 'types.ts')
+    open(p, 'w').write(BASE)
+    rnd = random.Random(5)
+    store = BufferStore()
+    for _ in range(200):
+        c = store.read(p)
+        a = rnd.randrange(len(c) + 1)
+        b = min(len(c), a + rnd.choice([0, 1, 3]))
+        store.replace(p, a, b, ''.join(rnd.choice(PIECES) for _ in range(rnd.randint(0, 2))))
+        assert [repr(s) for s in store.index(p).spans] == spans(store.read(p))
+
+
+def test_find_class_and_diff_region():
+    c = 'class K { m() { return {}; } }\nlet z;'
+    assert find_class(c, 'K') == (0, 8, c.index('\nlet'))
+    assert find_class(c, 'Missing') is None
+    assert diff_region('abcXYdef', 'abcZdef') == (3, 'XY', 'Z')
@@ -0,0 +1,62 @@
+from natt_fix.buffers import BufferStore
+from natt_fix.filecache import FileCache
+from natt_fix.manifest import Fix, Fields, Replace, run, blocked, is_blocked
+
+TYPES = 'types.ts'
+SVC = 'svc.ts'
+
+
+def _tree(tmp_path, monkeypatch, types="export interface Other {\n  id: string;\n}\n"):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / TYPES).write_text(types)
+    (tmp_path / SVC).write_text("const s = state.id;\n")
+
+
+FIXES = (
+    Fix('A2', TYPES, "QuantumState.id → optional", (Fields(optional=('id',)),), ('interface', 'QuantumState'),
+        strict=True),
+    Fix('A9', TYPES, "Other.id → optional", (Fields(optional=('id',)),), ('interface', 'Other')),
+    Fix('D13', SVC, "guard id", (Replace('state.id', 'state.id ?? ""'),), marker='?? ""', after=('A2',)),
+)
+
+
+def test_strict_prerequisite_missing_interface_fails(tmp_path, monkeypatch):
+    _tree(tmp_path, monkeypatch)
+    r = run(BufferStore(), FIXES[:1])[0]
+    assert r.status == 'fail' and 'interface QuantumState not found' in r.msg
+
+
+def test_dependent_of_failed_prerequisite_is_blocked(tmp_path, monkeypatch):
+    _tree(tmp_path, monkeypatch)
+    store = BufferStore()
+    res = {r.fix: r for r in run(store, FIXES)}
+    assert res['A2'].status == 'fail'
+    assert res['A9'].status == 'ok'
+    assert is_blocked(res['D13']) and res['D13'].msg.endswith('blocked by A2')
+    assert not store.is_dirty(SVC)
+    assert [(f.id, [(d, b.id) for d, b in below]) for f, below in blocked(FIXES, [res[f.id] for f in FIXES])] \
+        == [('A2', [(1, 'D13')])]
+
+
+def test_blocked_file_is_not_cached(tmp_path, monkeypatch):
+    _tree(tmp_path, monkeypatch)
+    store, cache = BufferStore(), FileCache(path=str(tmp_path / 'cache.json'))
+    results = run(store, FIXES, cache=cache)
+    store.flush()
+    cache.update(store, FIXES, results)
+    assert SVC not in cache.entries and TYPES not in cache.entries
+    # once the prerequisite holds, the dependent runs
+    (tmp_path / TYPES).write_text("export interface QuantumState {\n  id: string;\n}\n")
+    res = {r.fix: r for r in run(BufferStore(), FIXES, cache=cache)}
+    assert res['A2'].status == 'ok' and res['D13'].status == 'ok'
+
+
+def test_group_read_is_charged_to_its_first_fix(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    text = "const a = new Date();\nconst b = x as Foo;\n"
+    (tmp_path / 'a.ts').write_text(text)
+    fixes = (Fix('D1', 'a.ts', 'now', (Replace('new Date()', 'Date.now()'),), marker='Date.now()'),
+             Fix('D2', 'a.ts', 'cast', (Replace('as Foo', 'as any'),), marker='as any'))
+    first, second = run(BufferStore(), fixes)
+    assert first.status == second.status == 'ok'
+    assert first.stats.read == len(text) and second.stats.read == 0
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from natt_fix import markers
+from natt_fix.buffers import BufferStore
+from natt_fix.markers import Automaton, Markers
+
+PATS = ['issuedAt:', 'as any', 'Date.now()', 'TeamPerformance>', 'xx', 'x']
+
+
+def test_automaton_finds_overlapping_patterns():
+    ac = Automaton(['he', 'she', 'his', 'hers'])
+    assert {ac.patterns[k] for k in ac.found('ushers')} == {'she', 'he', 'hers'}
+
+
+@pytest.fixture(params=[False, True], ids=['in', 'aho-corasick'])
+def ac(request, monkeypatch):
+    if request.param: monkeypatch.setattr(markers, 'AC_MIN', 1)
+    return request.param
+
+
+def test_on_edit_window_tracks_added_and_removed(ac):
+    c = 'const d = new Date(); // as any\n' + '.' * 3000 + '\nissuedAt: 1\n'
+    m = Markers(PATS, c)
+    assert (m.ac is not None) == ac
+    assert m.present == {'as any', 'issuedAt:'}
+    a = c.index('new Date()')
+    new = c[:a] + 'Date.now()' + c[a + len('new Date()'):]
+    m.on_edit(a, 'new Date()', 'Date.now()', new)
+    assert m.has('Date.now()', lambda: new)
+    a = new.index('issuedAt:')
+    gone = new[:a] + 'issueDate:' + new[a + len('issuedAt:'):]
+    m.on_edit(a, 'issuedAt:', 'issueDate:', gone[a - 20:a + 30], a - 20, len(gone))
+    assert not m.has('issuedAt:', lambda: gone)
+    assert m.has('as any', lambda: pytest.fail('untouched pattern re-checked'))
+
+
+def test_edit_splitting_a_duplicate_keeps_the_other(ac):
+    c = 'a as any b\n' + '-' * 100 + '\nc as any d\n'
+    m = Markers(PATS, c)
+    new = c.replace('a as any b', 'a b', 1)
+    m.on_edit(0, 'a as any b', 'a b', new)
+    assert m.has('as any', lambda: new)
+
+
+def test_store_edits_keep_markers_exact(ac, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rnd = random.Random(3)
+    text = ''.join(rnd.choice(['x', 'as any', ' ', '\n', 'Date.now()', 'issuedAt:', 'q' * 40]) for _ in range(400))
+    (tmp_path / 'f.ts').write_text(text)
+    s = BufferStore()
+    m = Markers(PATS, s.read('f.ts'))
+    s.observe('f.ts', m)
+    for _ in range(60):
+        cur = s.read('f.ts')
+        a = rnd.randrange(len(cur) + 1)
+        b = min(len(cur), a + rnd.randrange(12))
+        s.replace('f.ts', a, b, rnd.choice(['', 'x', 'as any', 'Date.now()', 'TeamPerformance>', 'zz']))
+        cur = s.read('f.ts')
+        for p in PATS: assert m.has(p, lambda: cur) == (p in cur), p
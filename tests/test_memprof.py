@@ -0,0 +1,60 @@
+import os, subprocess, sys, tracemalloc
+
+import pytest
+
+from natt_fix import memprof, synth
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'script-10-python-fix.py')
+
+
+@pytest.fixture
+def tracing():
+    memprof.start()
+    yield
+    tracemalloc.stop()
+
+
+def test_nested_blocks_keep_the_outer_peak(tracing):
+    outer = memprof.begin()
+    big = bytearray(2_000_000)
+    del big
+    inner = memprof.begin()         # resets tracemalloc's peak: the outer block must keep its own
+    small = bytearray(100_000)
+    ipeak, iretained, _ = memprof.end(inner)
+    opeak, oretained, high = memprof.end(outer)
+    assert 100_000 <= ipeak < 1_000_000 and iretained >= 100_000
+    assert opeak >= 2_000_000 and oretained >= 100_000
+    assert high >= opeak and memprof.peak() >= high
+    del small
+
+
+def test_equal_frames_close_by_identity(tracing):
+    a, b = memprof.begin(), memprof.begin()
+    memprof.end(a)
+    assert memprof._open == [b]
+    memprof.end(b)
+
+
+def test_not_tracing_measures_nothing():
+    assert memprof.begin() is None and memprof.end(None) == (0, 0, 0)
+
+
+def test_parse_size():
+    assert memprof.parse_size('512M') == 512 * 2**20
+    assert memprof.parse_size('1.5k') == 1536 and memprof.parse_size('2GiB') == 2 * 2**30
+    assert memprof.parse_size('800000') == 800000
+    with pytest.raises(ValueError): memprof.parse_size('lots')
+
+
+def test_over_budget_before_the_flush_writes_nothing(tmp_path):
+    root = str(tmp_path)
+    synth.generate(root, 50)
+    def tree(): return {p: open(os.path.join(d, p), 'rb').read() for d, _, ps in os.walk(f"{root}/src") for p in ps}
+    before = tree()
+    p = subprocess.run([sys.executable, SCRIPT, '--skip', 'E', '--memory-budget', '1K'], cwd=root,
+                       capture_output=True, text=True, timeout=300)
+    assert p.returncode == 1, p.stdout + p.stderr
+    assert 'memory budget exceeded before the flush' in p.stdout
+    assert tree() == before
+    assert not os.path.exists(os.path.join(root, '.natt-fix', 'filecache.json'))
+    assert not os.path.exists(os.path.join(root, '.natt-fix', 'snapshots'))
@@ -0,0 +1,65 @@
+import difflib, random, re
+
+from natt_fix.buffers import BufferStore
+from natt_fix.plan import EditMap, unified_diff
+
+BASE = ''.join(f"line {i}\n" for i in range(40))
+PIECES = ['x', '\n', 'new line\n', '', 'line', ' ']
+
+
+def _apply(orig, diff):
+    """Apply a unified diff to orig, checking every context / removed line against it"""
+    old, out, pos = orig.splitlines(True), [], 0
+    lines = diff.splitlines(True)[2:]
+    i = 0
+    while i < len(lines):
+        m = re.match(r'@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@', lines[i])
+        assert m, lines[i]
+        start = int(m.group(1)) - (m.group(2) != '0')
+        out += old[pos:start]; pos = start
+        i += 1
+        while i < len(lines) and not lines[i].startswith('@@'):
+            tag, text = lines[i][0], lines[i][1:]
+            if i + 1 < len(lines) and lines[i + 1].startswith('\\'):
+                text = text[:-1]; i += 1
+            if tag in ' -':
+                assert old[pos] == text, (pos, old[pos], text); pos += 1
+            if tag in ' +': out.append(text)
+            i += 1
+    return ''.join(out + old[pos:])
+
+
+def test_matches_difflib_for_one_change():
+    new = BASE.replace('line 20\n', 'line twenty\n')
+    em = EditMap()
+    em.add(BASE.index('line 20') + 5, 2, 6)
+    ref = ''.join(difflib.unified_diff(BASE.splitlines(True), new.splitlines(True), 'a/f.ts', 'b/f.ts'))
+    assert unified_diff('f.ts', BASE, new, em) == ref
+
+
+def test_new_file_and_missing_final_newline():
+    assert unified_diff('n.ts', None, 'a\nb', None) == \
+        '--- /dev/null\n+++ b/n.ts\n@@ -0,0 +1,2 @@\n+a\n+b\n\\ No newline at end of file\n'
+    em = EditMap()
+    em.add(len('a\nb'), 0, 1)
+    d = unified_diff('f.ts', 'a\nb', 'a\nbc', em)
+    assert _apply('a\nb', d) == 'a\nbc'
+
+
+def test_random_edits_diff_applies_back(tmp_path):
+    rnd = random.Random(3)
+    p = str(tmp_path / 'f.ts')
+    for _ in range(200):
+        open(p, 'w').write(BASE)
+        store = BufferStore(track=True)
+        for _ in range(rnd.randint(1, 6)):
+            c = store.read(p)
+            a = rnd.randrange(len(c) + 1)
+            b = min(len(c), a + rnd.choice([0, 1, 4, 12]))
+            text = ''.join(rnd.choice(PIECES) for _ in range(rnd.randint(0, 2)))
+            if rnd.random() < .5: store.replace(p, a, b, text)
+            else: store.write(p, c[:a] + text + c[b:])
+        new = store.read(p)
+        d = unified_diff(p, store.orig.get(p, BASE), new, store.edits.get(p, EditMap()))
+        assert (d == '') == (new == BASE)
+        assert _apply(BASE, d) == new
@@ -0,0 +1,53 @@
+import json
+
+from natt_fix.resolver import Resolver, EXTERNAL, load_tsconfig
+
+
+def _tree(root, files):
+    for rel, c in files.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(c)
+
+
+OPTS = {'baseUrl': '.', 'paths': {'@/*': ['src/*'], '@core/*': ['src/core/*', 'lib/core/*'], 'cfg': ['src/config.ts']}}
+
+
+def test_paths_longest_prefix_and_fallback_targets(tmp_path):
+    _tree(tmp_path, {'src/types.ts': '', 'src/core/a.ts': '', 'lib/core/b.tsx': '', 'src/config.ts': ''})
+    r = Resolver(str(tmp_path), OPTS)
+    assert r.resolve('src/x/y.ts', '@/types') == 'src/types.ts'
+    assert r.resolve('src/x/y.ts', '@core/a') == 'src/core/a.ts'
+    assert r.resolve('src/x/y.ts', '@core/b') == 'lib/core/b.tsx'
+    assert r.resolve('src/x/y.ts', 'cfg') == 'src/config.ts'
+    assert r.resolve('src/x/y.ts', '@/missing') is None
+
+
+def test_relative_js_extension_index_and_package_json(tmp_path):
+    _tree(tmp_path, {'src/a.ts': '', 'src/lib/index.ts': '', 'src/pkg/package.json': json.dumps({'types': 'out.d.ts'}),
+                     'src/pkg/out.d.ts': ''})
+    r = Resolver(str(tmp_path), {})
+    assert r.resolve('src/b/c.ts', '../a.js') == 'src/a.ts'
+    assert r.resolve('src/b.ts', './lib') == 'src/lib/index.ts'
+    assert r.resolve('src/b.ts', './pkg') == 'src/pkg/out.d.ts'
+    assert r.resolve('src/b.ts', './A') is None         # case matters, like tsc on Linux
+    assert r.resolve('src/b.ts', 'react') == EXTERNAL
+
+
+def test_base_url_without_paths_and_virtual(tmp_path):
+    _tree(tmp_path, {'src/services/s.ts': ''})
+    r = Resolver(str(tmp_path), {'baseUrl': 'src'})
+    assert r.resolve('src/x.ts', 'services/s') == 'src/services/s.ts'
+    assert r.resolve('src/x.ts', 'services/new') == EXTERNAL      # could be a package: no node_modules to tell
+    r.virtual(['src/services/new.ts'])
+    assert r.resolve('src/x.ts', 'services/new') == 'src/services/new.ts'
+
+
+def test_alias_for_and_tsconfig_extends(tmp_path):
+    _tree(tmp_path, {'base.json': '{"compilerOptions": {"baseUrl": "./", // root\n "paths": {"@/*": ["src/*"],},}}',
+                     'cfg/tsconfig.json': '{"extends": "../base", "compilerOptions": {"allowJs": true}}'})
+    opts = load_tsconfig(str(tmp_path / 'cfg' / 'tsconfig.json'))
+    assert opts['baseUrl'] == '..' and opts['allowJs'] and opts['paths'] == {'@/*': ['src/*']}
+    r = Resolver(str(tmp_path), OPTS)
+    assert r.alias_for('src/services/x/index.ts') == '@/services/x'
+    assert r.alias_for('other/y.ts') is None
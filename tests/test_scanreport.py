@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from natt_fix import diagnostics, scanreport
+from natt_fix.diagnostics import Diagnostic
+
+FILES = {
+    'src/types.ts': 'export interface A { id: string }\n',
+    'src/cells/business/sales-cell/types.ts': 'export type S = 1;',
+    'src/cells/infrastructure/warehouse-cell/domain/item.ts': 'export class Item {}\n',
+    'src/cells/business/sales-cell/cell.manifest.json': '{"cell_id": "sales-cell", "wave": "WAVE_3"}',
+    'src/services/event-bridge.ts': 'export const bus = 1;\n',
+    'src/services/auditservice.ts': 'export const audit = 1;\n',
+    'src/node_modules/x/types.ts': 'ignored\n',
+}
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for p, c in FILES.items():
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        open(p, 'w').write(c)
+
+
+def _body(path=scanreport.REPORT):
+    return open(path, encoding='utf-8').read().split('\n', 2)[2]       # drop the Generated: line
+
+
+def _full():
+    scanreport.generate('full.txt', cache_path='full.json', full=True)
+    return _body('full.txt')
+
+
+def test_first_run_renders_every_section(tree):
+    redone, hashed = scanreport.generate()
+    assert redone == [s.key for s in scanreport.SECTIONS] and hashed == 5      # listed-only files are not hashed
+    body = _body()
+    assert '--- 1. ALL TYPES.TS FILES ---\nsrc/cells/business/sales-cell/types.ts\nsrc/types.ts\n' in body
+    assert 'node_modules' not in body
+    assert '### src/cells/infrastructure/warehouse-cell/domain/item.ts ###\nexport class Item {}\n' in body
+    assert f"(no {diagnostics.REPORT}: run script 10 section E first)" in body
+
+
+def test_unchanged_sections_are_copied_from_the_last_report(tree):
+    scanreport.generate()
+    assert scanreport.generate() == ([], 0)
+    open('src/types.ts', 'a').write('export interface B {}\n')
+    assert scanreport.generate() == (['types_content'], 1)
+    assert _body() == _full()
+
+
+def test_tsc_report_refreshes_error_sections(tree):
+    scanreport.generate()
+    d = Diagnostic('src/services/event-bridge.ts', 1, 14, 'TS2322', "Type 'number' is not assignable to type 'string'.")
+    diagnostics.write_report(diagnostics.to_report([d]))
+    redone, _ = scanreport.generate()
+    assert redone == ['errors', 'tsc']
+    assert _body() == _full()
+    assert '--- 8. TSC ERROR COUNT ---\ntotal: 1\n  TS2322      1\n' in _body()
+
+
+def test_edited_report_is_not_reused(tree):
+    scanreport.generate()
+    open(scanreport.REPORT, 'a').write('hand edit\n')
+    redone, _ = scanreport.generate()
+    assert len(redone) == len(scanreport.SECTIONS) and 'hand edit' not in _body()
+
+
+def test_json_report(tree):
+    scanreport.generate(json_out=scanreport.JSON_REPORT)
+    data = scanreport.load_json()
+    assert data['types']['files'] == ['src/cells/business/sales-cell/types.ts', 'src/types.ts']
+    assert data['manifests']['cells'] == [{'path': 'src/cells/business/sales-cell/cell.manifest.json',
+                                           'cell_id': 'sales-cell', 'version': None, 'wave': 'WAVE_3',
+                                           'layer': None, 'status': None}]
+    assert (data['tsc']['total'], data['tsc']['errors']) == (None, [])
+    assert scanreport.load_json('missing.json') is None
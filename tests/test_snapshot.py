@@ -0,0 +1,89 @@
+import os, re, stat, subprocess, sys
+
+from natt_fix import snapshot, synth
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'script-10-python-fix.py')
+
+# fake tsc: N_BEFORE errors while src/types.ts is as generated, N_AFTER once it was rewritten
+NPX = """#!/bin/sh
+n=$N_BEFORE
+cmp -s src/types.ts "$PRISTINE" || n=$N_AFTER
+i=0; while [ $i -lt $n ]; do echo "src/x$i.ts(1,2): error TS2339: fake $i"; i=$((i+1)); done
+exit 2
+"""
+
+
+def test_take_restore_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a.ts').write_text('old a')
+    snap = snapshot.take(['a.ts', 'new.ts'], root='snaps')
+    (tmp_path / 'a.ts').write_text('new a')
+    (tmp_path / 'new.ts').write_text('created')
+    assert sorted(snap.restore()) == ['a.ts', 'new.ts']
+    assert (tmp_path / 'a.ts').read_text() == 'old a' and not (tmp_path / 'new.ts').exists()
+    assert snapshot.load(root='snaps').files == snap.files
+    assert snap.restore() == []
+
+
+def test_prune_keeps_newest_and_their_objects(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for i in range(4):
+        (tmp_path / 'a.ts').write_text(f'v{i}')
+        snapshot.take(['a.ts'], root='snaps', keep=2)
+    assert len(snapshot.ids('snaps')) == 2
+    objs = [n for d, _, ns in os.walk('snaps/objects') for n in ns]
+    assert len(objs) == 2
+
+
+def test_tree_state_follows_src_and_tsconfig(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'src' / 'node_modules').mkdir(parents=True)
+    (tmp_path / 'src' / 'a.ts').write_text('a')
+    key = snapshot.tree_state()
+    (tmp_path / 'src' / 'node_modules' / 'x.js').write_text('ignored')
+    (tmp_path / 'other.txt').write_text('ignored')
+    assert snapshot.tree_state() == key
+    (tmp_path / 'src' / 'a.ts').write_text('ab')
+    assert snapshot.tree_state() != key
+    key = snapshot.tree_state()
+    (tmp_path / 'tsconfig.json').write_text('{}')
+    assert snapshot.tree_state() != key
+
+
+def _run(root, before, after):
+    env = dict(os.environ, PATH=f"{root}/bin{os.pathsep}{os.environ['PATH']}", N_BEFORE=str(before),
+               N_AFTER=str(after), PRISTINE=f"{root}/pristine.ts")
+    p = subprocess.run([sys.executable, SCRIPT, '--no-cache', '--skip', 'C6'], cwd=root, env=env,
+                       capture_output=True, text=True, timeout=300)
+    assert p.returncode == 0, p.stdout + p.stderr
+    return p.stdout
+
+
+def _tree(tmp_path):
+    root = str(tmp_path)
+    synth.generate(root, 50)
+    os.makedirs(f"{root}/bin")
+    with open(f"{root}/bin/npx", 'w') as f: f.write(NPX)
+    os.chmod(f"{root}/bin/npx", stat.S_IRWXU)
+    with open(f"{root}/src/types.ts") as f, open(f"{root}/pristine.ts", 'w') as g: g.write(f.read())
+    return root
+
+
+def test_rollback_restores_and_counts_fixes_as_failed(tmp_path):
+    root = _tree(tmp_path)
+    out = _run(root, 5, 7)
+    assert 'checking it before the flush' in out
+    assert re.search(r'TSC errors 5 → 7: restored \d+ file\(s\)', out)
+    assert ': rolled back' in out and re.search(r'PASS: 0 ', out)
+    with open(f"{root}/src/types.ts") as f, open(f"{root}/pristine.ts") as g: assert f.read() == g.read()
+
+
+def test_stale_report_of_another_tree_is_not_a_baseline(tmp_path):
+    from natt_fix import diagnostics
+    root = _tree(tmp_path)
+    stale = [diagnostics.Diagnostic('src/x.ts', 1, 1, 'TS1', 'x')] * 5
+    diagnostics.write_report(diagnostics.to_report(stale, ['npx', 'tsc'], 'another tree'),
+                             os.path.join(root, diagnostics.REPORT))
+    out = _run(root, 9, 7)
+    assert 'restored' not in out and 'rolled back' not in out
+    with open(f"{root}/src/types.ts") as f, open(f"{root}/pristine.ts") as g: assert f.read() != g.read()
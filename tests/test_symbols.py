@@ -0,0 +1,72 @@
+import json, os, subprocess, sys
+
+from natt_fix import manifest
+from natt_fix.buffers import BufferStore
+from natt_fix.manifest import Fix, Replace
+from natt_fix.symbols import SymbolIndex, parse, import_fixes, owned_specs
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'script-10-python-fix.py')
+TSCONFIG = json.dumps({'compilerOptions': {'baseUrl': '.', 'paths': {'@/*': ['src/*']}}})
+
+
+def _tree(root, files):
+    for rel, c in files.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(c)
+
+
+def test_parse_exports_stars_and_imports():
+    info = parse("import a, { b as c, type d } from './x';\nimport * as ns from './y';\n"
+                 "// export const hidden = 1;\nexport const e = 1;\nexport default class K {}\n"
+                 "export { f as g } from './z';\nexport * from './w';\n")
+    assert info['exports'] == ['default', 'e', 'g']
+    assert info['stars'] == ['./w']
+    assert [(spec, names) for spec, names, _ in info['imports']] == \
+        [('./z', ['f']), ('./w', []), ('./x', ['b', 'd', 'default']), ('./y', None)]
+
+
+def test_refresh_reparses_only_changed_files(tmp_path):
+    _tree(tmp_path, {'src/a.ts': 'export const a = 1;', 'src/b.ts': 'export const b = 1;',
+                     'node_modules/x/i.ts': 'export const x = 1;'})
+    path = str(tmp_path / 'symbols.json')
+    idx = SymbolIndex(path=path).refresh(str(tmp_path))
+    assert sorted(idx.files) == ['src/a.ts', 'src/b.ts'] and idx.parsed == 2
+    idx.save()
+    (tmp_path / 'src/b.ts').write_text('export const bb = 2;')
+    idx = SymbolIndex.load(path).refresh(str(tmp_path))
+    assert idx.parsed == 1 and idx.exports_of('src/b.ts') == {'bb'}
+
+
+def test_import_fixes_rewrite_only_single_provider(tmp_path, monkeypatch):
+    _tree(tmp_path, {'tsconfig.json': TSCONFIG,
+                     'src/new/foo.ts': 'export interface Foo {}',
+                     'src/a/bar.ts': 'export const Bar = 1;', 'src/b/bar.ts': 'export const Bar = 2;',
+                     'src/use.ts': "import { Foo } from '@/old/foo';\nimport { Bar } from './bar';\n"
+                                   "import { Baz } from './baz';\n"})
+    monkeypatch.chdir(tmp_path)
+    fixes, unresolved = import_fixes(SymbolIndex(path='symbols.json').refresh(), scope='src/')
+    assert [f.msg for f in fixes] == ["C6.1: src/use.ts: '@/old/foo' → '@/new/foo'"]
+    assert sorted(unresolved) == [('src/use.ts', './bar', '2 candidate files'),
+                                  ('src/use.ts', './baz', 'no file exports Baz')]
+    store = BufferStore()
+    assert [r.status for r in manifest.run(store, fixes)] == ['ok']
+    assert store.read('src/use.ts').startswith("import { Foo } from '@/new/foo';\n")
+
+
+def test_owned_specifier_is_reported_not_rewritten(tmp_path, monkeypatch):
+    _tree(tmp_path, {'tsconfig.json': TSCONFIG, 'src/new/foo.ts': 'export interface Foo {}',
+                     'src/use.ts': "import { Foo } from '@/old/foo';\n"})
+    monkeypatch.chdir(tmp_path)
+    hand = [Fix('C9', 'src/use.ts', 'pin', (Replace("'@/older/foo'", "'@/old/foo'"),))]
+    fixes, unresolved = import_fixes(SymbolIndex(path='symbols.json').refresh(), scope='src/', owned=owned_specs(hand))
+    assert fixes == [] and unresolved == [('src/use.ts', '@/old/foo', 'set by C9, left as is')]
+
+
+def test_c6_is_opt_in():
+    def steps(*argv):
+        out = subprocess.run([sys.executable, SCRIPT, '--list', *argv], capture_output=True, text=True).stdout
+        return out.rsplit('steps: ', 1)[1].strip()
+    assert steps() == 'E'
+    assert steps('--auto-imports') == 'C6, E'
+    assert steps('--only', 'C6') == 'C6, E'
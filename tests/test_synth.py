@@ -0,0 +1,58 @@
+import os, re, subprocess, sys
+
+import pytest
+
+from natt_fix import synth
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'script-10-python-fix.py')
+
+
+def _run(root, *args):
+    p = subprocess.run([sys.executable, SCRIPT, '--skip', 'E', '--no-snapshot', *args], cwd=root,
+                       capture_output=True, text=True, timeout=300)
+    assert p.returncode == 0, p.stdout + p.stderr
+    return dict(zip(('pass', 'skip', 'fail'), map(int, re.search(r'PASS: (\d+)\s.*SKIP: (\d+)\s.*FAIL: (\d+)',
+                                                                  p.stdout).groups())))
+
+
+def _tree(root):
+    out = {}
+    for d, dirs, files in os.walk(root):
+        dirs[:] = sorted(x for x in dirs if x != '.natt-fix')
+        for f in files:
+            p = os.path.join(d, f)
+            with open(p, 'rb') as fh: out[os.path.relpath(p, root)] = fh.read()
+    return out
+
+
+@pytest.fixture(scope='module')
+def fixed(tmp_path_factory):
+    """Synthetic tree fixed with -j 1 and -j 4 → (root, counts, tree) per job count"""
+    out = {}
+    for jobs in (1, 4):
+        root = str(tmp_path_factory.mktemp(f'synth-j{jobs}'))
+        synth.generate(root, 200)
+        out[jobs] = root, _run(root, '-j', str(jobs)), _tree(root)
+    return out
+
+
+def test_fixes_apply_cleanly(fixed, tmp_path):
+    _, counts, tree = fixed[1]
+    synth.generate(str(tmp_path), 200)
+    before = _tree(str(tmp_path))
+    assert counts['pass'] > 50 and counts['fail'] == 0
+    assert before.keys() <= tree.keys()
+    assert tree['src/types.ts'] != before['src/types.ts']
+    assert b'export interface QuantumState {\n  id?: string;' in tree['src/types.ts']
+
+
+def test_parallel_run_gives_the_same_tree(fixed):
+    assert fixed[1][1] == fixed[4][1]
+    assert fixed[1][2] == fixed[4][2]
+
+
+def test_second_run_is_a_no_op(fixed):
+    root, _, tree = fixed[1]
+    counts = _run(root, '-j', '1', '--no-cache')
+    assert counts['pass'] == 0 and counts['fail'] == 0
+    assert _tree(root) == tree
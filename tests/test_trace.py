@@ -0,0 +1,54 @@
+import json, tracemalloc
+
+from natt_fix import manifest, memprof
+from natt_fix.buffers import BufferStore
+from natt_fix.manifest import Fix, Replace, Stats
+from natt_fix.trace import Trace, print_slowest, print_memory
+
+
+def test_fix_results_become_spans(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a.ts').write_text('const a = 1;\n')
+    fixes = [Fix('X1', 'a.ts', 'one', (Replace('= 1', '= 2'),)), Fix('X2', 'a.ts', 'two', (Replace('= 2', '= 3'),))]
+    tr = Trace()
+    for f, r in zip(fixes, manifest.run(BufferStore(), fixes)): tr.add(f.id, 'A', r.stats)
+    tr.add('cached', 'A', None)
+    assert [s.name for s in tr.spans] == ['X1', 'X2']
+    assert sum(s.read for s in tr.spans) == len('const a = 1;\n')      # the file is read once, charged once
+    assert all(s.written for s in tr.spans)
+
+
+def test_span_counts_store_io_and_chrome_events(tmp_path):
+    p = str(tmp_path / 'f.ts')
+    open(p, 'w').write('abc')
+    store, tr = BufferStore(), Trace()
+    with tr.span('read', 'io', store): store.read(p)
+    with tr.span('write', 'io', store): store.write(p, 'abcd')
+    assert [(s.read, s.written) for s in tr.spans] == [(3, 0), (0, 4)]
+    out = tmp_path / 'trace' / 'out.json'
+    tr.write_chrome(str(out))
+    ev = json.loads(out.read_text())['traceEvents']
+    assert [e['name'] for e in ev] == ['read', 'write'] and ev[0]['ts'] == 0 and ev[0]['ph'] == 'X'
+    assert ev[1]['args']['bytes_written'] == 4 and 'mem_peak' not in ev[1]['args']
+
+
+def test_slowest_table_is_sorted(capsys):
+    tr = Trace()
+    for name, dur in (('A1', .001), ('D13', .5), ('B2', .02)): tr.add(name, 'A', Stats(0, dur, 0, 0, 0, 0, 1))
+    print_slowest(tr, 2)
+    rows = capsys.readouterr().out.splitlines()[3:]
+    assert [r.split()[1] for r in rows] == ['D13', 'B2']
+
+
+def test_memory_table_and_budget(capsys):
+    memprof.start()
+    try:
+        tr = Trace()
+        with tr.span('big', 'C'): blob = bytearray(4 << 20)
+        del blob
+        assert print_memory(tr, budget=1 << 20) is True
+        out = capsys.readouterr().out
+        assert 'memory budget exceeded' in out and 'in big' in out
+        assert print_memory(tr, budget=1 << 30) is False
+    finally:
+        tracemalloc.stop()
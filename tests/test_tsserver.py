@@ -0,0 +1,95 @@
+import json, os, re, stat, subprocess, sys
+
+import pytest
+
+from natt_fix import synth
+from natt_fix.tsserver import Session, TsServerError, start
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'script-10-python-fix.py')
+
+# speaks the tsserver protocol: semantic error on every line holding BAD, a warning on WARN;
+# an event before each response; exits when CRASH_AT requests were read
+FAKE = r'''#!{python}
+import json, os, sys
+crash, n = int(os.environ.get('CRASH_AT', '0')), 0
+def send(m):
+    b = json.dumps(m).encode()
+    sys.stdout.buffer.write(b'Content-Length: %d\r\n\r\n' % len(b) + b); sys.stdout.buffer.flush()
+for line in sys.stdin:
+    req = json.loads(line); n += 1
+    if crash and n >= crash: sys.exit(3)
+    cmd, a = req['command'], req['arguments']
+    if cmd == 'exit': break
+    if cmd == 'open': continue
+    send({{'type': 'event', 'event': 'projectLoadingStart'}})
+    body = []
+    if cmd == 'semanticDiagnosticsSync':
+        for i, l in enumerate(open(a['file']).read().split('\n'), 1):
+            if 'BAD' in l: body.append({{'start': {{'line': i, 'offset': l.index('BAD') + 1}}, 'code': 2339,
+                                        'category': 'error', 'text': "Property 'BAD' missing.\n  in type 'X'."}})
+            if 'WARN' in l: body.append({{'start': {{'line': i, 'offset': 1}}, 'code': 6133, 'category': 'suggestion',
+                                         'text': 'unused'}})
+    send({{'type': 'response', 'request_seq': req['seq'], 'success': cmd != 'fail', 'body': body,
+           'message': 'no such command'}})
+'''
+
+
+def _install(root):
+    b = os.path.join(root, 'node_modules', '.bin')
+    os.makedirs(b, exist_ok=True)
+    with open(os.path.join(b, 'tsserver'), 'w') as f: f.write(FAKE.format(python=sys.executable))
+    os.chmod(os.path.join(b, 'tsserver'), stat.S_IRWXU)
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    _install(str(tmp_path))
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'a.ts').write_text("const x = 1;\nconst y = o.BAD; // WARN\n")
+    s = start(str(tmp_path))
+    yield s
+    s.close()
+
+
+def test_diagnostics_as_tsc_records(session):
+    [d] = session.diagnostics(['src/a.ts'])
+    assert (d.file, d.line, d.col, d.code) == ('src/a.ts', 2, 13, 'TS2339')
+    assert d.message == "Property 'BAD' missing.\nin type 'X'."
+
+
+def test_changed_file_is_reloaded_once(session, tmp_path):
+    session.diagnostics(['src/a.ts'])
+    n = session.requests
+    assert session.diagnostics(['src/a.ts']) and session.requests == n + 2      # no reload: unchanged
+    (tmp_path / 'src' / 'a.ts').write_text("const x = 1;\n")
+    assert session.diagnostics(['src/a.ts']) == [] and session.requests == n + 5
+
+
+def test_failed_request_and_crash_raise(session, monkeypatch, tmp_path):
+    with pytest.raises(TsServerError, match='no such command'): session.request('fail', {})
+    monkeypatch.setenv('CRASH_AT', '2')
+    s = Session([str(tmp_path / 'node_modules' / '.bin' / 'tsserver')], str(tmp_path))
+    try:
+        with pytest.raises(TsServerError, match='exited'): s.diagnostics(['src/a.ts'])
+    finally:
+        s.close()
+
+
+def test_no_tsserver_installed(tmp_path):
+    assert start(str(tmp_path)) is None
+
+
+def test_crash_during_e_falls_back_to_tsc(tmp_path):
+    root = str(tmp_path)
+    synth.generate(root, 50)
+    _install(root)
+    os.makedirs(f"{root}/bin")
+    with open(f"{root}/bin/npx", 'w') as f: f.write('#!/bin/sh\necho "src/types.ts(1,1): error TS2304: fake"\nexit 2\n')
+    os.chmod(f"{root}/bin/npx", stat.S_IRWXU)
+    env = dict(os.environ, PATH=f"{root}/bin{os.pathsep}{os.environ['PATH']}", CRASH_AT='1')
+    p = subprocess.run([sys.executable, SCRIPT, '--tsserver', '--skip', 'C6', '--autofix'], cwd=root, env=env,
+                       capture_output=True, text=True, timeout=300)
+    assert p.returncode == 0, p.stdout + p.stderr
+    assert 'tsserver failed' in p.stdout and 'Traceback' not in p.stderr
+    assert re.search(r'TSC errors: 1 ', p.stdout)
+    with open(f"{root}/.natt-fix/tsc-report.json") as f: assert json.load(f)['command'][0] == 'autofix'
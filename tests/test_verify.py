@@ -0,0 +1,35 @@
+import sys
+
+import pytest
+
+from natt_fix.verify import stream_tsc, TscError
+
+ERR = "src/a.ts(1,2): error TS2339: Property 'x' does not exist on type 'Y'."
+
+
+def _tsc(out, status):
+    return [sys.executable, '-c', f"import sys; print({out!r}); sys.exit({status})"]
+
+
+def test_errors_reported_with_status_2():
+    ds = list(stream_tsc(cmd=_tsc(ERR, 2)))
+    assert [(d.file, d.code) for d in ds] == [('src/a.ts', 'TS2339')]
+
+
+def test_clean_run():
+    assert list(stream_tsc(cmd=_tsc('', 0))) == []
+
+
+@pytest.mark.parametrize('out, status', [("npm ERR! could not determine executable to run", 1),
+                                         (ERR, 1), ("Killed", -9 % 256), ("Version 5.4.5", 2)])
+def test_unexpected_status_or_unparseable_output_raises(out, status):
+    with pytest.raises(TscError) as e:
+        list(stream_tsc(cmd=_tsc(out, status)))
+    assert out.split()[0] in str(e.value)
+
+
+def test_missing_command_raises_tsc_error(tmp_path, monkeypatch):
+    monkeypatch.setenv('PATH', str(tmp_path))       # no npx, no node_modules/.bin/tsc
+    with pytest.raises(TscError) as e:
+        list(stream_tsc(str(tmp_path), incremental=False))
+    assert str(e.value).startswith('npx tsc --noEmit: ')
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from natt_fix import watch
+from natt_fix.filecache import FileCache
+from natt_fix.manifest import Fix, Replace
+
+
+def _watcher(kind, paths):
+    if kind == 'poll': return watch.PollWatcher(paths, interval=0.01)
+    try: return watch.InotifyWatcher(paths)
+    except (OSError, AttributeError): pytest.skip('no inotify')
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('src/a')
+    open('src/a/x.ts', 'w').write('const x = 1;\n')
+    return ['src/a/x.ts', 'src/b/stub.ts']         # the second one's directory does not exist yet
+
+
+@pytest.mark.parametrize('kind', ['poll', 'inotify'])
+def test_overwrite_rename_and_delete_are_seen(tree, kind):
+    w = _watcher(kind, tree)
+    try:
+        assert w.wait(0.05) == set()
+        open('src/a/x.ts', 'a').write('// more\n')
+        assert w.wait(2) == {'src/a/x.ts'}
+        open('src/a/tmp', 'w').write('const x = 2;\n')
+        os.replace('src/a/tmp', 'src/a/x.ts')       # atomic_write / git checkout
+        assert w.wait(2) == {'src/a/x.ts'}
+        os.remove('src/a/x.ts')
+        assert w.wait(2) == {'src/a/x.ts'}
+    finally:
+        w.close()
+
+
+@pytest.mark.parametrize('kind', ['poll', 'inotify'])
+def test_target_in_a_new_directory(tree, kind):
+    w = _watcher(kind, tree)
+    try:
+        os.makedirs('src/b')
+        open('src/b/stub.ts', 'w').write('export {};\n')
+        got = w.wait(2)
+        if got != {'src/b/stub.ts'}: got |= w.wait(2)     # inotify: mkdir first, then the file
+        assert got == {'src/b/stub.ts'}
+    finally:
+        w.close()
+
+
+def test_apply_changed_reapplies_and_ignores_its_own_write(tree):
+    fixes = [Fix('W1', 'src/a/x.ts', 'x = 2', (Replace('x = 1', 'x = 2'),)),
+             Fix('W2', 'src/b/stub.ts', 'stub', (Replace('a', 'b'),))]
+    cache = FileCache(path='cache.json')
+    ran, flushed = watch.apply_changed(fixes, {'src/a/x.ts'}, cache)
+    assert [(f.id, r.status) for f, r in ran] == [('W1', 'ok')] and flushed == ['src/a/x.ts']
+    assert open('src/a/x.ts').read() == 'const x = 2;\n'
+    assert watch.apply_changed(fixes, {'src/a/x.ts'}, cache) == ([], [])     # cache fresh: nothing ran
+    open('src/a/x.ts', 'w').write('const x = 1;\n')                           # e.g. git checkout
+    ran, _ = watch.apply_changed(fixes, {'src/a/x.ts'}, cache)
+    assert [r.status for _, r in ran] == ['ok']